@@ -0,0 +1,11 @@
+"""
+KCT catalog tools: CDN manifest scanning, products_enhanced import
+generation and offline audits.
+
+Run `python -m kct_catalog --help` for the command line interface.
+"""
+
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+
+__all__ = ["CatalogInputs", "RunMetrics"]
@@ -0,0 +1,114 @@
+"""
+Product attribute helpers shared by the catalog generators: names, pricing,
+price tiers and color extraction.
+"""
+
+import random
+from typing import Optional
+
+
+# Legacy flat list prices used by the original complete import
+LIST_PRICES = {
+    'double-breasted-suits': 449.99,
+    'suits': 399.99,
+    'stretch-suits': 399.99,
+    'tuxedos': 499.99,
+    'mens-shirts': 79.99
+}
+
+COLORS = {
+    'black': 'Black', 'white': 'White', 'grey': 'Grey', 'gray': 'Grey',
+    'navy': 'Navy', 'blue': 'Blue', 'red': 'Red', 'pink': 'Pink',
+    'green': 'Green', 'brown': 'Brown', 'tan': 'Tan', 'beige': 'Beige',
+    'burgundy': 'Burgundy', 'purple': 'Purple', 'gold': 'Gold', 'silver': 'Silver',
+    'orange': 'Orange', 'yellow': 'Yellow', 'mocha': 'Mocha', 'sage': 'Sage',
+    'forest': 'Forest', 'smoked': 'Smoked', 'canyon': 'Canyon', 'clay': 'Clay',
+    'sparkle': 'Sparkle', 'dusty': 'Dusty', 'rose': 'Rose', 'fuchsia': 'Fuchsia',
+    'hunter': 'Hunter', 'burnt': 'Burnt', 'medium': 'Medium', 'dark': 'Dark',
+    'light': 'Light'
+}
+
+COLOR_FAMILIES = {
+    'Black': 'Black', 'Dark': 'Black',
+    'White': 'White', 'Ivory': 'White',
+    'Grey': 'Grey', 'Gray': 'Grey', 'Silver': 'Grey',
+    'Navy': 'Blue', 'Blue': 'Blue', 'Smoked Blue': 'Blue',
+    'Red': 'Red', 'Burgundy': 'Red', 'Rose': 'Red',
+    'Pink': 'Pink', 'Fuchsia': 'Pink', 'Dusty Rose': 'Pink',
+    'Green': 'Green', 'Forest': 'Green', 'Sage': 'Green', 'Hunter': 'Green',
+    'Brown': 'Brown', 'Mocha': 'Brown', 'Tan': 'Brown', 'Canyon': 'Brown', 'Clay': 'Brown',
+    'Orange': 'Orange', 'Burnt Orange': 'Orange',
+    'Yellow': 'Yellow', 'Gold': 'Yellow',
+    'Purple': 'Purple'
+}
+
+
+def clean_product_name(slug: str) -> str:
+    """Convert slug to proper product name"""
+    words = slug.replace('-', ' ').split()
+    # Capitalize each word, but keep certain words in uppercase
+    uppercase_words = ['ii', 'iii', 'iv', 'v', 'vi', 'xl', 'xxl']
+    result = []
+    for word in words:
+        if word.lower() in uppercase_words:
+            result.append(word.upper())
+        else:
+            result.append(word.capitalize())
+    return ' '.join(result)
+
+
+def get_random_price(category: str, rng: Optional[random.Random] = None) -> float:
+    """Get random price based on category with correct pricing"""
+    rng = rng or random
+    if category == 'mens-shirts':
+        # Shirts: $49-69
+        return round(rng.uniform(49.99, 69.99), 2)
+    elif category in ['double-breasted-suits', 'suits', 'stretch-suits']:
+        # Suits: $200-400
+        return round(rng.uniform(199.99, 399.99), 2)
+    elif category == 'tuxedos':
+        # Tuxedos: $250-400 (slightly higher floor for tuxedos)
+        return round(rng.uniform(249.99, 399.99), 2)
+    else:
+        return 99.99
+
+
+def get_price_tier(price: float) -> str:
+    """Get price tier based on price"""
+    if price < 75: return 'TIER_1'
+    elif price < 100: return 'TIER_2'
+    elif price < 125: return 'TIER_3'
+    elif price < 150: return 'TIER_4'
+    elif price < 200: return 'TIER_5'
+    elif price < 250: return 'TIER_6'
+    elif price < 300: return 'TIER_7'
+    elif price < 400: return 'TIER_8'
+    elif price < 500: return 'TIER_9'
+    else: return 'TIER_10'
+
+
+def get_color_from_name(name: str) -> str:
+    """Extract color from product name"""
+    name_lower = name.lower()
+    found_colors = []
+    for color_key, color_value in COLORS.items():
+        if color_key in name_lower:
+            found_colors.append(color_value)
+
+    if found_colors:
+        return ' '.join(found_colors)
+    return 'Classic'
+
+
+def get_color_family(color_name: str) -> str:
+    """Get color family from color name"""
+    color_lower = color_name.lower()
+    for key, family in COLOR_FAMILIES.items():
+        if key.lower() in color_lower:
+            return family
+    return 'Multi'
+
+
+def slugify(text: str) -> str:
+    """'Double-Breasted Suits' -> 'double-breasted-suits'"""
+    return '-'.join(''.join(ch if ch.isalnum() else ' ' for ch in text.lower()).split())
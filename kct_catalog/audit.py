@@ -0,0 +1,62 @@
+"""
+Offline audit of generated product rows.
+
+Mirrors the "Verify import" GROUP BY that the import SQL runs against
+products_enhanced, plus the duplicate / missing-image checks, without a
+database round-trip.
+"""
+
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from .attributes import get_price_tier
+
+
+def audit_rows(rows: List[Dict]) -> Dict:
+    groups = defaultdict(list)
+    for row in rows:
+        groups[(row['category'], row['subcategory'])].append(row['base_price'])
+
+    summary = []
+    for (category, subcategory), prices in sorted(groups.items()):
+        summary.append({
+            'category': category,
+            'subcategory': subcategory,
+            'count': len(prices),
+            'min_price': min(prices),
+            'max_price': max(prices),
+            'avg_price': round(sum(prices) / len(prices), 2),
+        })
+
+    handle_counts = Counter(row['handle'] for row in rows)
+    sku_counts = Counter(row['sku'] for row in rows)
+    return {
+        'products': len(rows),
+        'summary': summary,
+        'duplicate_handles': sorted(h for h, n in handle_counts.items() if n > 1),
+        'duplicate_skus': sorted(s for s, n in sku_counts.items() if n > 1),
+        'missing_hero_image': sorted(row['handle'] for row in rows if not row.get('hero_image')),
+        'price_tier_mismatch': sorted(
+            row['handle'] for row in rows
+            if row['source'] == 'fall_2025' and row['price_tier'] != get_price_tier(row['base_price'])
+        ),
+    }
+
+
+def print_audit(report: Dict) -> None:
+    print(f"\n{'='*80}")
+    print("CATALOG AUDIT")
+    print(f"{'='*80}")
+    print(f"{'category':<24}{'subcategory':<26}{'count':>6}{'min':>10}{'max':>10}{'avg':>10}")
+    for group in report['summary']:
+        print(f"{group['category']:<24}{group['subcategory']:<26}{group['count']:>6}"
+              f"{group['min_price']:>10.2f}{group['max_price']:>10.2f}{group['avg_price']:>10.2f}")
+    print(f"\nTotal products: {report['products']}")
+    for check in ('duplicate_handles', 'duplicate_skus', 'missing_hero_image', 'price_tier_mismatch'):
+        values = report[check]
+        print(f"{check}: {len(values)}" + (f" ({', '.join(values[:10])})" if values else ""))
+
+
+def has_problems(report: Dict) -> bool:
+    return any(report[check] for check in
+               ('duplicate_handles', 'duplicate_skus', 'missing_hero_image', 'price_tier_mismatch'))
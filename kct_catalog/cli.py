@@ -0,0 +1,639 @@
+"""
+Command line entry point: python -m kct_catalog <command> [options]
+
+Command modules are imported inside their handlers so that `--help` and
+light commands start without loading the generators or optional
+dependencies.
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from .metrics import add_metrics_arguments, metrics_from_args
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def int_between(low: int, high: int):
+    """argparse type for an int in [low, high]."""
+    def parse(value: str) -> int:
+        number = int(value)
+        if not low <= number <= high:
+            raise argparse.ArgumentTypeError(f"must be between {low} and {high}, got {number}")
+        return number
+    parse.__name__ = 'int'  # argparse names the type in "invalid int value" errors
+    return parse
+
+
+def _cmd_scan(args, inputs, metrics) -> int:
+    from . import scan
+
+    targets = ['fall-2025', 'vest-accessories'] if args.target == 'all' else [args.target]
+    status = 0
+    for target in targets:
+        if target == 'fall-2025':
+            cdn_data = scan.run_fall_2025(metrics, args.root, args.base_url)
+            if cdn_data:
+                inputs.put(scan.FALL_2025_MANIFEST, cdn_data)
+        else:
+            cdn_data = scan.run_vest_accessories(metrics, args.root, args.base_url)
+            if cdn_data:
+                inputs.put(scan.VEST_ACCESSORIES_MANIFEST, cdn_data)
+        if not cdn_data:
+            # scan has already printed why nothing was found
+            status = 2
+    return status
+
+
+def _cmd_import(args, inputs, metrics) -> int:
+    from .generate import run_import
+
+    redirects = None
+    if args.dedupe:
+        from .dedupe import load_redirects
+
+        redirects = load_redirects(inputs.path(args.dedupe))
+    image_matches = None
+    if args.image_matches:
+        from .image_match import load_matches
+
+        image_matches = load_matches(inputs.path(args.image_matches))
+    result = run_import(inputs, metrics, args.profile, args.output, args.seed, redirects, image_matches)
+    inputs.put('rows', result['rows'])
+    if args.with_search:
+        from .search import build_documents, render_search_sql
+
+        with metrics.stage('search_indexing'):
+            search_sql = render_search_sql(build_documents(result['rows'], inputs))
+        with result['output'].open('a') as f:
+            f.write("\n\n" + search_sql)
+        metrics.incr('bytes_written', len(search_sql.encode('utf-8')))
+        print("Appended weighted search documents (search_vector)")
+    return 0
+
+
+def _cmd_shard(args, inputs, metrics) -> int:
+    from .generate import build_rows
+    from .shard import (DEFAULT_PARTITION, DEFAULT_SHARD_COUNT, ShardError, load_manifest, print_manifest,
+                        verify_shards, write_shards)
+
+    output_dir = inputs.path(args.output_dir)
+    if args.verify:
+        try:
+            failures = verify_shards(output_dir)
+        except ShardError as exc:
+            print(f"Error: {exc}")
+            return 2
+        for entry in failures:
+            print(f"  shard {entry['index']} ({entry['file']}): {entry['problem']}")
+        print(f"{len(failures)} shard(s) failed verification")
+        return 1 if failures else 0
+
+    partition, shard_count, seed = args.partition, args.shards, args.seed
+    if args.only:
+        # Rebuild the rows and layout of the run that wrote the manifest
+        manifest = load_manifest(output_dir) or {}
+        partition = partition or manifest.get('partition')
+        if partition == 'hash' and shard_count is None:
+            shard_count = manifest.get('shard_count')
+        seed = manifest.get('seed') if seed is None else seed
+    partition = partition or DEFAULT_PARTITION
+    if partition == 'category' and args.shards is not None:
+        print("Error: --shards only applies to --partition hash; category shards are one per category")
+        return 2
+    shard_count = shard_count or DEFAULT_SHARD_COUNT
+
+    rows = inputs.get('rows') or build_rows(inputs, args.profile, seed, metrics)
+    try:
+        manifest = write_shards(rows, output_dir, args.profile, partition, shard_count,
+                                args.jobs, args.only, seed, metrics)
+    except ShardError as exc:
+        print(f"Error: {exc}")
+        return 2
+    print_manifest(manifest, output_dir)
+    return 0
+
+
+def _cmd_load(args, inputs, metrics) -> int:
+    import random
+
+    from .generate import build_rows
+    from .load import (Checkpoint, LoadError, dsn_fingerprint, load_rows, print_load_report,
+                       rows_fingerprint)
+
+    dsn = args.dsn or os.environ.get("DATABASE_URL")
+    if not dsn:
+        print("Error: pass --dsn or set DATABASE_URL")
+        return 2
+
+    target = {'target': dsn_fingerprint(dsn), 'table': args.table,
+              'profile': args.profile, 'chunk_size': args.chunk_size}
+    try:
+        checkpoint = None if args.restart else Checkpoint.load(args.checkpoint)
+    except LoadError as exc:
+        print(f"Error: {exc}")
+        return 2
+    if checkpoint is not None and not checkpoint.matches(**target):
+        print(f"Error: {args.checkpoint} belongs to a different target or chunk size; use --restart")
+        return 2
+    if checkpoint is not None and args.seed is not None and args.seed != checkpoint.state['seed']:
+        print(f"Error: checkpoint was created with --seed {checkpoint.state['seed']}; use --restart")
+        return 2
+
+    # The checkpoint owns the seed so resumed chunks get the same ids and prices
+    if checkpoint is not None:
+        seed = checkpoint.state['seed']
+    else:
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    rows = build_rows(inputs, args.profile, seed, metrics)
+
+    if checkpoint is None:
+        checkpoint = Checkpoint(args.checkpoint, {**target, 'seed': seed,
+                                                  'rows': rows_fingerprint(rows), 'completed': []})
+        checkpoint.save()
+    elif checkpoint.state['rows'] != rows_fingerprint(rows):
+        print("Error: the catalog inputs changed since the checkpoint was written; use --restart")
+        return 2
+
+    try:
+        report = load_rows(rows, dsn, checkpoint, args.chunk_size, args.pool_size,
+                           args.method, args.table, metrics)
+    except LoadError as exc:
+        print(f"Error: {exc}")
+        completed = len(checkpoint.completed)
+        if completed:
+            print(f"{completed} chunk(s) committed and recorded in {args.checkpoint}; rerun to resume")
+        return 2
+    print_load_report(report)
+    return 0
+
+
+def _cmd_stage(args, inputs, metrics) -> int:
+    import sqlite3
+
+    from .staging import connect, print_refresh, refresh, run_query
+
+    db_path = inputs.path(args.db)
+    connection = connect(db_path)
+    try:
+        if not args.no_refresh:
+            print_refresh(refresh(connection, inputs, args.force, metrics), db_path)
+        for sql in args.sql or []:
+            print(f"\n> {sql}")
+            with metrics.stage('query'):
+                try:
+                    run_query(connection, sql, args.limit)
+                except sqlite3.Error as exc:
+                    print(f"Error: {exc}")
+                    return 2
+    finally:
+        connection.close()
+    return 0
+
+
+def _cmd_search(args, inputs, metrics) -> int:
+    from .generate import build_rows
+    from .search import search, write_search_artifacts
+
+    rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    result = write_search_artifacts(rows, inputs, inputs.path(args.output_dir),
+                                    inputs.path(args.sql_output), metrics)
+    index = result['index']
+    print(f"Indexed {len(index['docs'])} products, {len(index['terms'])} terms")
+    print(f"Inverted index: {result['index_file']} ({result['index_file'].stat().st_size} bytes)")
+    print(f"Search documents SQL: {result['sql_file']}")
+    for query in args.query or []:
+        print(f"\n> {query}")
+        for hit in search(index, query):
+            print(f"  {hit['score']:>3}  {hit['handle']}  {hit['name']}")
+    return 0
+
+
+def _cmd_facets(args, inputs, metrics) -> int:
+    from .facets import (documents_in, facet_counts, filter_with_counts, parse_filters,
+                         print_facets, write_facet_artifacts)
+    from .generate import build_rows
+
+    try:
+        filters = parse_filters(args.filter or [])
+    except ValueError as exc:
+        print(f"Error: {exc}")
+        return 2
+
+    rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    result = write_facet_artifacts(rows, inputs, inputs.path(args.output_dir),
+                                   inputs.path(args.sql_output), metrics)
+    print(f"Facet index: {result['index_file']} ({result['index_file'].stat().st_size} bytes)")
+    print(f"Facet counts SQL: {result['sql_file']}")
+
+    if filters:
+        with metrics.stage('facet_filtering'):
+            filtered = filter_with_counts(result['bitmaps'], len(rows), filters)
+        handles = [rows[doc_id]['handle'] for doc_id in documents_in(filtered['matches'])]
+        print(f"\n{len(handles)} products match {filters}")
+        for handle in handles[:20]:
+            print(f"  {handle}")
+        print_facets(filtered['counts'])
+    else:
+        print_facets(facet_counts(result['bitmaps']))
+    return 0
+
+
+def _cmd_listings(args, inputs, metrics) -> int:
+    from .generate import build_rows
+    from .listings import publish_listings
+    from .publish import print_publish_summary
+
+    if args.seed is None:
+        print("Warning: no --seed given; random prices will rewrite every page")
+    rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    output_dir = inputs.path(args.output_dir)
+    result = publish_listings(rows, output_dir, args.page_size, metrics)
+    print_publish_summary("Listing pages", output_dir, result)
+    return 0
+
+
+def _cmd_sitemap(args, inputs, metrics) -> int:
+    from .generate import build_rows
+    from .publish import print_publish_summary
+    from .sitemap import write_sitemaps
+
+    if args.seed is None:
+        print("Warning: no --seed given; random prices will mark every product changed")
+    rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    output_dir = inputs.path(args.output_dir)
+    result = write_sitemaps(rows, output_dir, args.site_url, args.base_url,
+                            args.max_urls, metrics=metrics)
+    print_publish_summary("Sitemaps and product feed", output_dir, result)
+    print(f"Sitemap shards: {len(result['sitemap_shards'])}  Feed shards: {len(result['feed_shards'])}")
+    print(f"Products changed: {len(result['products_changed'])}  "
+          f"Removed: {len(result['products_removed'])}")
+    return 0
+
+
+def _cmd_stripe_coverage(args, inputs, metrics) -> int:
+    import json
+
+    from .generate import build_rows
+    from .stripe_coverage import check_coverage, has_problems, print_coverage
+
+    rows = None
+    if not args.no_generated:
+        rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    report = check_coverage(inputs, rows, metrics)
+    print_coverage(report)
+    if args.report:
+        report_file = inputs.path(args.report)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nReport: {report_file}")
+    return 1 if args.strict and has_problems(report) else 0
+
+
+def _cmd_validate(args, inputs, metrics) -> int:
+    import json
+
+    from .generate import build_rows
+    from .validate import ValidationError, has_problems, print_validation, validate
+
+    rows = None
+    if not args.no_generated:
+        rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    try:
+        results = validate(inputs, rows, metrics)
+    except ValidationError as exc:
+        print(f"Error: {exc}")
+        return 2
+    print_validation(results)
+    if args.report:
+        report_file = inputs.path(args.report)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nReport: {report_file}")
+    return 1 if args.strict and has_problems(results) else 0
+
+
+def _cmd_dedupe(args, inputs, metrics) -> int:
+    from .dedupe import collect_records, find_clusters, print_clusters, redirect_map, write_dedupe
+    from .generate import build_rows
+
+    if not 0 < args.threshold <= 1:
+        print("Error: --threshold must be in (0, 1]")
+        return 2
+    rows = None
+    if not args.no_generated:
+        rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    records = collect_records(inputs, rows)
+    clusters = find_clusters(records, args.threshold, metrics)
+    print_clusters(clusters)
+    output_file = write_dedupe(clusters, inputs.path(args.output))
+    print(f"\n{len(redirect_map(clusters))} redirects from {len(records)} records: {output_file}")
+    return 0
+
+
+def _cmd_image_match(args, inputs, metrics) -> int:
+    from .generate import build_rows
+    from .image_match import match_images, print_matches, write_matches
+
+    rows = None
+    if not args.no_generated:
+        rows = inputs.get('rows') or build_rows(inputs, args.profile, args.seed, metrics)
+    result = match_images(inputs, rows, args.min_score, args.margin, metrics)
+    print_matches(result)
+    output_file = write_matches(result, inputs.path(args.output))
+    print(f"\nMatches: {output_file}")
+    return 0
+
+
+def _cmd_rewrite_urls(args, inputs, metrics) -> int:
+    import json
+
+    from .url_rewrite import (DEFAULT_TARGETS, RewriteError, load_mapping, print_rewrite,
+                              rewrite_urls, write_patch)
+
+    try:
+        trie = load_mapping(inputs.path(args.mapping))
+    except RewriteError as e:
+        print(f"Error: {e}")
+        return 2
+    patch_file = inputs.path(args.patch)
+    result = rewrite_urls(inputs, trie, args.paths or DEFAULT_TARGETS, args.write,
+                          exclude=[patch_file], metrics=metrics)
+    print_rewrite(result)
+    if result['rewrites']:
+        write_patch(result['rewrites'], patch_file)
+        print(f"\nPatch: {patch_file}")
+    if args.report:
+        report_file = inputs.path(args.report)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"Report: {report_file}")
+    return 1 if args.strict and result['unmapped'] else 0
+
+
+def _cmd_upload(args, inputs, metrics) -> int:
+    from .upload import (UploadError, UploadState, collect_objects, make_client, plan_uploads, print_plan,
+                         print_upload_report, target_fingerprint, upload_objects)
+
+    endpoint_url = args.endpoint_url or os.environ.get("R2_ENDPOINT_URL")
+    bucket = args.bucket or os.environ.get("R2_BUCKET")
+    if not endpoint_url or not bucket:
+        print("Error: pass --endpoint-url and --bucket or set R2_ENDPOINT_URL and R2_BUCKET")
+        return 2
+
+    targets = ['fall-2025', 'vest-accessories'] if args.target == 'all' else [args.target]
+    objects = collect_objects(inputs, targets)
+    state = UploadState(inputs.path(args.state), target_fingerprint(endpoint_url, bucket))
+    try:
+        client = None
+        if not args.dry_run or args.verify_remote:
+            client = make_client(endpoint_url, args.region, max_connections=args.jobs)
+        plan = plan_uploads(inputs, objects, state, client, bucket, args.jobs, args.verify_remote, metrics)
+        print_plan(plan)
+        if args.dry_run or not plan['upload']:
+            state.save()
+            return 0
+        report = upload_objects(inputs, plan['upload'], client, bucket, state, args.jobs,
+                                args.cache_control, metrics)
+    except UploadError as exc:
+        print(f"Error: {exc}")
+        return 2
+    print_upload_report(report)
+    return 1 if report['failed'] else 0
+
+
+def _cmd_audit(args, inputs, metrics) -> int:
+    from .audit import audit_rows, has_problems, print_audit
+    from .generate import build_rows
+
+    rows = inputs.get('rows')
+    if rows is None:
+        rows = build_rows(inputs, args.profile, metrics=metrics)
+    with metrics.stage('audit'):
+        report = audit_rows(rows)
+    print_audit(report)
+    return 1 if args.strict and has_problems(report) else 0
+
+
+def _cmd_pipeline(args, inputs, metrics) -> int:
+    stages = ([] if args.skip_scan else [_cmd_scan]) + [_cmd_import, _cmd_audit]
+    for stage in stages:
+        status = stage(args, inputs, metrics)
+        if status:
+            return status
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--root", default=".", help="Repository root holding the inputs (default: .)")
+    add_metrics_arguments(common)
+
+    parser = argparse.ArgumentParser(prog="kct_catalog", description="KCT catalog tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    scan_parser = subparsers.add_parser("scan", parents=[common],
+                                        help="Scan local image trees and write the CDN URL manifests")
+    scan_parser.add_argument("target", nargs="?", default="all",
+                             choices=["all", "fall-2025", "vest-accessories"])
+    scan_parser.add_argument("--base-url", default="https://cdn.kctmenswear.com")
+    scan_parser.set_defaults(handler=_cmd_scan)
+
+    generation_options = argparse.ArgumentParser(add_help=False)
+    generation_options.add_argument("--profile", default="final", choices=["final", "complete"],
+                                    help="final: tiered pricing + UPSERT; complete: legacy list prices")
+    generation_options.add_argument("--seed", type=int,
+                                    help="Seed ids and prices for reproducible output")
+
+    import_options = argparse.ArgumentParser(add_help=False, parents=[generation_options])
+    import_options.add_argument("--output", help="Override the SQL output path")
+    import_options.add_argument("--dedupe", metavar="DEDUPE_JSON",
+                                help="Skip duplicates listed by the dedupe command")
+    import_options.add_argument("--image-matches", metavar="MATCHES_JSON",
+                                help="Add images confirmed by the image-match command")
+
+    import_parser = subparsers.add_parser("import", parents=[common, import_options],
+                                          help="Generate the products_enhanced import SQL")
+    import_parser.add_argument("--with-search", action="store_true",
+                               help="Append weighted search_vector documents to the import")
+    import_parser.set_defaults(handler=_cmd_import)
+
+    shard_parser = subparsers.add_parser("shard", parents=[common, generation_options],
+                                         help="Write per-shard import SQL files in parallel")
+    shard_parser.add_argument("--partition", choices=["category", "hash"],
+                              help="category (default) or hash; --only reuses the manifest's")
+    shard_parser.add_argument("--shards", type=positive_int,
+                              help="Number of shards for --partition hash (default: 4); "
+                                   "rejected with --partition category")
+    shard_parser.add_argument("--jobs", type=positive_int, help="Worker processes (default: CPU count)")
+    shard_parser.add_argument("--output-dir", default="sql/shards")
+    shard_parser.add_argument("--only", type=int, action="append", metavar="INDEX",
+                              help="Rewrite only this shard index (repeatable); reuses the manifest's "
+                                   "partition, shard count and seed")
+    shard_parser.add_argument("--verify", action="store_true",
+                              help="Check existing shard files against manifest.json and exit")
+    shard_parser.set_defaults(handler=_cmd_shard)
+
+    load_parser = subparsers.add_parser("load", parents=[common, generation_options],
+                                        help="Load rows straight into Postgres with resumable chunks")
+    load_parser.add_argument("--dsn", help="Postgres URL (default: $DATABASE_URL)")
+    load_parser.add_argument("--table", default="products_enhanced")
+    load_parser.add_argument("--method", default="copy", choices=["copy", "execute"],
+                             help="COPY via a staging table, or batched executemany")
+    load_parser.add_argument("--chunk-size", type=positive_int, default=500, help="Rows per transaction")
+    load_parser.add_argument("--pool-size", type=positive_int, default=2, help="Concurrent connections")
+    load_parser.add_argument("--checkpoint", default="metrics/load-checkpoint.json")
+    load_parser.add_argument("--restart", action="store_true",
+                             help="Ignore an existing checkpoint and load every chunk")
+    load_parser.set_defaults(handler=_cmd_load)
+
+    stage_parser = subparsers.add_parser("stage", parents=[common],
+                                         help="Build/refresh the local SQLite staging catalog")
+    stage_parser.add_argument("--db", default="catalog_staging.sqlite")
+    stage_parser.add_argument("--force", action="store_true", help="Reload every source")
+    stage_parser.add_argument("--no-refresh", action="store_true", help="Only run --sql queries")
+    stage_parser.add_argument("--sql", action="append", metavar="QUERY",
+                              help="Run a query against the staging catalog (repeatable)")
+    stage_parser.add_argument("--limit", type=int, default=50, help="Rows to print per query")
+    stage_parser.set_defaults(handler=_cmd_stage)
+
+    search_parser = subparsers.add_parser("search", parents=[common, generation_options],
+                                          help="Build search documents and the static inverted index")
+    search_parser.add_argument("--output-dir", default="dist/catalog/search")
+    search_parser.add_argument("--sql-output", default="sql/search-documents.sql")
+    search_parser.add_argument("--query", action="append", help="Try a query against the built index")
+    search_parser.set_defaults(handler=_cmd_search)
+
+    facets_parser = subparsers.add_parser("facets", parents=[common, generation_options],
+                                          help="Build facet bitmaps and precomputed counts")
+    facets_parser.add_argument("--output-dir", default="dist/catalog/facets")
+    facets_parser.add_argument("--sql-output", default="sql/facet-counts.sql")
+    facets_parser.add_argument("--filter", action="append", metavar="FACET=VALUE[,VALUE]",
+                               help="Try a filter against the bitmaps (repeatable)")
+    facets_parser.set_defaults(handler=_cmd_facets)
+
+    listings_parser = subparsers.add_parser("listings", parents=[common, generation_options],
+                                            help="Pre-render paginated category listing JSON")
+    listings_parser.add_argument("--output-dir", default="dist/catalog/listings")
+    listings_parser.add_argument("--page-size", type=positive_int, default=24)
+    listings_parser.set_defaults(handler=_cmd_listings)
+
+    sitemap_parser = subparsers.add_parser("sitemap", parents=[common, generation_options],
+                                           help="Write gzipped sitemap shards and the merchant product feed")
+    sitemap_parser.add_argument("--output-dir", default="dist/catalog/sitemaps")
+    sitemap_parser.add_argument("--site-url", default="https://kctmenswear.com")
+    sitemap_parser.add_argument("--base-url", help="Public URL of the shards (default: <site-url>/sitemaps)")
+    sitemap_parser.add_argument("--max-urls", type=int_between(1, 50000), default=50000,
+                                help="URLs per shard, at most the protocol's 50000 (default: 50000)")
+    sitemap_parser.set_defaults(handler=_cmd_sitemap)
+
+    stripe_parser = subparsers.add_parser("stripe-coverage", parents=[common, generation_options],
+                                          help="Check Stripe price coverage offline from the exports")
+    stripe_parser.add_argument("--no-generated", action="store_true",
+                               help="Only check the exports, not the generated catalog")
+    stripe_parser.add_argument("--report", help="Also write the full issue list as JSON")
+    stripe_parser.add_argument("--strict", action="store_true", help="Exit non-zero when any check fails")
+    stripe_parser.set_defaults(handler=_cmd_stripe_coverage)
+
+    validate_parser = subparsers.add_parser("validate", parents=[common, generation_options],
+                                            help="Run vectorized data-quality rules over exports and rows")
+    validate_parser.add_argument("--no-generated", action="store_true",
+                                 help="Only validate the master exports")
+    validate_parser.add_argument("--report", help="Also write the per-rule results as JSON")
+    validate_parser.add_argument("--strict", action="store_true", help="Exit non-zero when any rule fails")
+    validate_parser.set_defaults(handler=_cmd_validate)
+
+    dedupe_parser = subparsers.add_parser("dedupe", parents=[common, generation_options],
+                                          help="Find duplicate products and write merge clusters")
+    dedupe_parser.add_argument("--output", default="dist/catalog/dedupe/dedupe.json")
+    dedupe_parser.add_argument("--threshold", type=float, default=0.8,
+                               help="Minimum 3-gram Jaccard for a near-duplicate (default: 0.8)")
+    dedupe_parser.add_argument("--no-generated", action="store_true",
+                               help="Only compare the master exports")
+    dedupe_parser.set_defaults(handler=_cmd_dedupe)
+
+    image_match_parser = subparsers.add_parser("image-match", parents=[common, generation_options],
+                                               help="Match orphan images to product handles")
+    image_match_parser.add_argument("--output", default="dist/catalog/image-matches/matches.json")
+    image_match_parser.add_argument("--min-score", type=float, default=0.6,
+                                    help="Minimum 3-gram Jaccard for a confident match (default: 0.6)")
+    image_match_parser.add_argument("--margin", type=float, default=0.1,
+                                    help="Required lead over the runner-up (default: 0.1)")
+    image_match_parser.add_argument("--no-generated", action="store_true",
+                                    help="Match against the master exports only")
+    image_match_parser.set_defaults(handler=_cmd_image_match)
+
+    rewrite_parser = subparsers.add_parser("rewrite-urls", parents=[common],
+                                           help="Rewrite legacy pub-*.r2.dev image URLs to the CDN")
+    rewrite_parser.add_argument("--mapping", required=True,
+                                help="CSV (old_prefix,new_prefix) or JSON prefix mapping")
+    rewrite_parser.add_argument("paths", nargs="*",
+                                help="Files or globs to rewrite (default: CSV exports and generated SQL/JSON)")
+    rewrite_parser.add_argument("--write", action="store_true",
+                                help="Rewrite the files in place (default: report only)")
+    rewrite_parser.add_argument("--patch", default="sql/cdn-url-rewrite.sql",
+                                help="Set-based UPDATE patch for the live tables")
+    rewrite_parser.add_argument("--report", help="Write the full JSON report to this path")
+    rewrite_parser.add_argument("--strict", action="store_true", help="Exit non-zero when any URL is unmapped")
+    rewrite_parser.set_defaults(handler=_cmd_rewrite_urls)
+
+    upload_parser = subparsers.add_parser("upload", parents=[common],
+                                          help="Upload new or changed manifest images to R2 (S3 API)")
+    upload_parser.add_argument("target", nargs="?", default="all", choices=["all", "fall-2025", "vest-accessories"])
+    upload_parser.add_argument("--endpoint-url", help="S3 endpoint (default: $R2_ENDPOINT_URL)")
+    upload_parser.add_argument("--bucket", help="Bucket name (default: $R2_BUCKET)")
+    upload_parser.add_argument("--region", default="auto")
+    upload_parser.add_argument("--jobs", type=positive_int, default=8, help="Concurrent uploads and HEAD checks")
+    upload_parser.add_argument("--cache-control", default="public, max-age=86400")
+    upload_parser.add_argument("--state", default="metrics/upload-state.json")
+    upload_parser.add_argument("--verify-remote", action="store_true",
+                               help="HEAD every object instead of trusting the state file")
+    upload_parser.add_argument("--dry-run", action="store_true", help="Print the plan without uploading")
+    upload_parser.set_defaults(handler=_cmd_upload)
+
+    audit_parser = subparsers.add_parser("audit", parents=[common],
+                                         help="Audit generated rows (counts, prices, duplicates)")
+    audit_parser.add_argument("--profile", default="final", choices=["final", "complete"])
+    audit_parser.add_argument("--strict", action="store_true", help="Exit non-zero when any check fails")
+    audit_parser.set_defaults(handler=_cmd_audit)
+
+    pipeline_parser = subparsers.add_parser("pipeline", parents=[common, import_options],
+                                            help="scan + import + audit in one process")
+    pipeline_parser.add_argument("--skip-scan", action="store_true",
+                                 help="Use the existing manifests instead of rescanning")
+    pipeline_parser.add_argument("--base-url", default="https://cdn.kctmenswear.com")
+    pipeline_parser.add_argument("--target", default="all", choices=["all", "fall-2025", "vest-accessories"])
+    pipeline_parser.add_argument("--strict", action="store_true")
+    pipeline_parser.add_argument("--with-search", action="store_true",
+                                 help="Append weighted search_vector documents to the import")
+    pipeline_parser.set_defaults(handler=_cmd_pipeline)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .inputs import CatalogInputs
+
+    args = build_parser().parse_args(argv)
+    metrics = metrics_from_args(args.command, args).start()
+    inputs = CatalogInputs(args.root, metrics)
+
+    status = args.handler(args, inputs, metrics)
+
+    metrics.finish(status)
+    written = metrics.write(args.metrics_dir)
+    metrics.print_summary()
+    print(f"\nRun report: {written['report']}")
+    print(f"Prometheus textfile: {written['prometheus']}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
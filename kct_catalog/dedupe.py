@@ -0,0 +1,260 @@
+"""
+Near-duplicate detection across the master exports and the generated catalog.
+
+Names, handles and SKUs are normalized first ("Aqua Vest & Tie Set" and
+"Aqua Vest And Tie Set" both become "aqua vest and tie set", as in the
+name_key_norm export column). Exact matches on any normalized key are
+merged directly. Remaining near-duplicates are found with MinHash
+signatures over character 3-grams and LSH banding: records are only
+compared when they share a band bucket, so the cost grows with the catalog
+size rather than with every pair.
+
+Each merge cluster names a canonical handle (master exports first, then the
+generated rows in order). dedupe.json maps every other handle in the cluster
+to it, which doubles as the storefront's old URL -> canonical URL redirect
+list. `import --dedupe` uses that map to skip duplicate rows before they
+reach products_enhanced; the canonical product is never rewritten.
+"""
+
+import json
+import random
+import re
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .inputs import MASTER_CSV_2_PRODUCTS, MASTER_PRODUCTS_CSV, CatalogInputs
+from .metrics import RunMetrics
+from .search import normalize_text
+
+
+DEFAULT_OUTPUT = "dist/catalog/dedupe/dedupe.json"
+MASTER_SOURCES = (MASTER_PRODUCTS_CSV, MASTER_CSV_2_PRODUCTS)
+
+SHINGLE_SIZE = 3
+NUM_HASHES = 32
+BANDS = 8  # 4 rows per band: pairs above ~0.6 Jaccard almost always share a bucket
+DEFAULT_THRESHOLD = 0.8
+MAX_BUCKET = 200
+
+_PRIME = 4294967311  # smallest prime above 2**32
+# Fixed seed so signatures, and therefore clusters, are stable between runs
+_HASH_PARAMS = [(rng.randrange(1, _PRIME), rng.randrange(_PRIME))
+                for rng in map(random.Random, range(1, NUM_HASHES + 1))]
+
+NON_ALNUM = re.compile(r'[^a-z0-9]+')
+# Words that may differ between two listings of the same product
+FILLER_WORDS = {'and', 'the', 'with', 'men', 'mens', 's', 'collection'}
+# Collection suffixes that do not identify a product, e.g. "---2025-collection"
+HANDLE_NOISE = re.compile(r'\b(20\d\d collection|collection 20\d\d)\b')
+
+
+def normalize_name(name: str) -> str:
+    """'Aqua Vest & Tie Set' -> 'aqua vest and tie set'"""
+    return ' '.join(NON_ALNUM.sub(' ', normalize_text(name)).split())
+
+
+def normalize_handle(handle: str) -> str:
+    """'mens-black-suit---2025-collection' -> 'mens black suit'"""
+    return ' '.join(HANDLE_NOISE.sub(' ', normalize_name(handle.replace('_', ' '))).split())
+
+
+def normalize_sku(sku: str) -> str:
+    return NON_ALNUM.sub('', (sku or '').lower())
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    padded = f" {text} "
+    return {padded[i:i + size] for i in range(max(1, len(padded) - size + 1))}
+
+
+def _permuted(feature: str, cache: Dict[str, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """The feature under every hash permutation, computed once per distinct
+    shingle: names share most of their 3-grams, so the cache stays small."""
+    values = cache.get(feature)
+    if values is None:
+        value = zlib.crc32(feature.encode('utf-8'))
+        values = cache[feature] = tuple((a * value + b) % _PRIME for a, b in _HASH_PARAMS)
+    return values
+
+
+def minhash(features: set, cache: Optional[Dict[str, Tuple[int, ...]]] = None) -> Tuple[int, ...]:
+    """Pass the same cache for every record so each shingle is hashed once."""
+    cache = {} if cache is None else cache
+    return tuple(map(min, zip(*(_permuted(feature, cache) for feature in features))))
+
+
+def jaccard(left: set, right: set) -> float:
+    return len(left & right) / len(left | right) if left or right else 1.0
+
+
+def same_wording(left: str, right: str) -> bool:
+    """True when the words one name has and the other lacks are only filler
+    or spacing ('bowtie' vs 'bow tie'). A different color, fabric or style
+    word means a different product, however similar the rest is."""
+    left_words, right_words = left.split(), right.split()
+    left_extra = [word for word in left_words if word not in right_words and word not in FILLER_WORDS]
+    right_extra = [word for word in right_words if word not in left_words and word not in FILLER_WORDS]
+    return ''.join(left_extra) == ''.join(right_extra)
+
+
+def collect_records(inputs: CatalogInputs, rows: Optional[List[Dict]] = None) -> List[Dict]:
+    """Master export products first, then generated rows; priority is list order."""
+    records = []
+    for source in MASTER_SOURCES:
+        if not inputs.path(source).exists():
+            continue
+        for row in inputs.csv(source):
+            if row.get('handle') or row.get('name'):
+                records.append({'source': source, 'handle': row.get('handle', ''),
+                                'name': row.get('name', ''), 'sku': row.get('sku', ''),
+                                'category': row.get('category', ''),
+                                'name_key': row.get('name_key_norm', '')})
+    for row in rows or []:
+        records.append({'source': 'generated', 'handle': row['handle'], 'name': row['name'],
+                        'sku': row['sku'], 'category': row['category'], 'name_key': ''})
+
+    for record in records:
+        record['name_norm'] = normalize_name(record['name_key'] or record['name'])
+        record['handle_norm'] = normalize_handle(record['handle'])
+        record['sku_norm'] = normalize_sku(record['sku'])
+    return records
+
+
+class _UnionFind:
+
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left, right = self.find(left), self.find(right)
+        if left != right:
+            # Lower index (higher priority) stays the root
+            self.parent[max(left, right)] = min(left, right)
+
+
+def find_clusters(records: List[Dict], threshold: float = DEFAULT_THRESHOLD,
+                  metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    metrics = metrics or RunMetrics('dedupe', trace_memory=False)
+    groups = _UnionFind(len(records))
+    reasons = defaultdict(set)
+
+    with metrics.stage('dedupe_exact'):
+        for key in ('handle_norm', 'name_norm', 'sku_norm'):
+            first_seen: Dict[str, int] = {}
+            for index, record in enumerate(records):
+                value = record[key]
+                if not value:
+                    continue
+                if value in first_seen:
+                    groups.union(first_seen[value], index)
+                    reasons[frozenset((first_seen[value], index))].add(key.replace('_norm', ''))
+                else:
+                    first_seen[value] = index
+
+    with metrics.stage('dedupe_minhash'):
+        features = [shingles(record['name_norm']) | shingles(record['handle_norm']) for record in records]
+        rows_per_band = NUM_HASHES // BANDS
+        buckets = defaultdict(list)
+        permutations: Dict[str, Tuple[int, ...]] = {}
+        for index, feature_set in enumerate(features):
+            signature = minhash(feature_set, permutations)
+            for band in range(BANDS):
+                buckets[(band, signature[band * rows_per_band:(band + 1) * rows_per_band])].append(index)
+
+    compared = set()
+    with metrics.stage('dedupe_scoring'):
+        for members in buckets.values():
+            if len(members) < 2 or len(members) > MAX_BUCKET:
+                continue
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    pair = (left, right)
+                    if pair in compared or groups.find(left) == groups.find(right):
+                        continue
+                    compared.add(pair)
+                    score = jaccard(features[left], features[right])
+                    if score >= threshold and same_wording(records[left]['name_norm'],
+                                                           records[right]['name_norm']):
+                        groups.union(left, right)
+                        reasons[frozenset(pair)].add(f'similar {score:.2f}')
+    metrics.incr('dedupe_pairs_scored', len(compared))
+
+    members_by_root = defaultdict(list)
+    for index in range(len(records)):
+        members_by_root[groups.find(index)].append(index)
+
+    clusters = []
+    for root, indexes in sorted(members_by_root.items()):
+        handles = {records[index]['handle'] for index in indexes}
+        if len(indexes) < 2 or (len(handles) < 2 and len({records[i]['source'] for i in indexes}) == len(indexes)):
+            # Singletons, and the same handle once per source, are not duplicates
+            continue
+        clusters.append({
+            'canonical': records[root]['handle'],
+            'members': [{key: records[index][key] for key in ('source', 'handle', 'name', 'sku', 'category')}
+                        for index in indexes],
+            'reasons': sorted({reason for a in indexes for b in indexes if a < b
+                               for reason in reasons.get(frozenset((a, b)), ())}),
+        })
+    metrics.incr('dedupe_clusters', len(clusters))
+    return clusters
+
+
+def redirect_map(clusters: List[Dict]) -> Dict[str, str]:
+    """Duplicate handle -> canonical handle."""
+    redirects = {}
+    for cluster in clusters:
+        for member in cluster['members']:
+            if member['handle'] and member['handle'] != cluster['canonical']:
+                redirects[member['handle']] = cluster['canonical']
+    return redirects
+
+
+def write_dedupe(clusters: List[Dict], output: str) -> Path:
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps({'clusters': clusters, 'redirects': redirect_map(clusters)},
+                                      indent=2, ensure_ascii=False) + "\n")
+    return output_file
+
+
+def load_redirects(path) -> Dict[str, str]:
+    with open(path, 'r') as f:
+        return json.load(f)['redirects']
+
+
+def skip_duplicates(rows: List[Dict], redirects: Dict[str, str]) -> Dict[str, List]:
+    """Drop the rows dedupe.json names as duplicates, plus repeats of a handle.
+
+    Rows are never moved onto the canonical handle: the canonical record is
+    either a live master export product or an earlier generated row, and the
+    import upserts on handle, so a moved row would overwrite it."""
+    kept, skipped = [], []
+    seen = set()
+    for row in rows:
+        if row['handle'] in redirects or row['handle'] in seen:
+            skipped.append((row['handle'], redirects.get(row['handle'], row['handle'])))
+            continue
+        seen.add(row['handle'])
+        kept.append(row)
+    return {'rows': kept, 'skipped': skipped}
+
+
+def print_clusters(clusters: List[Dict], limit: int = 20) -> None:
+    print(f"\n{'='*80}")
+    print(f"DUPLICATE CLUSTERS: {len(clusters)}")
+    print(f"{'='*80}")
+    for cluster in clusters[:limit]:
+        print(f"{cluster['canonical']}  [{', '.join(cluster['reasons'])}]")
+        for member in cluster['members']:
+            print(f"    {member['source']:<75.75} {member['handle']}")
+    if len(clusters) > limit:
+        print(f"... and {len(clusters) - limit} more")
@@ -0,0 +1,204 @@
+"""
+Precomputed facet aggregates and bitmap index for storefront filtering.
+
+Every generated product gets a document id (its position in the rows list).
+For each facet value we keep a bitmap (Python int, bit i set when document i
+has the value). Multi-facet filtering is then OR within a facet and AND
+across facets, entirely over precomputed data.
+
+Outputs:
+
+* dist/catalog/facets/facets.json: documents, per-value counts and base64
+  little-endian bitmaps for the storefront;
+* sql/facet-counts.sql: a catalog_facet_counts summary table replacing the
+  GROUP BY the import runs to verify counts.
+"""
+
+import base64
+import json
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .generate import sql_literal
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+
+
+DEFAULT_OUTPUT_DIR = "dist/catalog/facets"
+DEFAULT_SQL_OUTPUT = "sql/facet-counts.sql"
+INDEX_VERSION = 1
+
+FACETS = ('category', 'subcategory', 'color_family', 'price_tier', 'tag')
+
+
+def master_tags(inputs: CatalogInputs) -> Dict[str, List[str]]:
+    """product_tags_import.csv tags keyed by handle."""
+    handle_by_id = inputs.handle_by_product_id()
+    tags = defaultdict(list)
+    for row in inputs.product_tags():
+        handle = handle_by_id.get(row.get('product_id'))
+        tag = (row.get('tag') or '').strip().lower()
+        if handle and tag and tag not in tags[handle]:
+            tags[handle].append(tag)
+    return tags
+
+
+def facet_values(row: Dict, tags: Iterable[str] = ()) -> Dict[str, List[str]]:
+    return {
+        'category': [row['category']],
+        'subcategory': [row['subcategory']],
+        'color_family': [row['color_family']],
+        'price_tier': [row['price_tier']],
+        'tag': list(tags),
+    }
+
+
+def build_bitmaps(rows: List[Dict], tags_by_handle: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, int]]:
+    tags_by_handle = tags_by_handle or {}
+    bitmaps: Dict[str, Dict[str, int]] = {facet: defaultdict(int) for facet in FACETS}
+    for doc_id, row in enumerate(rows):
+        bit = 1 << doc_id
+        for facet, values in facet_values(row, tags_by_handle.get(row['handle'], ())).items():
+            for value in values:
+                bitmaps[facet][value] |= bit
+    return {facet: dict(values) for facet, values in bitmaps.items()}
+
+
+def popcount(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+def encode_bitmap(bitmap: int, doc_count: int) -> str:
+    return base64.b64encode(bitmap.to_bytes((doc_count + 7) // 8, 'little')).decode('ascii')
+
+
+def decode_bitmap(encoded: str) -> int:
+    return int.from_bytes(base64.b64decode(encoded), 'little')
+
+
+def facet_counts(bitmaps: Dict[str, Dict[str, int]], within: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+    """Per-value counts, optionally restricted to the documents in `within`."""
+    counts = {}
+    for facet, values in bitmaps.items():
+        counts[facet] = {
+            value: popcount(bitmap if within is None else bitmap & within)
+            for value, bitmap in sorted(values.items())
+        }
+    return counts
+
+
+def apply_filters(bitmaps: Dict[str, Dict[str, int]], doc_count: int,
+                  filters: Dict[str, List[str]]) -> int:
+    """OR the selected values of each facet, AND the facets together."""
+    result = (1 << doc_count) - 1
+    for facet, values in filters.items():
+        selected = 0
+        for value in values:
+            selected |= bitmaps.get(facet, {}).get(value, 0)
+        result &= selected
+    return result
+
+
+def filter_with_counts(bitmaps: Dict[str, Dict[str, int]], doc_count: int,
+                       filters: Dict[str, List[str]]) -> Dict:
+    """Matching documents plus disjunctive counts: each facet is counted with
+    every filter applied except its own, as storefront sidebars expect."""
+    matches = apply_filters(bitmaps, doc_count, filters)
+    counts = {}
+    for facet in bitmaps:
+        others = {name: values for name, values in filters.items() if name != facet}
+        counts[facet] = facet_counts({facet: bitmaps[facet]},
+                                     apply_filters(bitmaps, doc_count, others))[facet]
+    return {'matches': matches, 'counts': counts}
+
+
+def documents_in(bitmap: int) -> List[int]:
+    doc_ids = []
+    while bitmap:
+        low = bitmap & -bitmap
+        doc_ids.append(low.bit_length() - 1)
+        bitmap ^= low
+    return doc_ids
+
+
+def build_facet_index(rows: List[Dict], bitmaps: Dict[str, Dict[str, int]]) -> Dict:
+    doc_count = len(rows)
+    return {
+        'version': INDEX_VERSION,
+        'docs': [row['handle'] for row in rows],
+        'facets': {
+            facet: {
+                value: {'count': popcount(bitmap), 'bitmap': encode_bitmap(bitmap, doc_count)}
+                for value, bitmap in sorted(values.items())
+            }
+            for facet, values in bitmaps.items()
+        },
+    }
+
+
+def render_facet_sql(bitmaps: Dict[str, Dict[str, int]]) -> str:
+    lines = [
+        "-- Precomputed facet counts for products_enhanced",
+        "-- Generated by python -m kct_catalog facets; safe to run multiple times",
+        "CREATE TABLE IF NOT EXISTS catalog_facet_counts (",
+        "    facet TEXT NOT NULL,",
+        "    value TEXT NOT NULL,",
+        "    product_count INTEGER NOT NULL,",
+        "    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),",
+        "    PRIMARY KEY (facet, value)",
+        ");",
+        "",
+        "BEGIN;",
+        "DELETE FROM catalog_facet_counts;",
+    ]
+    values = [
+        f"    ({sql_literal(facet)}, {sql_literal(value)}, {popcount(bitmap)})"
+        for facet, facet_bitmaps in bitmaps.items()
+        for value, bitmap in sorted(facet_bitmaps.items())
+    ]
+    if values:
+        lines.append("INSERT INTO catalog_facet_counts (facet, value, product_count) VALUES")
+        lines.append(',\n'.join(values) + ';')
+    lines.append("COMMIT;\n")
+    return '\n'.join(lines)
+
+
+def write_facet_artifacts(rows: List[Dict], inputs: CatalogInputs, output_dir: str,
+                          sql_output: str, metrics: Optional[RunMetrics] = None) -> Dict:
+    metrics = metrics or RunMetrics('facets', trace_memory=False)
+    with metrics.stage('facet_indexing'):
+        bitmaps = build_bitmaps(rows, master_tags(inputs))
+        index = build_facet_index(rows, bitmaps)
+
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_file = out_dir / "facets.json"
+    sql_file = Path(sql_output)
+    with metrics.stage('facet_writing'):
+        index_json = json.dumps(index, separators=(',', ':'), ensure_ascii=False)
+        index_file.write_text(index_json, encoding='utf-8')
+        sql = render_facet_sql(bitmaps)
+        sql_file.parent.mkdir(parents=True, exist_ok=True)
+        sql_file.write_text(sql, encoding='utf-8')
+    metrics.incr('facet_values', sum(len(values) for values in bitmaps.values()))
+    metrics.incr('bytes_written', len(index_json.encode('utf-8')) + len(sql.encode('utf-8')))
+    return {'bitmaps': bitmaps, 'index_file': index_file, 'sql_file': sql_file}
+
+
+def parse_filters(expressions: Iterable[str]) -> Dict[str, List[str]]:
+    """['category=Tuxedos', 'color_family=Black,Blue'] -> {facet: [values]}"""
+    filters: Dict[str, List[str]] = defaultdict(list)
+    for expression in expressions:
+        facet, _, values = expression.partition('=')
+        if facet not in FACETS or not values:
+            raise ValueError(f"Bad filter {expression!r}; expected <facet>=<value>[,<value>] "
+                             f"with facet one of {', '.join(FACETS)}")
+        filters[facet].extend(value.strip() for value in values.split(',') if value.strip())
+    return dict(filters)
+
+
+def print_facets(counts: Dict[str, Dict[str, int]]) -> None:
+    for facet, values in counts.items():
+        shown = ', '.join(f"{value} ({count})" for value, count in values.items() if count)
+        print(f"  {facet}: {shown or '-'}")
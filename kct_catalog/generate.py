@@ -0,0 +1,510 @@
+"""
+Build products_enhanced rows from the CDN manifests and render them as SQL.
+
+Rows are plain dicts keyed by products_enhanced column name, plus a few
+helper keys (source, category_slug, hero_image, gallery_images) that later
+stages use and the SQL renderer ignores.
+"""
+
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .attributes import (LIST_PRICES, clean_product_name, get_color_family,
+                         get_color_from_name, get_price_tier, get_random_price)
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+
+
+COLUMNS = (
+    'id', 'name', 'sku', 'handle', 'slug', 'style_code', 'season', 'collection',
+    'category', 'subcategory', 'price_tier', 'base_price', 'compare_at_price',
+    'color_name', 'color_family', 'materials', 'fit_type', 'images', 'description',
+    'status', 'meta_title', 'meta_description', 'meta_keywords', 'og_title',
+    'og_description', 'search_terms', 'url_slug', 'is_indexable', 'sitemap_priority',
+)
+
+UPSERT_COLUMNS = (
+    'name', 'base_price', 'compare_at_price', 'price_tier', 'images', 'materials',
+    'color_name', 'color_family', 'meta_title', 'meta_description',
+)
+
+# Category mapping
+FALL_2025_CATEGORY_NAMES = {
+    'double-breasted-suits': 'Double-Breasted Suits',
+    'suits': 'Suits',
+    'stretch-suits': 'Stretch Suits',
+    'tuxedos': 'Tuxedos',
+    'mens-shirts': 'Mens Shirts'
+}
+
+ACCESSORY_PRICE = 49.99
+ACCESSORY_COMPARE_PRICE = 79.99
+
+# Gallery entries kept in the images JSON, per row source
+GALLERY_LIMITS = {'fall_2025': 3, 'accessories': 2}
+
+# 'final' is the current import (tiered random pricing, UPSERT);
+# 'complete' reproduces the original flat list-price INSERT script.
+PROFILES = {
+    'final': {
+        'output': 'sql/import-all-products-final.sql',
+        'pricing': 'range',
+        'upsert': True,
+        'detailed_attributes': True,
+        'banner': [
+            "Generating SQL with correct pricing...",
+            "Shirts: $49-69",
+            "Suits: $200-400",
+            "Tuxedos: $250-400",
+            "Accessories: $49.99",
+        ],
+        'fall_2025_header': [
+            "-- Complete Fall 2025 Collection Import with Correct Pricing",
+            "-- Shirts: $49-69, Suits: $200-400, Tuxedos: $250-400",
+            "-- UPSERT: Will update existing products or insert new ones",
+            "-- Safe to run multiple times - won't create duplicates\n",
+        ],
+        'accessories_header': [
+            "\n\n-- Complete Accessories Collection Import",
+            "-- All accessories priced at $49.99",
+            "-- UPSERT: Will update existing products or insert new ones\n",
+        ],
+        'fall_2025': {
+            'description': 'Premium {name} from our exclusive Fall 2025 Collection. Expertly tailored with meticulous attention to detail and superior craftsmanship. Perfect for the modern gentleman who values quality and style.',
+            'meta_title': '{name:.30} | {category}',
+            'meta_description': 'Shop {name} at ${base_price}. Fall 2025 Collection. Free shipping on orders over $200.',
+            'meta_keywords': ['{category_lower}', '{color_lower}', 'fall 2025', 'menswear', 'formal', '{subcategory_lower}'],
+            'og_title': '{name:.45} - Fall 2025',
+            'og_description': 'Elegant {name} from our Fall 2025 Collection. Perfect for formal occasions and special events.',
+            'search_terms': '{slug} {category_lower} {color_lower} formal fall 2025',
+        },
+        'accessories': {
+            'materials': {
+                'suspender': '{"suspenders": "Premium Elastic", "clips": "Metal", "bowtie": "Polyester"}',
+                'vest': '{"vest": "Premium Microfiber", "tie": "Matching Microfiber", "backing": "Adjustable"}',
+            },
+            'description': 'Elegant {name} perfect for weddings, proms, and formal events. Premium quality construction with attention to detail. Complete your formal ensemble with this sophisticated accessory set.',
+            'meta_title': '{name:.35} | Accessories',
+            'meta_description': 'Shop {name} at $49.99. Perfect for weddings & formal events. Same-day shipping available.',
+            'meta_keywords': ['accessories', '{subcategory_lower}', '{color_lower}', 'formal', 'wedding', 'prom'],
+            'og_title': '{name:.40} - Accessories',
+            'og_description': 'Premium {name} for weddings, proms, and formal occasions. High-quality construction.',
+            'search_terms': '{slug} accessories {subcategory_lower} formal wedding prom',
+        },
+        'verify_sql': """
+
+-- Verify import with pricing ranges
+SELECT
+    category,
+    subcategory,
+    COUNT(*) as count,
+    MIN(base_price) as min_price,
+    MAX(base_price) as max_price,
+    ROUND(AVG(base_price), 2) as avg_price
+FROM products_enhanced
+WHERE sku LIKE 'F25-%' OR sku LIKE 'ACC-%'
+GROUP BY category, subcategory
+ORDER BY category, subcategory;
+""",
+    },
+    'complete': {
+        'output': 'sql/import-all-products-complete.sql',
+        'pricing': 'list',
+        'upsert': False,
+        'detailed_attributes': False,
+        'banner': [],
+        'fall_2025_header': [
+            "-- Complete Fall 2025 Collection Import",
+            "-- Auto-generated from JSON data\n",
+        ],
+        'accessories_header': [
+            "\n\n-- Complete Accessories Collection Import",
+            "-- Auto-generated from JSON data\n",
+        ],
+        'fall_2025': {
+            'description': 'Premium {name} from our Fall 2025 Collection. Expertly tailored with attention to detail.',
+            'meta_title': '{name} | {category} | KCT Menswear',
+            'meta_description': 'Shop {name} at ${base_price}. Fall 2025 Collection. Free shipping.',
+            'meta_keywords': ['{category_lower}', '{color_lower}', 'fall 2025', 'menswear'],
+            'og_title': '{name} - Fall 2025',
+            'og_description': 'Elegant {name} perfect for formal occasions.',
+            'search_terms': '{slug} {category_lower} {color_lower} formal',
+        },
+        'accessories': {
+            'materials': {
+                'suspender': '{"primary": "Premium Microfiber", "hardware": "Metal"}',
+                'vest': '{"primary": "Premium Microfiber", "hardware": "Metal"}',
+            },
+            'description': 'Elegant {name} perfect for weddings, proms, and formal events. Premium quality accessories.',
+            'meta_title': '{name} | Formal Accessories | KCT Menswear',
+            'meta_description': 'Shop {name} at $49.99. Perfect for formal events. Same-day shipping.',
+            'meta_keywords': ['accessories', '{subcategory_lower}', '{color_lower}', 'formal', 'wedding'],
+            'og_title': '{name} - Premium Accessories',
+            'og_description': 'Premium {name} for formal occasions.',
+            'search_terms': '{slug} accessories formal wedding',
+        },
+        'verify_sql': """
+
+-- Verify import
+SELECT category, subcategory, COUNT(*) as count, MIN(base_price) as min_price, MAX(base_price) as max_price
+FROM products_enhanced
+WHERE sku LIKE 'F25-%' OR sku LIKE 'ACC-%'
+GROUP BY category, subcategory
+ORDER BY category, subcategory;
+""",
+    },
+}
+
+
+def get_fall_2025_subcategory(product_slug: str) -> str:
+    """Determine subcategory based on product characteristics"""
+    slug = product_slug.lower()
+    if 'prom' in slug:
+        return 'Prom Collection'
+    elif 'wedding' in slug:
+        return 'Wedding Collection'
+    elif 'double-breasted' in slug:
+        return 'Executive Collection'
+    elif 'stretch' in slug:
+        return 'Performance Collection'
+    elif 'tuxedo' in slug:
+        return 'Black Tie Collection'
+    return 'Premium Collection'
+
+
+def get_fall_2025_materials(category_slug: str):
+    """Materials and fit based on category"""
+    if category_slug == 'mens-shirts':
+        return '{"primary": "Premium Cotton Blend", "finish": "Wrinkle-Resistant"}', 'Tailored Fit'
+    elif category_slug == 'stretch-suits':
+        return '{"primary": "Wool Blend with Elastane", "lining": "Breathable Viscose", "stretch": "4-way"}', 'Athletic Fit'
+    elif category_slug == 'tuxedos':
+        return '{"primary": "Premium Wool", "lapels": "Silk Satin", "lining": "Silk Blend"}', 'Slim Fit'
+    return '{"primary": "Premium Wool Blend", "lining": "Viscose", "buttons": "Horn"}', 'Modern Fit'
+
+
+def new_product_id(rng: Optional[random.Random] = None) -> str:
+    """Random UUID4; drawn from rng when seeded so reruns are byte-identical."""
+    if rng is None:
+        return str(uuid.uuid4())
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def product_rng(seed: Optional[int], handle: str) -> Optional[random.Random]:
+    """A separate stream per product, so adding or removing one product does
+    not shift the ids and prices of the others."""
+    if seed is None:
+        return None
+    return random.Random(f"{seed}:{handle}")
+
+
+def split_images(images: List[Dict], hero_markers: Iterable[str]):
+    """Pick the hero image (last marker match wins) and the remaining gallery."""
+    hero_image = ''
+    gallery_images = []
+    for img in images:
+        if any(marker in img['image_name'] for marker in hero_markers):
+            hero_image = img['cdn_url']
+        else:
+            gallery_images.append(img['cdn_url'])
+
+    if not hero_image and gallery_images:
+        hero_image = gallery_images[0]
+        gallery_images = gallery_images[1:]
+    return hero_image, gallery_images
+
+
+def build_images_json(hero_image: str, gallery_images: List[str], gallery_limit: int) -> str:
+    images = {}
+    if hero_image:
+        images['hero'] = {'url': hero_image}
+    if gallery_images:
+        images['gallery'] = [{'url': url} for url in gallery_images[:gallery_limit]]
+    return json.dumps(images)
+
+
+def attach_images(rows: List[Dict], images_by_handle: Dict[str, List[str]]) -> int:
+    """Add confirmed image matches (handle -> URLs) to the rows; the first
+    match becomes the hero when a row has none. Returns the images added to
+    the images JSON; matches past the source's gallery limit are kept in
+    gallery_images but not counted."""
+    added = 0
+    for row in rows:
+        known = {row['hero_image'], *row['gallery_images']}
+        extra = [url for url in images_by_handle.get(row['handle'], ()) if url not in known]
+        if not extra:
+            continue
+        limit = GALLERY_LIMITS[row['source']]
+        published = bool(row['hero_image']) + len(row['gallery_images'][:limit])
+        if not row['hero_image']:
+            row['hero_image'] = extra.pop(0)
+        row['gallery_images'] = row['gallery_images'] + extra
+        row['images'] = build_images_json(row['hero_image'], row['gallery_images'], limit)
+        added += bool(row['hero_image']) + len(row['gallery_images'][:limit]) - published
+    return added
+
+
+def _apply_text(row: Dict, templates: Dict) -> None:
+    fields = {
+        'name': row['name'],
+        'slug': row['handle'],
+        'category': row['category'],
+        'category_lower': row['category'].lower(),
+        'subcategory_lower': row['subcategory'].lower(),
+        'color_lower': row['color_name'].lower(),
+        'base_price': row['base_price'],
+    }
+    for column in ('description', 'meta_title', 'meta_description', 'og_title',
+                   'og_description', 'search_terms'):
+        row[column] = templates[column].format(**fields)
+    row['meta_keywords'] = [keyword.format(**fields) for keyword in templates['meta_keywords']]
+
+
+def build_fall_2025_rows(data: Dict, profile: str = 'final', seed: Optional[int] = None,
+                         metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    """Build product rows for the Fall 2025 Collection"""
+    settings = PROFILES[profile]
+    metrics = metrics or RunMetrics('import', trace_memory=False)
+    rows = []
+    product_count = 0
+
+    for category_slug, products in data['categories'].items():
+        category = FALL_2025_CATEGORY_NAMES.get(category_slug, category_slug.replace('-', ' ').title())
+
+        for product_slug, product_data in products.items():
+            product_count += 1
+            metrics.incr('products')
+            rng = product_rng(seed, product_slug)
+            sku = f"F25-{category_slug[:3].upper()}-{product_count:03d}"
+
+            with metrics.stage('pricing'):
+                if settings['pricing'] == 'range':
+                    base_price = get_random_price(category_slug, rng)
+                    # Compare at price is 30-50% higher
+                    compare_price = round(base_price * (rng or random).uniform(1.3, 1.5), 2)
+                else:
+                    base_price = LIST_PRICES.get(category_slug, 399.99)
+                    compare_price = base_price + 150
+                price_tier = get_price_tier(base_price)
+
+            product_name = clean_product_name(product_slug)
+            with metrics.stage('color_extraction'):
+                color_name = get_color_from_name(product_name)
+                color_family = get_color_family(color_name)
+
+            if settings['detailed_attributes']:
+                subcategory = get_fall_2025_subcategory(product_slug)
+                materials, fit_type = get_fall_2025_materials(category_slug)
+            else:
+                subcategory = 'Premium Collection'
+                materials, fit_type = '{"primary": "Premium Wool Blend", "lining": "Viscose"}', 'Modern Fit'
+
+            images = product_data.get('images', [])
+            metrics.incr('images', len(images))
+            hero_image, gallery_images = split_images(images, ('main', 'lifestyle'))
+
+            row = {
+                'id': new_product_id(rng),
+                'name': product_name,
+                'sku': sku,
+                'handle': product_slug,
+                'slug': product_slug,
+                'style_code': sku,
+                'season': 'Fall 2025',
+                'collection': 'Fall 2025 Collection',
+                'category': category,
+                'subcategory': subcategory,
+                'price_tier': price_tier,
+                'base_price': base_price,
+                'compare_at_price': compare_price,
+                'color_name': color_name,
+                'color_family': color_family,
+                'materials': materials,
+                'fit_type': fit_type,
+                'images': build_images_json(hero_image, gallery_images, GALLERY_LIMITS['fall_2025']),
+                'status': 'active',
+                'url_slug': product_slug,
+                'is_indexable': True,
+                'sitemap_priority': 0.8,
+                'source': 'fall_2025',
+                'category_slug': category_slug,
+                'hero_image': hero_image,
+                'gallery_images': gallery_images,
+            }
+            _apply_text(row, settings['fall_2025'])
+            rows.append(row)
+
+    return rows
+
+
+def build_accessory_rows(data: Dict, profile: str = 'final', seed: Optional[int] = None,
+                         metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    """Build product rows for the Accessories Collection"""
+    settings = PROFILES[profile]
+    metrics = metrics or RunMetrics('import', trace_memory=False)
+    rows = []
+    product_count = 0
+
+    for category_slug, products in data['categories'].items():
+        for product_slug, product_data in products.items():
+            product_count += 1
+            metrics.incr('products')
+            rng = product_rng(seed, product_slug)
+            product_name = clean_product_name(product_slug)
+
+            if 'suspender' in product_slug:
+                sku_prefix = 'ACC-SBS'
+                subcategory = 'Suspender Sets'
+                fit_type = 'One Size'
+                materials = settings['accessories']['materials']['suspender']
+            else:
+                sku_prefix = 'ACC-VTS'
+                subcategory = 'Vest Sets'
+                fit_type = 'XS-6XL'
+                materials = settings['accessories']['materials']['vest']
+
+            sku = f"{sku_prefix}-{product_count:03d}"
+
+            with metrics.stage('color_extraction'):
+                color_name = get_color_from_name(product_name)
+                color_family = get_color_family(color_name)
+
+            images = product_data.get('images', [])
+            metrics.incr('images', len(images))
+            hero_image, gallery_images = split_images(images, ('main', 'model'))
+
+            row = {
+                'id': new_product_id(rng),
+                'name': product_name,
+                'sku': sku,
+                'handle': product_slug,
+                'slug': product_slug,
+                'style_code': sku,
+                'season': 'All Season',
+                'collection': 'Accessories Collection',
+                'category': 'Accessories',
+                'subcategory': subcategory,
+                'price_tier': 'TIER_1',
+                'base_price': ACCESSORY_PRICE,
+                'compare_at_price': ACCESSORY_COMPARE_PRICE,
+                'color_name': color_name,
+                'color_family': color_family,
+                'materials': materials,
+                'fit_type': fit_type,
+                'images': build_images_json(hero_image, gallery_images, GALLERY_LIMITS['accessories']),
+                'status': 'active',
+                'url_slug': product_slug,
+                'is_indexable': True,
+                'sitemap_priority': 0.7,
+                'source': 'accessories',
+                'category_slug': category_slug,
+                'hero_image': hero_image,
+                'gallery_images': gallery_images,
+            }
+            _apply_text(row, settings['accessories'])
+            rows.append(row)
+
+    return rows
+
+
+def build_rows(inputs: CatalogInputs, profile: str = 'final', seed: Optional[int] = None,
+               metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    """All product rows, Fall 2025 first, then accessories. With a seed, each
+    product's id and prices depend only on the seed and its handle."""
+    return (build_fall_2025_rows(inputs.fall_2025(), profile, seed, metrics)
+            + build_accessory_rows(inputs.vest_accessories(), profile, seed, metrics))
+
+
+def sql_literal(value) -> str:
+    """Render a Python value as a Postgres literal."""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return 'ARRAY[' + ', '.join(sql_literal(item) for item in value) + ']'
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def render_insert(row: Dict, upsert: bool = True) -> str:
+    values = ',\n    '.join(sql_literal(row[column]) for column in COLUMNS)
+    statement = f"""
+INSERT INTO products_enhanced (
+    id, name, sku, handle, slug, style_code, season, collection,
+    category, subcategory, price_tier, base_price, compare_at_price,
+    color_name, color_family, materials, fit_type, images, description,
+    status, meta_title, meta_description, meta_keywords, og_title,
+    og_description, search_terms, url_slug, is_indexable, sitemap_priority,
+    created_at, updated_at
+) VALUES (
+    {values},
+    NOW(),
+    NOW()
+)"""
+    if not upsert:
+        return statement + ";"
+    updates = ',\n    '.join(f"{column} = EXCLUDED.{column}" for column in UPSERT_COLUMNS)
+    return statement + f"""
+ON CONFLICT (handle) DO UPDATE SET
+    {updates},
+    updated_at = NOW();"""
+
+
+def render_import_sql(rows: List[Dict], profile: str = 'final') -> str:
+    settings = PROFILES[profile]
+    sections = []
+    for source in ('fall_2025', 'accessories'):
+        lines = list(settings[f'{source}_header'])
+        lines.extend(render_insert(row, settings['upsert']) for row in rows if row['source'] == source)
+        sections.append('\n'.join(lines))
+    return ''.join(sections) + settings['verify_sql']
+
+
+def run_import(inputs: CatalogInputs, metrics: RunMetrics, profile: str = 'final',
+               output: Optional[str] = None, seed: Optional[int] = None,
+               redirects: Optional[Dict[str, str]] = None,
+               image_matches: Optional[Dict[str, List[str]]] = None) -> Dict:
+    """Build rows and write the import SQL. Returns the rows and output path.
+
+    redirects (duplicate handle -> canonical handle, from dedupe.json) drops
+    the duplicate rows. image_matches
+    (handle -> image URLs, from the image-match command) adds confirmed
+    images to the rows.
+    """
+    settings = PROFILES[profile]
+    for line in settings['banner']:
+        print(line)
+
+    rows = build_rows(inputs, profile, seed, metrics)
+    if redirects:
+        from .dedupe import skip_duplicates
+
+        deduped = skip_duplicates(rows, redirects)
+        rows = deduped['rows']
+        metrics.incr('duplicates_skipped', len(deduped['skipped']))
+        for handle, canonical in deduped['skipped']:
+            print(f"Skipped duplicate {handle} (canonical: {canonical})")
+    if image_matches:
+        added = attach_images(rows, image_matches)
+        metrics.incr('matched_images_attached', added)
+        print(f"Attached {added} matched images")
+
+    with metrics.stage('sql_rendering'):
+        complete_sql = render_import_sql(rows, profile)
+
+    output_file = Path(output) if output else inputs.path(settings['output'])
+    with metrics.stage('sql_writing'):
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with output_file.open('w') as f:
+            f.write(complete_sql)
+    metrics.incr('bytes_written', len(complete_sql.encode('utf-8')))
+
+    print(f"\nGenerated complete import script ({profile})!")
+    print(f"File: {output_file}")
+    print(f"Total: {len(rows)} products generated")
+    return {'rows': rows, 'output': output_file}
@@ -0,0 +1,217 @@
+"""
+Fuzzy matching of orphan images to products.
+
+Replaces smart-match-remaining-images.js and the hand-written
+MANUAL_COMPLETE_IMAGE_FIX_*.sql. Image URLs come from the sources the staging
+catalog knows about: URL lists, image exports and the master exports' primary
+and gallery columns. An image is an orphan when no product references it yet.
+
+Product handles (master exports and generated rows, normalized as in
+dedupe.py) go into an inverted character 3-gram index. An image path is cut
+into segments on '/' and '_', for example
+`tie_clean_batch_01/.../vest-and-tie_aqua-vest-and-tie-set_1.0.jpg`. Each
+segment's 3-grams are looked up in the index. Only handles sharing a 3-gram
+with the image are scored, by Jaccard similarity of their 3-grams with the
+best-matching segment. A match is confident when the best score clears
+--min-score and leads the runner-up by --margin. Other images with any
+candidate go into the ambiguity report.
+
+`import --image-matches` adds the confident matches to the generated rows'
+images JSON.
+"""
+
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from .dedupe import normalize_handle
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+from .staging import SOURCES, URL_PATTERN
+
+
+DEFAULT_OUTPUT = "dist/catalog/image-matches/matches.json"
+DEFAULT_MIN_SCORE = 0.6
+DEFAULT_MARGIN = 0.1
+GRAM_SIZE = 3
+CANDIDATES_REPORTED = 3
+
+IMAGE_EXTENSION = re.compile(r'\.(webp|jpe?g|png|gif|avif)$', re.IGNORECASE)
+# Path words that describe the shot or the upload batch, never the product
+SEGMENT_NOISE = re.compile(r'\b(clean|batch|main|front|back|side|close|model|lifestyle|detail|'
+                           r'img|image|photo|\d+)\b')
+GALLERY_SEPARATOR = re.compile(r'[,;]\s*')
+
+
+def grams(text: str) -> set:
+    """Character 3-grams of each word, so word order does not matter."""
+    result = set()
+    for word in text.split():
+        padded = f" {word} "
+        result.update(padded[i:i + GRAM_SIZE] for i in range(len(padded) - GRAM_SIZE + 1))
+    return result
+
+
+def handle_text(handle: str) -> str:
+    """Master export handles carry a collection suffix after '---'
+    ('mens-prom-gold-blazer---prom--wedding-2025'); only the part before it
+    names the product."""
+    return normalize_handle(handle.split('---')[0])
+
+
+def image_segments(url: str) -> List[str]:
+    """Normalized product-looking pieces of an image path."""
+    path = IMAGE_EXTENSION.sub('', urlparse(url).path)
+    segments = []
+    for piece in re.split(r'[/_]', path):
+        text = ' '.join(SEGMENT_NOISE.sub(' ', normalize_handle(piece)).split())
+        if len(text) >= GRAM_SIZE and text not in segments:
+            segments.append(text)
+    return segments
+
+
+def collect_products(inputs: CatalogInputs, rows: Optional[List[Dict]] = None) -> Dict[str, Dict]:
+    """handle -> {'name', 'images'} from the master exports and generated rows."""
+    products: Dict[str, Dict] = {}
+    product_ids: Dict[str, str] = {}
+    for source, kind in SOURCES:
+        if kind not in ('master', 'master_variants') or not inputs.path(source).exists():
+            continue
+        for row in inputs.csv(source):
+            handle = row.get('handle')
+            if not handle:
+                continue
+            product = products.setdefault(handle, {'name': row.get('name', ''), 'images': set()})
+            product_ids[row.get('product_id', '')] = handle
+            for url in [row.get('primary_image', '')] + GALLERY_SEPARATOR.split(row.get('gallery_urls') or ''):
+                if url.strip():
+                    product['images'].add(url.strip())
+    for source, kind in SOURCES:
+        if kind != 'images' or not inputs.path(source).exists():
+            continue
+        for row in inputs.csv(source):
+            handle = product_ids.get(row.get('product_id', ''))
+            if handle and row.get('image_url'):
+                products[handle]['images'].add(row['image_url'])
+    for row in rows or []:
+        product = products.setdefault(row['handle'], {'name': row['name'], 'images': set()})
+        product['images'].update(url for url in [row.get('hero_image')] + row.get('gallery_images', []) if url)
+    return products
+
+
+def collect_images(inputs: CatalogInputs) -> List[str]:
+    """Every image URL in the URL lists and image exports, first seen first."""
+    seen = {}
+    for source, kind in SOURCES:
+        if not inputs.path(source).exists():
+            continue
+        if kind == 'urls':
+            for line in inputs.path(source).read_text(encoding='utf-8').splitlines():
+                if not line.lstrip().startswith('#'):
+                    for url in URL_PATTERN.findall(line):
+                        seen.setdefault(url, None)
+        elif kind == 'images':
+            for row in inputs.csv(source):
+                if row.get('image_url'):
+                    seen.setdefault(row['image_url'], None)
+    return [url for url in seen if IMAGE_EXTENSION.search(urlparse(url).path)]
+
+
+def build_handle_index(handles: List[str]) -> Dict:
+    postings = defaultdict(list)
+    gram_counts = []
+    for doc_id, handle in enumerate(handles):
+        handle_grams = grams(handle_text(handle))
+        gram_counts.append(len(handle_grams))
+        for gram in handle_grams:
+            postings[gram].append(doc_id)
+    return {'handles': handles, 'postings': dict(postings), 'gram_counts': gram_counts}
+
+
+def rank_candidates(index: Dict, url: str) -> List[Dict]:
+    """Handles sharing 3-grams with the image, best Jaccard first."""
+    best: Dict[int, float] = {}
+    for segment in image_segments(url):
+        segment_grams = grams(segment)
+        shared = defaultdict(int)
+        for gram in segment_grams:
+            for doc_id in index['postings'].get(gram, ()):
+                shared[doc_id] += 1
+        for doc_id, count in shared.items():
+            score = count / (len(segment_grams) + index['gram_counts'][doc_id] - count)
+            if score > best.get(doc_id, 0):
+                best[doc_id] = score
+    ranked = sorted(best.items(), key=lambda item: (-item[1], index['handles'][item[0]]))
+    return [{'handle': index['handles'][doc_id], 'score': round(score, 3)} for doc_id, score in ranked]
+
+
+def match_images(inputs: CatalogInputs, rows: Optional[List[Dict]] = None,
+                 min_score: float = DEFAULT_MIN_SCORE, margin: float = DEFAULT_MARGIN,
+                 metrics: Optional[RunMetrics] = None) -> Dict:
+    metrics = metrics or RunMetrics('image_match', trace_memory=False)
+    with metrics.stage('image_match_indexing'):
+        products = collect_products(inputs, rows)
+        linked = {url for product in products.values() for url in product['images']}
+        orphans = [url for url in collect_images(inputs) if url not in linked]
+        index = build_handle_index(sorted(products))
+
+    matches, ambiguous, unmatched = [], [], []
+    with metrics.stage('image_matching'):
+        for url in orphans:
+            candidates = rank_candidates(index, url)[:CANDIDATES_REPORTED]
+            if not candidates:
+                unmatched.append(url)
+                continue
+            best = candidates[0]
+            runner_up = candidates[1]['score'] if len(candidates) > 1 else 0.0
+            if best['score'] >= min_score and best['score'] - runner_up >= margin:
+                matches.append({'image': url, 'handle': best['handle'], 'score': best['score'],
+                                'runner_up': runner_up})
+            else:
+                ambiguous.append({'image': url, 'candidates': candidates})
+
+    by_handle = defaultdict(list)
+    for match in matches:
+        by_handle[match['handle']].append(match['image'])
+    metrics.incr('orphan_images', len(orphans))
+    metrics.incr('images_matched', len(matches))
+    metrics.incr('images_ambiguous', len(ambiguous))
+    return {
+        'products': len(products),
+        'orphans': len(orphans),
+        'matches': matches,
+        'ambiguous': ambiguous,
+        'unmatched': unmatched,
+        'by_handle': dict(sorted(by_handle.items())),
+    }
+
+
+def write_matches(result: Dict, output: str) -> Path:
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(json.dumps(result, indent=2, ensure_ascii=False) + "\n")
+    return output_file
+
+
+def load_matches(path) -> Dict[str, List[str]]:
+    with open(path, 'r') as f:
+        return json.load(f)['by_handle']
+
+
+def print_matches(result: Dict, limit: int = 15) -> None:
+    print(f"\n{'='*80}")
+    print("IMAGE MATCHES")
+    print(f"{'='*80}")
+    print(f"Products: {result['products']}  Orphan images: {result['orphans']}  "
+          f"Matched: {len(result['matches'])}  Ambiguous: {len(result['ambiguous'])}  "
+          f"Unmatched: {len(result['unmatched'])}")
+    for match in result['matches'][:limit]:
+        print(f"  {match['score']:.2f}  {match['handle']:<45} {match['image']}")
+    if result['ambiguous']:
+        print("\nAmbiguous:")
+        for entry in result['ambiguous'][:limit]:
+            options = ', '.join(f"{c['handle']} ({c['score']:.2f})" for c in entry['candidates'])
+            print(f"  {entry['image']}\n      {options}")
@@ -0,0 +1,83 @@
+"""
+Shared, lazily loaded catalog inputs.
+
+A single CatalogInputs instance is passed between stages so that one pipeline
+run reads and parses each source file at most once.
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .metrics import RunMetrics
+from .scan import FALL_2025_MANIFEST, VEST_ACCESSORIES_MANIFEST
+
+
+MASTER_PRODUCTS_CSV = "kct_master_exports/master_product_final.csv"
+PRODUCT_TAGS_CSV = "kct_master_exports/product_tags_import.csv"
+PRODUCT_VARIANTS_CSV = "kct_master_exports/product_variants_import.csv"
+MASTER_CSV_2_PRODUCTS = "Master-CSV-2/Website_Master__Enhanced__No_Duplicates__Images_Cleaned_.csv"
+MASTER_CSV_2_VARIANTS = "Master-CSV-2/Website_Variants__Suspenders_collapsed_to_One_Size_.csv"
+
+
+def load_json(filename):
+    with open(filename, 'r') as f:
+        return json.load(f)
+
+
+def load_csv(filename) -> List[Dict[str, str]]:
+    with open(filename, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+class CatalogInputs:
+    """Cache of parsed input files, keyed by path relative to root."""
+
+    def __init__(self, root: str = ".", metrics: Optional[RunMetrics] = None):
+        self.root = Path(root)
+        self.metrics = metrics
+        self._cache: Dict[str, object] = {}
+
+    def path(self, relative: str) -> Path:
+        return self.root / relative
+
+    def put(self, key: str, value) -> None:
+        """Seed the cache with data produced in-process (e.g. by the scan stage)."""
+        self._cache[key] = value
+
+    def get(self, key: str, default=None):
+        return self._cache.get(key, default)
+
+    def json(self, relative: str):
+        return self._load(relative, load_json)
+
+    def csv(self, relative: str) -> List[Dict[str, str]]:
+        return self._load(relative, load_csv)
+
+    def fall_2025(self) -> Dict:
+        return self.json(FALL_2025_MANIFEST)
+
+    def vest_accessories(self) -> Dict:
+        return self.json(VEST_ACCESSORIES_MANIFEST)
+
+    def master_products(self) -> List[Dict[str, str]]:
+        return self.csv(MASTER_PRODUCTS_CSV)
+
+    def product_tags(self) -> List[Dict[str, str]]:
+        return self.csv(PRODUCT_TAGS_CSV)
+
+    def handle_by_product_id(self) -> Dict[str, str]:
+        """Master export product_id -> handle, for joining the per-id exports."""
+        return {row['product_id']: row['handle'] for row in self.master_products()
+                if row.get('product_id') and row.get('handle')}
+
+    def _load(self, relative: str, loader):
+        if relative not in self._cache:
+            if self.metrics is not None:
+                with self.metrics.stage('parsing'):
+                    self._cache[relative] = loader(self.path(relative))
+                self.metrics.incr('files_parsed')
+            else:
+                self._cache[relative] = loader(self.path(relative))
+        return self._cache[relative]
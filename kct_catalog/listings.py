@@ -0,0 +1,101 @@
+"""
+Pre-rendered, paginated category listing payloads for the CDN.
+
+For every category and category/subcategory, and every sort order, writes
+compact JSON pages holding only the card fields (name, handle, price,
+compare-at price, hero image). Layout:
+
+    dist/catalog/listings/<category>/<sort>/page-<n>.json
+    dist/catalog/listings/<category>/<subcategory>/<sort>/page-<n>.json
+
+Only pages whose content changed are rewritten (see publish.PublishState);
+changed.txt lists them for upload. Pass the same --seed between runs,
+otherwise the random prices change every page.
+"""
+
+import json
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from .attributes import slugify
+from .metrics import RunMetrics
+from .publish import PublishState
+
+
+DEFAULT_OUTPUT_DIR = "dist/catalog/listings"
+DEFAULT_PAGE_SIZE = 24
+
+SORTS = {
+    'featured': None,
+    'price-asc': lambda card: (card['price'], card['handle']),
+    'price-desc': lambda card: (-card['price'], card['handle']),
+    'name-asc': lambda card: (card['name'].lower(), card['handle']),
+}
+
+
+def card(row: Dict) -> Dict:
+    return {
+        'name': row['name'],
+        'handle': row['handle'],
+        'price': row['base_price'],
+        'compare_at': row['compare_at_price'],
+        'hero': row.get('hero_image', ''),
+    }
+
+
+def collections(rows: List[Dict]) -> Dict[str, Dict]:
+    """Listing path -> {'title', 'cards'} for every category and subcategory."""
+    grouped: Dict[str, Dict] = defaultdict(lambda: {'title': '', 'cards': []})
+    for row in rows:
+        category_path = slugify(row['category'])
+        subcategory_path = f"{category_path}/{slugify(row['subcategory'])}"
+        grouped[category_path]['title'] = row['category']
+        grouped[category_path]['cards'].append(card(row))
+        grouped[subcategory_path]['title'] = f"{row['category']} / {row['subcategory']}"
+        grouped[subcategory_path]['cards'].append(card(row))
+    return dict(grouped)
+
+
+def paginate(path: str, title: str, cards: List[Dict], sort: str, page_size: int):
+    """Yield (relative file, payload) for every page of one sorted listing."""
+    key = SORTS[sort]
+    ordered = cards if key is None else sorted(cards, key=key)
+    pages = max(1, math.ceil(len(ordered) / page_size))
+    for page in range(1, pages + 1):
+        yield f"{path}/{sort}/page-{page}.json", {
+            'collection': path,
+            'title': title,
+            'sort': sort,
+            'page': page,
+            'pages': pages,
+            'total': len(ordered),
+            'products': ordered[(page - 1) * page_size:page * page_size],
+        }
+
+
+def publish_listings(rows: List[Dict], output_dir: str = DEFAULT_OUTPUT_DIR,
+                     page_size: int = DEFAULT_PAGE_SIZE,
+                     metrics: Optional[RunMetrics] = None) -> Dict[str, List[str]]:
+    metrics = metrics or RunMetrics('listings', trace_memory=False)
+    state = PublishState(output_dir)
+    index = []
+
+    with metrics.stage('listing_rendering'):
+        for path, collection in sorted(collections(rows).items()):
+            for sort in SORTS:
+                for relative, payload in paginate(path, collection['title'], collection['cards'],
+                                                  sort, page_size):
+                    content = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+                    if state.write(relative, content):
+                        metrics.incr('bytes_written', len(content))
+            index.append({'collection': path, 'title': collection['title'], 'total': len(collection['cards']),
+                          'pages': max(1, math.ceil(len(collection['cards']) / page_size)),
+                          'sorts': list(SORTS)})
+        state.write("index.json", json.dumps({'page_size': page_size, 'collections': index},
+                                             separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+
+    result = state.finish()
+    metrics.incr('pages_written', len(result['written']))
+    metrics.incr('pages_unchanged', len(result['unchanged']))
+    return result
@@ -0,0 +1,248 @@
+"""
+Direct loader: push generated rows into products_enhanced over a small pool
+of Postgres connections instead of pasting SQL into the Supabase editor.
+
+Rows are split into fixed-size chunks. Each chunk is one transaction
+(COPY into a temp staging table + INSERT ... ON CONFLICT (handle), or a
+batched executemany), and the chunk index is written to a checkpoint file
+after it commits, so an interrupted import resumes with the next chunk.
+
+Requires psycopg 3 (`pip install "psycopg[binary]"`); works against any
+Postgres URL, including a local instance.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import Queue
+from typing import Dict, List, Optional
+
+from .generate import COLUMNS, UPSERT_COLUMNS
+from .metrics import RunMetrics
+
+
+DEFAULT_CHECKPOINT = "metrics/load-checkpoint.json"
+DEFAULT_TABLE = "products_enhanced"
+
+
+class LoadError(RuntimeError):
+    pass
+
+
+def _psycopg():
+    try:
+        import psycopg
+    except ImportError:
+        raise LoadError("The load command needs psycopg 3: pip install \"psycopg[binary]\"")
+    return psycopg
+
+
+def rows_fingerprint(rows: List[Dict]) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(row['handle'].encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def dsn_fingerprint(dsn: str) -> str:
+    return hashlib.sha256(dsn.encode('utf-8')).hexdigest()[:16]
+
+
+class Checkpoint:
+    """Completed chunk indexes for one (target, rows, chunk size) combination."""
+
+    def __init__(self, path: str, state: Dict):
+        self.path = Path(path)
+        self.state = state
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Checkpoint"]:
+        checkpoint_path = Path(path)
+        if not checkpoint_path.exists():
+            return None
+        try:
+            state = json.loads(checkpoint_path.read_text())
+        except ValueError as exc:
+            raise LoadError(f"{checkpoint_path} is not a valid checkpoint ({exc}); use --restart")
+        return cls(path, state)
+
+    @property
+    def completed(self) -> set:
+        return set(self.state.get('completed', []))
+
+    def matches(self, **expected) -> bool:
+        return all(self.state.get(key) == value for key, value in expected.items())
+
+    def mark(self, chunk_index: int, chunk_report: Dict) -> None:
+        with self._lock:
+            completed = self.completed
+            completed.add(chunk_index)
+            self.state['completed'] = sorted(completed)
+            self.state.setdefault('chunks', {})[str(chunk_index)] = chunk_report
+            self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(json.dumps(self.state, indent=2) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+class ConnectionPool:
+    """Fixed set of connections handed out to worker threads."""
+
+    def __init__(self, dsn: str, size: int):
+        psycopg = _psycopg()
+        self._connections = []
+        try:
+            for _ in range(size):
+                self._connections.append(psycopg.connect(dsn, autocommit=True))
+        except psycopg.Error as exc:
+            self.close()
+            raise LoadError(f"could not connect: {exc}")
+        self._idle: Queue = Queue()
+        for connection in self._connections:
+            self._idle.put(connection)
+
+    def acquire(self):
+        return self._idle.get()
+
+    def release(self, connection) -> None:
+        self._idle.put(connection)
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+
+
+def _upsert_sql(table: str, source: str) -> str:
+    columns = ', '.join(COLUMNS)
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in UPSERT_COLUMNS)
+    return (f"INSERT INTO {table} ({columns}, created_at, updated_at) "
+            f"SELECT {columns}, NOW(), NOW() FROM {source} "
+            f"ON CONFLICT (handle) DO UPDATE SET {updates}, updated_at = NOW()")
+
+
+def _load_chunk_copy(connection, table: str, chunk: List[Dict]) -> None:
+    with connection.transaction():
+        with connection.cursor() as cur:
+            cur.execute(f"CREATE TEMP TABLE catalog_stage (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+            with cur.copy(f"COPY catalog_stage ({', '.join(COLUMNS)}) FROM STDIN") as copy:
+                for row in chunk:
+                    copy.write_row([row[column] for column in COLUMNS])
+            cur.execute(_upsert_sql(table, "catalog_stage"))
+
+
+def _load_chunk_execute(connection, table: str, chunk: List[Dict]) -> None:
+    placeholders = ', '.join(['%s'] * len(COLUMNS))
+    updates = ', '.join(f"{column} = EXCLUDED.{column}" for column in UPSERT_COLUMNS)
+    statement = (f"INSERT INTO {table} ({', '.join(COLUMNS)}, created_at, updated_at) "
+                 f"VALUES ({placeholders}, NOW(), NOW()) "
+                 f"ON CONFLICT (handle) DO UPDATE SET {updates}, updated_at = NOW()")
+    with connection.transaction():
+        with connection.cursor() as cur:
+            cur.executemany(statement, [[row[column] for column in COLUMNS] for row in chunk])
+
+
+LOADERS = {
+    'copy': _load_chunk_copy,
+    'execute': _load_chunk_execute,
+}
+
+
+def load_rows(rows: List[Dict], dsn: str, checkpoint: Checkpoint, chunk_size: int = 500,
+              pool_size: int = 2, method: str = 'copy', table: str = DEFAULT_TABLE,
+              metrics: Optional[RunMetrics] = None) -> Dict:
+    """Load every chunk not already recorded in the checkpoint."""
+    metrics = metrics or RunMetrics('load', trace_memory=False)
+    load_chunk = LOADERS[method]
+    chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+    pending = [index for index in range(len(chunks)) if index not in checkpoint.completed]
+    skipped = len(chunks) - len(pending)
+    if skipped:
+        print(f"Resuming: {skipped} of {len(chunks)} chunks already committed")
+
+    psycopg = _psycopg()
+    pool = ConnectionPool(dsn, max(1, min(pool_size, len(pending) or 1)))
+
+    def run(index: int) -> Dict:
+        connection = pool.acquire()
+        try:
+            started = time.perf_counter()
+            load_chunk(connection, table, chunks[index])
+            seconds = time.perf_counter() - started
+        except psycopg.Error as exc:
+            raise LoadError(f"chunk {index + 1}/{len(chunks)} failed and was rolled back: {exc}")
+        finally:
+            pool.release(connection)
+        report = {
+            'rows': len(chunks[index]),
+            'seconds': round(seconds, 6),
+            'rows_per_second': round(len(chunks[index]) / seconds, 1) if seconds else None,
+        }
+        checkpoint.mark(index, report)
+        print(f"  chunk {index + 1}/{len(chunks)}: {report['rows']} rows in "
+              f"{seconds * 1000:.1f} ms ({report['rows_per_second']} rows/s)")
+        return report
+
+    reports = []
+    started = time.perf_counter()
+    try:
+        with metrics.stage('loading'):
+            with ThreadPoolExecutor(max_workers=pool_size) as executor:
+                futures = [executor.submit(run, index) for index in pending]
+                try:
+                    for future in futures:
+                        report = future.result()
+                        reports.append(report)
+                        metrics.incr('rows_loaded', report['rows'])
+                        metrics.incr('chunks_loaded')
+                except LoadError:
+                    # Chunks already running finish and reach the checkpoint;
+                    # queued ones are dropped so a rerun resumes from there
+                    for future in futures:
+                        future.cancel()
+                    raise
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(report['seconds'] for report in reports)
+    loaded = sum(report['rows'] for report in reports)
+    return {
+        'chunks': len(chunks),
+        'chunks_loaded': len(reports),
+        'chunks_skipped': skipped,
+        'rows_loaded': loaded,
+        'seconds': round(elapsed, 6),
+        'rows_per_second': round(loaded / elapsed, 1) if elapsed and loaded else None,
+        'chunk_latency_p50': _percentile(latencies, 0.50),
+        'chunk_latency_p95': _percentile(latencies, 0.95),
+        'chunk_latency_max': latencies[-1] if latencies else None,
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def print_load_report(report: Dict) -> None:
+    print(f"\n{'='*80}")
+    print("DATABASE LOAD")
+    print(f"{'='*80}")
+    print(f"Chunks: {report['chunks_loaded']} loaded, {report['chunks_skipped']} skipped, "
+          f"{report['chunks']} total")
+    print(f"Rows loaded: {report['rows_loaded']} in {report['seconds']:.3f}s "
+          f"({report['rows_per_second']} rows/s)")
+    if report['chunk_latency_p50'] is not None:
+        print(f"Chunk latency: p50 {report['chunk_latency_p50'] * 1000:.1f} ms, "
+              f"p95 {report['chunk_latency_p95'] * 1000:.1f} ms, "
+              f"max {report['chunk_latency_max'] * 1000:.1f} ms")
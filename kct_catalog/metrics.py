@@ -0,0 +1,213 @@
+"""
+Run instrumentation for the catalog scripts.
+
+Collects per-stage wall-clock timers, item counters, an optional tracemalloc
+peak memory reading and an optional cProfile dump, then emits a JSON run report plus a Prometheus
+textfile (node_exporter textfile collector format) for monitoring.
+"""
+
+import argparse
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+DEFAULT_METRICS_DIR = os.environ.get("CATALOG_METRICS_DIR", "metrics")
+METRIC_PREFIX = "kct_catalog"
+
+
+class RunMetrics:
+    """Timers and counters for a single script run."""
+
+    def __init__(self, run_name: str, profile_path: Optional[str] = None,
+                 trace_memory: bool = False):
+        self.run_name = run_name
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.peak_memory_bytes = 0
+        self.status: Optional[int] = None
+        self.last_success_at: Optional[float] = None
+        self._start_perf = 0.0
+        self._duration = 0.0
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def start(self) -> "RunMetrics":
+        self.started_at = time.time()
+        self._start_perf = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def finish(self, status: int = 0) -> "RunMetrics":
+        """Stop the clocks; status is the command's exit status."""
+        if self._profiler is not None:
+            self._profiler.disable()
+            Path(self.profile_path).parent.mkdir(parents=True, exist_ok=True)
+            self._profiler.dump_stats(self.profile_path)
+            self._profiler = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_memory_bytes = peak
+            tracemalloc.stop()
+        self._duration = time.perf_counter() - self._start_perf
+        self.finished_at = time.time()
+        self.status = status
+        if status == 0:
+            self.last_success_at = self.finished_at
+        return self
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block; repeated entries of the same stage accumulate."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            entry = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += elapsed
+            entry["calls"] += 1
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def report(self) -> Dict:
+        return {
+            "run": self.run_name,
+            "started_at": _iso(self.started_at),
+            "finished_at": _iso(self.finished_at),
+            "status": self.status,
+            "last_success_at": _iso(self.last_success_at),
+            "duration_seconds": round(self._duration, 6),
+            "peak_memory_bytes": self.peak_memory_bytes if self.trace_memory else None,
+            "stages": {
+                name: {"seconds": round(entry["seconds"], 6), "calls": int(entry["calls"])}
+                for name, entry in self.stages.items()
+            },
+            "counters": dict(self.counters),
+            "profile": self.profile_path,
+        }
+
+    def prometheus_text(self) -> str:
+        run = _label(self.run_name)
+        lines = [
+            f"# HELP {METRIC_PREFIX}_run_duration_seconds Wall-clock duration of the run.",
+            f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge",
+            f'{METRIC_PREFIX}_run_duration_seconds{{run="{run}"}} {self._duration:.6f}',
+            f"# HELP {METRIC_PREFIX}_run_exit_status Exit status of the last run (0 = success).",
+            f"# TYPE {METRIC_PREFIX}_run_exit_status gauge",
+            f'{METRIC_PREFIX}_run_exit_status{{run="{run}"}} {self.status or 0}',
+        ]
+        if self.last_success_at is not None:
+            lines.extend([
+                f"# HELP {METRIC_PREFIX}_run_last_success_timestamp_seconds Unix time of the last successful run.",
+                f"# TYPE {METRIC_PREFIX}_run_last_success_timestamp_seconds gauge",
+                f'{METRIC_PREFIX}_run_last_success_timestamp_seconds{{run="{run}"}} {self.last_success_at:.0f}',
+            ])
+        if self.trace_memory:
+            lines.extend([
+                f"# HELP {METRIC_PREFIX}_peak_memory_bytes Peak traced Python memory during the run.",
+                f"# TYPE {METRIC_PREFIX}_peak_memory_bytes gauge",
+                f'{METRIC_PREFIX}_peak_memory_bytes{{run="{run}"}} {self.peak_memory_bytes}',
+            ])
+        lines.append(f"# HELP {METRIC_PREFIX}_stage_seconds Time spent in each pipeline stage.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_seconds gauge")
+        for name, entry in sorted(self.stages.items()):
+            lines.append(
+                f'{METRIC_PREFIX}_stage_seconds{{run="{run}",stage="{_label(name)}"}} {entry["seconds"]:.6f}'
+            )
+        lines.append(f"# HELP {METRIC_PREFIX}_stage_calls Number of times each stage was entered.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_stage_calls gauge")
+        for name, entry in sorted(self.stages.items()):
+            lines.append(
+                f'{METRIC_PREFIX}_stage_calls{{run="{run}",stage="{_label(name)}"}} {int(entry["calls"])}'
+            )
+        lines.append(f"# HELP {METRIC_PREFIX}_items Items processed during the run.")
+        lines.append(f"# TYPE {METRIC_PREFIX}_items gauge")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f'{METRIC_PREFIX}_items{{run="{run}",item="{_label(name)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, metrics_dir: str = DEFAULT_METRICS_DIR) -> Dict[str, Path]:
+        """Write <run>.json and <run>.prom into metrics_dir (atomically)."""
+        out_dir = Path(metrics_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        report_file = out_dir / f"{self.run_name}.json"
+        prom_file = out_dir / f"{self.run_name}.prom"
+        if self.last_success_at is None:
+            # A failed run keeps the previous success time instead of dropping it
+            self.last_success_at = _previous_success(report_file)
+        _atomic_write(report_file, json.dumps(self.report(), indent=2) + "\n")
+        _atomic_write(prom_file, self.prometheus_text())
+        return {"report": report_file, "prometheus": prom_file}
+
+    def print_summary(self, limit: int = 15) -> None:
+        print(f"\n{'='*80}")
+        print(f"RUN METRICS: {self.run_name}")
+        print(f"{'='*80}")
+        if self.trace_memory:
+            print(f"Duration: {self._duration:.3f}s  Peak memory: {self.peak_memory_bytes / 1024:.1f} KiB")
+        else:
+            print(f"Duration: {self._duration:.3f}s")
+        for name, entry in self.stages.items():
+            print(f"  {name:<20} {entry['seconds']:.4f}s ({int(entry['calls'])} calls)")
+        for name, value in self.counters.items():
+            print(f"  {name:<20} {value}")
+        if self.profile_path and Path(self.profile_path).exists():
+            print(f"\nTop {limit} functions by cumulative time ({self.profile_path}):")
+            pstats.Stats(self.profile_path).sort_stats("cumulative").print_stats(limit)
+
+
+def add_metrics_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the shared --metrics-dir / --cprofile / --tracemalloc flags."""
+    parser.add_argument("--metrics-dir", default=DEFAULT_METRICS_DIR,
+                        help="Directory for the JSON run report and Prometheus textfile")
+    parser.add_argument("--cprofile", metavar="PATH",
+                        help="Write a cProfile dump of the run to PATH")
+    # Off by default: tracemalloc slows every allocation, and with it the stage timers
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Track peak Python memory with tracemalloc (slows the run)")
+
+
+def metrics_from_args(run_name: str, args: argparse.Namespace) -> RunMetrics:
+    return RunMetrics(run_name, profile_path=args.cprofile,
+                      trace_memory=args.tracemalloc)
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+def _previous_success(report_file: Path) -> Optional[float]:
+    try:
+        previous = json.loads(report_file.read_text()).get("last_success_at")
+    except (OSError, ValueError):
+        return None
+    return datetime.fromisoformat(previous).timestamp() if previous else None
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _atomic_write(path: Path, content: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open('w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
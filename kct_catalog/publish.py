@@ -0,0 +1,92 @@
+"""
+Incremental writes for published static artifacts.
+
+PublishState keeps a SHA-256 per output file in a small JSON state file, so
+a publishing stage rewrites only the files whose content changed, deletes the
+ones it no longer produces and reports exactly what needs uploading.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+
+STATE_NAME = ".publish-state.json"
+
+
+class PublishState:
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        self.state_file = self.output_dir / STATE_NAME
+        self.previous: Dict[str, str] = {}
+        if self.state_file.exists():
+            self.previous = json.loads(self.state_file.read_text())
+        self.current: Dict[str, str] = {}
+        self.written: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+
+    def write(self, relative: str, content: bytes) -> bool:
+        """Write content unless the file already holds it; True when written."""
+        digest = hashlib.sha256(content).hexdigest()
+        if self.is_unchanged(relative, digest):
+            return False
+        tmp_path = self.tmp_path(relative)
+        tmp_path.write_bytes(content)
+        return self.replace(relative, tmp_path, digest)
+
+    def tmp_path(self, relative: str) -> Path:
+        path = self.output_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path.with_name(path.name + '.tmp')
+
+    def is_unchanged(self, relative: str, digest: str) -> bool:
+        if self.previous.get(relative) == digest and (self.output_dir / relative).exists():
+            self.current[relative] = digest
+            self.unchanged.append(relative)
+            return True
+        return False
+
+    def replace(self, relative: str, tmp_path: Path, digest: str) -> bool:
+        """Move a streamed tmp file into place unless the published file has
+        the same digest, in which case the tmp file is discarded."""
+        if self.is_unchanged(relative, digest):
+            tmp_path.unlink()
+            return False
+        os.replace(tmp_path, self.output_dir / relative)
+        self.current[relative] = digest
+        self.written.append(relative)
+        return True
+
+    def keep(self, relative: str) -> None:
+        """Mark an existing file as still published without re-rendering it."""
+        self.current[relative] = self.previous[relative]
+        self.unchanged.append(relative)
+
+    def finish(self, prune: bool = True) -> Dict[str, List[str]]:
+        """Delete files no longer produced and save the new state."""
+        if prune:
+            for relative in sorted(set(self.previous) - set(self.current)):
+                (self.output_dir / relative).unlink(missing_ok=True)
+                self.removed.append(relative)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.state_file.write_text(json.dumps(self.current, indent=2, sort_keys=True) + "\n")
+        (self.output_dir / "changed.txt").write_text(''.join(f"{relative}\n" for relative in self.written))
+        return {'written': self.written, 'unchanged': self.unchanged, 'removed': self.removed}
+
+
+def print_publish_summary(title: str, output_dir, result: Dict[str, List[str]]) -> None:
+    print(f"\n{'='*80}")
+    print(f"{title}: {output_dir}")
+    print(f"{'='*80}")
+    print(f"Written: {len(result['written'])}  Unchanged: {len(result['unchanged'])}  "
+          f"Removed: {len(result['removed'])}")
+    for relative in result['written'][:10]:
+        print(f"  + {relative}")
+    if len(result['written']) > 10:
+        print(f"  ... and {len(result['written']) - 10} more")
+    for relative in result['removed'][:10]:
+        print(f"  - {relative}")
@@ -0,0 +1,270 @@
+"""
+Scan the local image trees and build the CDN URL manifests.
+
+Fall 2025 images follow https://cdn.kctmenswear.com/{category}/{product-name}/{image-name}.webp,
+vest accessories live under /menswear-accessories/{category}/... and use both
+'main.webp' and 'model.webp' naming conventions.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .metrics import RunMetrics
+
+
+DEFAULT_BASE_URL = "https://cdn.kctmenswear.com"
+FALL_2025_DIR = "Fall 2025"
+FALL_2025_MANIFEST = "fall_2025_cdn_urls.json"
+VEST_ACCESSORIES_MANIFEST = "vest_accessories_cdn_urls.json"
+
+# Category mapping from folder names to CDN paths
+FALL_2025_CATEGORIES = {
+    "mens-shirts": "mens-shirts",
+    "double-breasted-suits": "double-breasted-suits",
+    "stretch-suits": "stretch-suits",
+    "suits": "suits",
+    "tuxedos": "tuxedos"
+}
+
+VEST_ACCESSORY_DIRS = [
+    ("vest-clean/menswear-accessories/suspender-bowtie-set", "suspender-bowtie-set"),
+    ("vest-clean/vest-tie-set", "vest-tie-set")
+]
+
+IMAGE_EXTENSIONS = ['.webp', '.jpg', '.jpeg', '.png']
+
+
+def scan_fall_2025(root: str = ".", base_url: str = DEFAULT_BASE_URL) -> Dict:
+    """Generate CDN URLs for all Fall 2025 images."""
+    fall_2025_path = Path(root) / FALL_2025_DIR
+
+    if not fall_2025_path.exists():
+        print("Error: Fall 2025 directory not found")
+        return {}
+
+    cdn_mapping = {
+        "base_url": base_url,
+        "categories": {}
+    }
+
+    for webp_file in sorted(fall_2025_path.rglob("*.webp")):
+        # Get relative path from Fall 2025
+        path_parts = webp_file.relative_to(fall_2025_path).parts
+
+        if len(path_parts) < 3:
+            continue  # Skip if not in expected structure
+
+        category_folder = path_parts[0]
+
+        # Handle nested mens-shirts structure
+        if category_folder == "mens-shirts" and len(path_parts) == 4:
+            # Handle Fall 2025/mens-shirts/mens-shirts/product/image.webp
+            if path_parts[1] == "mens-shirts":
+                product_name = path_parts[2]
+                image_name = path_parts[3]
+            else:
+                product_name = path_parts[1]
+                image_name = path_parts[2]
+        else:
+            # Standard structure: Fall 2025/category/product/image.webp
+            product_name = path_parts[1]
+            image_name = path_parts[2]
+
+        cdn_category = FALL_2025_CATEGORIES.get(category_folder, category_folder)
+        cdn_url = f"{base_url}/{cdn_category}/{product_name}/{image_name}"
+
+        products = cdn_mapping["categories"].setdefault(cdn_category, {})
+        product = products.setdefault(product_name, {
+            "product_folder": product_name,
+            "images": []
+        })
+        product["images"].append({
+            "image_name": image_name,
+            "local_path": str(webp_file.relative_to(root)),
+            "cdn_url": cdn_url
+        })
+
+    return cdn_mapping
+
+
+def classify_accessory_image(image_name: str) -> str:
+    """Determine image type from the file name."""
+    filename_lower = image_name.lower()
+
+    if filename_lower.startswith('main.'):
+        return "main"
+    elif filename_lower.startswith('model.'):
+        return "model"
+    elif filename_lower.startswith('vest.'):
+        return "vest"
+    elif filename_lower.startswith('product.'):
+        return "product"
+    elif 'model' in filename_lower:
+        return "model_variant"
+    elif filename_lower.endswith('.jpg'):
+        return "product_variant"
+    return "unknown"
+
+
+def scan_vest_accessories(root: str = ".", base_url: str = DEFAULT_BASE_URL) -> Dict:
+    """Generate CDN URLs for vest accessories."""
+    cdn_mapping = {
+        "base_url": base_url,
+        "categories": {cdn_category: {} for _, cdn_category in VEST_ACCESSORY_DIRS}
+    }
+
+    for local_dir, cdn_category in VEST_ACCESSORY_DIRS:
+        local_path = Path(root) / local_dir
+
+        if not local_path.exists():
+            print(f"Warning: {local_path} does not exist")
+            continue
+
+        product_folders = [d for d in local_path.iterdir() if d.is_dir()]
+
+        for product_folder in sorted(product_folders):
+            product_name = product_folder.name
+
+            image_files = []
+            for ext in IMAGE_EXTENSIONS:
+                image_files.extend(product_folder.glob(f'*{ext}'))
+
+            if not image_files:
+                continue
+
+            images = []
+            for image_file in sorted(image_files):
+                image_name = image_file.name
+                images.append({
+                    "image_name": image_name,
+                    "image_type": classify_accessory_image(image_name),
+                    "local_path": str(image_file.relative_to(root)),
+                    "cdn_url": f"{base_url}/menswear-accessories/{cdn_category}/{product_name}/{image_name}"
+                })
+
+            cdn_mapping["categories"][cdn_category][product_name] = {
+                "product_folder": product_name,
+                "images": images
+            }
+
+    return cdn_mapping
+
+
+def manifest_urls(cdn_data: Dict) -> List[str]:
+    """Flat sorted list of every cdn_url in a manifest."""
+    return sorted(
+        image_info["cdn_url"]
+        for products in cdn_data.get("categories", {}).values()
+        for product_data in products.values()
+        for image_info in product_data["images"]
+    )
+
+
+def write_manifest(cdn_data: Dict, output_file: Path, metrics: Optional[RunMetrics] = None) -> None:
+    with output_file.open('w', encoding='utf-8') as f:
+        json.dump(cdn_data, f, indent=2, ensure_ascii=False)
+    if metrics is not None:
+        metrics.incr('bytes_written', output_file.stat().st_size)
+        for products in cdn_data["categories"].values():
+            metrics.incr('products', len(products))
+            metrics.incr('images', sum(len(product_data["images"]) for product_data in products.values()))
+
+
+def write_url_list(urls: List[str], output_file: Path) -> None:
+    with output_file.open('w', encoding='utf-8') as f:
+        for url in urls:
+            f.write(f"{url}\n")
+
+
+def print_summary(title: str, cdn_data: Dict, show_types: bool = False) -> None:
+    total_images = 0
+    print(f"\n{'='*80}")
+    print(title)
+    print(f"{'='*80}")
+
+    for category, products in cdn_data["categories"].items():
+        if not products:
+            continue
+
+        category_count = sum(len(product_data["images"]) for product_data in products.values())
+        total_images += category_count
+        print(f"\n{category.upper().replace('-', ' ')}: {category_count} images across {len(products)} products")
+
+        for product_name, product_data in sorted(products.items()):
+            image_count = len(product_data["images"])
+            if show_types:
+                type_summary = ", ".join(sorted({img["image_type"] for img in product_data["images"]}))
+                print(f"  {product_name}: {image_count} images ({type_summary})")
+            else:
+                print(f"  {product_name}: {image_count} images")
+
+    print(f"\nTOTAL IMAGES: {total_images}")
+
+
+def print_examples(all_urls: List[str]) -> None:
+    print(f"\nFirst 10 CDN URLs (examples):")
+    for i, url in enumerate(all_urls[:10]):
+        print(f"  {i+1}. {url}")
+
+    if len(all_urls) > 10:
+        print(f"  ... and {len(all_urls) - 10} more URLs")
+
+
+def run_fall_2025(metrics: RunMetrics, root: str = ".", base_url: str = DEFAULT_BASE_URL) -> Dict:
+    """Scan Fall 2025 and write the manifest plus the flat URL list."""
+    print("Generating CDN URLs for Fall 2025 images...")
+
+    with metrics.stage('scanning'):
+        cdn_data = scan_fall_2025(root, base_url)
+
+    if not cdn_data:
+        return {}
+
+    output_file = Path(root) / FALL_2025_MANIFEST
+    with metrics.stage('json_writing'):
+        write_manifest(cdn_data, output_file, metrics)
+
+    print_summary("FALL 2025 CDN URLs SUMMARY", cdn_data)
+    print(f"CDN mapping saved to: {output_file}")
+
+    all_urls = manifest_urls(cdn_data)
+    urls_file = Path(root) / "fall_2025_all_cdn_urls.txt"
+    write_url_list(all_urls, urls_file)
+    print(f"All URLs list saved to: {urls_file}")
+    print_examples(all_urls)
+    return cdn_data
+
+
+def run_vest_accessories(metrics: RunMetrics, root: str = ".", base_url: str = DEFAULT_BASE_URL) -> Dict:
+    """Scan the vest accessories trees and write the manifest plus URL lists."""
+    print("Generating CDN URLs for vest accessories...")
+
+    with metrics.stage('scanning'):
+        cdn_data = scan_vest_accessories(root, base_url)
+
+    if not any(cdn_data["categories"].values()):
+        print("No data found in target directories")
+        return {}
+
+    output_file = Path(root) / VEST_ACCESSORIES_MANIFEST
+    with metrics.stage('json_writing'):
+        write_manifest(cdn_data, output_file, metrics)
+
+    print_summary("VEST ACCESSORIES CDN URLs SUMMARY", cdn_data, show_types=True)
+    print(f"CDN mapping saved to: {output_file}")
+
+    # Category-specific URL lists
+    for category, products in cdn_data["categories"].items():
+        if not products:
+            continue
+        urls_file = Path(root) / f"{category.replace('-', '_')}_cdn_urls.txt"
+        write_url_list(manifest_urls({"categories": {category: products}}), urls_file)
+        print(f"{category} URLs saved to: {urls_file}")
+
+    all_urls = manifest_urls(cdn_data)
+    combined_file = Path(root) / "all_vest_accessories_cdn_urls.txt"
+    write_url_list(all_urls, combined_file)
+    print(f"All URLs combined saved to: {combined_file}")
+    print_examples(all_urls)
+    return cdn_data
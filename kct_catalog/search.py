@@ -0,0 +1,202 @@
+"""
+Search indexing stage.
+
+Builds weighted search documents for every generated product and emits them
+two ways:
+
+* SQL that fills a products_enhanced.search_vector tsvector column
+  (setweight A/B/C/D, GIN-indexed), so storefront search stops doing ILIKE
+  scans over search_terms;
+* a compact static inverted index (sorted term list + postings) for CDN-hosted
+  autocomplete. Terms are sorted, so a prefix lookup is a binary search for
+  the first term >= prefix followed by a forward scan.
+
+Weights: A = name and handle, B = category, subcategory and color,
+C = master export search_keywords and tags, D = collection, season, fit.
+"""
+
+import bisect
+import json
+import re
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .generate import sql_literal
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+
+
+DEFAULT_OUTPUT_DIR = "dist/catalog/search"
+DEFAULT_SQL_OUTPUT = "sql/search-documents.sql"
+INDEX_VERSION = 1
+
+# Integer scores so postings stay compact; ratios follow Postgres' default
+# ts_rank weights {0.1, 0.2, 0.4, 1.0}
+WEIGHT_SCORES = {'A': 8, 'B': 4, 'C': 2, 'D': 1}
+
+STOPWORDS = {'a', 'an', 'and', 'by', 'for', 'from', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, strip accents and spell out '&'."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return text.lower().replace('&', ' and ')
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized tokens in order, without stopwords or duplicates."""
+    seen = set()
+    tokens = []
+    for token in TOKEN_PATTERN.findall(normalize_text(text)):
+        if token in STOPWORDS or token in seen:
+            continue
+        seen.add(token)
+        tokens.append(token)
+    return tokens
+
+
+def _split_list(value: str) -> List[str]:
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def master_keywords(inputs: CatalogInputs) -> Dict[str, List[str]]:
+    """search_keywords and tags from the master export, keyed by handle."""
+    handle_by_id = inputs.handle_by_product_id()
+    keywords = defaultdict(list)
+    for row in inputs.master_products():
+        handle = row.get('handle')
+        if not handle:
+            continue
+        keywords[handle].extend(_split_list(row.get('search_keywords')))
+        keywords[handle].extend(_split_list(row.get('tags')))
+    for row in inputs.product_tags():
+        handle = handle_by_id.get(row.get('product_id'))
+        if handle and row.get('tag'):
+            keywords[handle].append(row['tag'])
+    return keywords
+
+
+def build_document(row: Dict, keywords: Iterable[str] = ()) -> Dict:
+    """Weighted token lists for one product row."""
+    weighted = {
+        'A': tokenize(f"{row['name']} {row['handle'].replace('-', ' ')}"),
+        'B': tokenize(f"{row['category']} {row['subcategory']} {row['color_name']} {row['color_family']}"),
+        'C': tokenize(' '.join(keywords)),
+        'D': tokenize(f"{row['collection']} {row['season']} {row['fit_type']}"),
+    }
+    # A token keeps only its highest weight
+    seen = set()
+    for weight in ('A', 'B', 'C', 'D'):
+        weighted[weight] = [token for token in weighted[weight] if token not in seen]
+        seen.update(weighted[weight])
+    return {'handle': row['handle'], 'weights': weighted}
+
+
+def build_documents(rows: List[Dict], inputs: Optional[CatalogInputs] = None) -> List[Dict]:
+    keywords = master_keywords(inputs) if inputs is not None else {}
+    return [build_document(row, keywords.get(row['handle'], ())) for row in rows]
+
+
+def render_search_sql(documents: List[Dict]) -> str:
+    lines = [
+        "-- Weighted search documents for products_enhanced",
+        "-- Generated by python -m kct_catalog search; safe to run multiple times",
+        "ALTER TABLE products_enhanced ADD COLUMN IF NOT EXISTS search_vector tsvector;",
+        "CREATE INDEX IF NOT EXISTS idx_products_enhanced_search_vector",
+        "    ON products_enhanced USING GIN (search_vector);",
+        "",
+        "BEGIN;",
+    ]
+    for document in documents:
+        parts = [
+            f"setweight(to_tsvector('simple', {sql_literal(' '.join(tokens))}), '{weight}')"
+            for weight, tokens in document['weights'].items() if tokens
+        ]
+        if not parts:
+            continue
+        vector = ' ||\n    '.join(parts)
+        lines.append(f"UPDATE products_enhanced SET search_vector =\n    {vector}\n"
+                     f"WHERE handle = {sql_literal(document['handle'])};")
+    lines.append("COMMIT;\n")
+    return '\n'.join(lines)
+
+
+def build_inverted_index(rows: List[Dict], documents: List[Dict]) -> Dict:
+    """Sorted terms with parallel postings [doc, score, doc, score, ...]."""
+    postings = defaultdict(dict)
+    for doc_id, document in enumerate(documents):
+        for weight, tokens in document['weights'].items():
+            for token in tokens:
+                postings[token][doc_id] = postings[token].get(doc_id, 0) + WEIGHT_SCORES[weight]
+
+    terms = sorted(postings)
+    return {
+        'version': INDEX_VERSION,
+        'fields': ['handle', 'name', 'price', 'image'],
+        'docs': [[row['handle'], row['name'], row['base_price'], row.get('hero_image', '')]
+                 for row in rows],
+        'terms': terms,
+        'postings': [
+            [value for doc_id, score in sorted(postings[term].items(), key=lambda item: (-item[1], item[0]))
+             for value in (doc_id, score)]
+            for term in terms
+        ],
+    }
+
+
+def prefix_range(terms: List[str], prefix: str) -> range:
+    start = bisect.bisect_left(terms, prefix)
+    end = bisect.bisect_left(terms, prefix + '\uffff', start)
+    return range(start, end)
+
+
+def search(index: Dict, query: str, limit: int = 10) -> List[Dict]:
+    """Reference implementation of the client lookup: every query token must
+    prefix-match some term; a document scores its best match per token."""
+    tokens = [token for token in TOKEN_PATTERN.findall(normalize_text(query)) if token not in STOPWORDS]
+    if not tokens:
+        return []
+
+    scores = None
+    for token in tokens:
+        matched = defaultdict(int)
+        for term_index in prefix_range(index['terms'], token):
+            flat = index['postings'][term_index]
+            for doc_id, score in zip(flat[0::2], flat[1::2]):
+                matched[doc_id] = max(matched[doc_id], score)
+        if scores is None:
+            scores = dict(matched)
+        else:
+            scores = {doc_id: scores[doc_id] + score for doc_id, score in matched.items() if doc_id in scores}
+        if not scores:
+            return []
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    return [dict(zip(index['fields'], index['docs'][doc_id]), score=score) for doc_id, score in ranked]
+
+
+def write_search_artifacts(rows: List[Dict], inputs: CatalogInputs, output_dir: str,
+                           sql_output: str, metrics: Optional[RunMetrics] = None) -> Dict:
+    metrics = metrics or RunMetrics('search', trace_memory=False)
+    with metrics.stage('search_indexing'):
+        documents = build_documents(rows, inputs)
+        index = build_inverted_index(rows, documents)
+
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    index_file = out_dir / "index.json"
+    sql_file = Path(sql_output)
+    with metrics.stage('search_writing'):
+        index_json = json.dumps(index, separators=(',', ':'), ensure_ascii=False)
+        index_file.write_text(index_json, encoding='utf-8')
+        sql = render_search_sql(documents)
+        sql_file.parent.mkdir(parents=True, exist_ok=True)
+        sql_file.write_text(sql, encoding='utf-8')
+    metrics.incr('search_terms', len(index['terms']))
+    metrics.incr('bytes_written', len(index_json.encode('utf-8')) + len(sql.encode('utf-8')))
+    return {'documents': documents, 'index': index, 'index_file': index_file, 'sql_file': sql_file}
@@ -0,0 +1,211 @@
+"""
+Sharded import SQL.
+
+Partitions the generated rows by category or by a stable hash of the handle
+and renders each partition in a worker process. Every shard file is a single
+BEGIN/COMMIT transaction, so shards can be loaded concurrently over separate
+connections, e.g.:
+
+    ls sql/shards/*.sql | xargs -P 4 -I{} psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f {}
+
+manifest.json records the row count and SHA-256 of every shard so a failed
+shard can be verified and re-run on its own. Rows are still built
+sequentially (SKU numbering is global across categories); rendering, hashing
+and writing run in the pool.
+"""
+
+import hashlib
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .generate import PROFILES, render_insert
+from .metrics import RunMetrics
+
+
+DEFAULT_SHARD_DIR = "sql/shards"
+MANIFEST_NAME = "manifest.json"
+DEFAULT_PARTITION = "category"
+DEFAULT_SHARD_COUNT = 4
+
+
+class ShardError(ValueError):
+    pass
+
+
+def hash_shard(handle: str, shard_count: int) -> int:
+    """Stable across processes and runs, unlike the builtin hash()."""
+    if shard_count < 1:
+        raise ShardError(f"shard count must be at least 1, got {shard_count}")
+    return zlib.crc32(handle.encode('utf-8')) % shard_count
+
+
+def partition_rows(rows: List[Dict], partition: str = 'category',
+                   shard_count: int = 4) -> List[Dict]:
+    """Split rows into shards, preserving row order inside each shard."""
+    if partition == 'category':
+        keys = []
+        groups: Dict[str, List[Dict]] = {}
+        for row in rows:
+            key = row['category_slug']
+            if key not in groups:
+                keys.append(key)
+                groups[key] = []
+            groups[key].append(row)
+        return [{'index': i, 'key': key, 'rows': groups[key]} for i, key in enumerate(keys)]
+
+    if partition == 'hash':
+        shards = [{'index': i, 'key': f"hash-{i}", 'rows': []} for i in range(shard_count)]
+        for row in rows:
+            shards[hash_shard(row['handle'], shard_count)]['rows'].append(row)
+        return shards
+
+    raise ValueError(f"Unknown partition mode: {partition}")
+
+
+def shard_filename(shard: Dict) -> str:
+    return f"{shard['index']:03d}-{shard['key']}.sql"
+
+
+def render_shard_sql(shard: Dict, total: int, profile: str = 'final') -> str:
+    upsert = PROFILES[profile]['upsert']
+    lines = [
+        f"-- Import shard {shard['index'] + 1} of {total}: {shard['key']} ({len(shard['rows'])} products)",
+        "-- Self-contained transaction; safe to load in parallel with the other shards",
+        "BEGIN;",
+    ]
+    lines.extend(render_insert(row, upsert) for row in shard['rows'])
+    lines.append("\nCOMMIT;\n")
+    return '\n'.join(lines)
+
+
+def _write_shard(shard: Dict, total: int, profile: str, output_dir: str) -> Dict:
+    """Worker: render one shard, write it and return its manifest entry."""
+    content = render_shard_sql(shard, total, profile).encode('utf-8')
+    path = Path(output_dir) / shard_filename(shard)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+    return {
+        'index': shard['index'],
+        'key': shard['key'],
+        'file': path.name,
+        'rows': len(shard['rows']),
+        'bytes': len(content),
+        'sha256': hashlib.sha256(content).hexdigest(),
+        'handles': [row['handle'] for row in shard['rows']],
+    }
+
+
+def load_manifest(output_dir: str = DEFAULT_SHARD_DIR) -> Optional[Dict]:
+    manifest_path = Path(output_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    return json.loads(manifest_path.read_text())
+
+
+def check_partial_rewrite(manifest: Optional[Dict], profile: str, partition: str,
+                          shard_count: int, seed: Optional[int], only: List[int]) -> None:
+    """A partial rewrite has to reproduce the layout and rows of the full run
+    that wrote the manifest, or the shard set ends up mixed."""
+    if manifest is None:
+        raise ShardError("--only needs an existing manifest.json; run a full shard first")
+    if manifest['seed'] is None:
+        raise ShardError("manifest.json was written without --seed, so its shards cannot be reproduced")
+    expected = {'profile': profile, 'partition': partition, 'shard_count': shard_count, 'seed': seed}
+    for key, value in expected.items():
+        if manifest[key] != value:
+            raise ShardError(f"manifest.json has {key}={manifest[key]!r}, this run has {value!r}")
+    unknown = sorted(set(only) - {entry['index'] for entry in manifest['shards']})
+    if unknown:
+        raise ShardError(f"manifest.json has no shard {', '.join(map(str, unknown))}")
+
+
+def write_shards(rows: List[Dict], output_dir: str = DEFAULT_SHARD_DIR, profile: str = 'final',
+                 partition: str = 'category', shard_count: int = 4, jobs: Optional[int] = None,
+                 only: Optional[List[int]] = None, seed: Optional[int] = None,
+                 metrics: Optional[RunMetrics] = None) -> Dict:
+    """Write shard files plus manifest.json; `only` rewrites just those indexes."""
+    metrics = metrics or RunMetrics('shard', trace_memory=False)
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with metrics.stage('sharding'):
+        shards = partition_rows(rows, partition, shard_count)
+    manifest_path = out_dir / MANIFEST_NAME
+    previous_manifest = load_manifest(out_dir)
+    if only is not None:
+        check_partial_rewrite(previous_manifest, profile, partition, len(shards), seed, only)
+    selected = [shard for shard in shards if only is None or shard['index'] in only]
+
+    with metrics.stage('shard_writing'):
+        if jobs == 1 or len(selected) <= 1:
+            entries = [_write_shard(shard, len(shards), profile, str(out_dir)) for shard in selected]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_write_shard, shard, len(shards), profile, str(out_dir))
+                           for shard in selected]
+                entries = [future.result() for future in futures]
+
+    previous = {}
+    if previous_manifest is not None:
+        previous = {entry['index']: entry for entry in previous_manifest['shards']}
+    if only is None:
+        # Full rewrite: drop shard files from an older layout
+        current = {entry['file'] for entry in entries}
+        for entry in previous.values():
+            if entry['file'] not in current:
+                (out_dir / entry['file']).unlink(missing_ok=True)
+        previous = {}
+    for entry in entries:
+        previous[entry['index']] = entry
+        metrics.incr('bytes_written', entry['bytes'])
+    metrics.incr('shards', len(entries))
+
+    manifest = {
+        'profile': profile,
+        'partition': partition,
+        'shard_count': len(shards),
+        'seed': seed,
+        'total_rows': len(rows),
+        'shards': [previous[index] for index in sorted(previous)],
+    }
+    tmp_path = manifest_path.with_name(manifest_path.name + '.tmp')
+    tmp_path.write_text(json.dumps(manifest, indent=2) + "\n")
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+
+def verify_shards(output_dir: str = DEFAULT_SHARD_DIR) -> List[Dict]:
+    """Compare shard files on disk with the manifest, and each entry with the
+    manifest's partition; returns the failing entries."""
+    out_dir = Path(output_dir)
+    manifest = load_manifest(out_dir)
+    if manifest is None:
+        raise ShardError(f"no {MANIFEST_NAME} in {out_dir}; run shard first")
+    failures = []
+    for entry in manifest['shards']:
+        path = out_dir / entry['file']
+        hash_key = entry['key'] == f"hash-{entry['index']}"
+        if entry['index'] >= manifest['shard_count'] or hash_key != (manifest['partition'] == 'hash'):
+            failures.append({**entry, 'problem': f"not part of the {manifest['partition']} layout"})
+        elif not path.exists():
+            failures.append({**entry, 'problem': 'missing'})
+        elif hashlib.sha256(path.read_bytes()).hexdigest() != entry['sha256']:
+            failures.append({**entry, 'problem': 'checksum mismatch'})
+    return failures
+
+
+def print_manifest(manifest: Dict, output_dir: str) -> None:
+    print(f"\n{'='*80}")
+    print(f"SHARDED IMPORT ({manifest['partition']}, {manifest['shard_count']} shards)")
+    print(f"{'='*80}")
+    for entry in manifest['shards']:
+        print(f"  {entry['file']:<40} {entry['rows']:>5} rows  {entry['sha256'][:12]}")
+    print(f"\nTotal: {manifest['total_rows']} products")
+    print(f"Manifest: {Path(output_dir) / MANIFEST_NAME}")
+    if manifest['seed'] is None:
+        print("Note: no --seed given; ids and prices differ between runs")
@@ -0,0 +1,244 @@
+"""
+Sitemap and merchant product feed generation.
+
+Writes the generated rows into gzipped XML shards, cut at the sitemap
+protocol limits (50,000 URLs or 50 MB uncompressed per file):
+
+    dist/catalog/sitemaps/sitemap.xml                sitemap index
+    dist/catalog/sitemaps/sitemap-products-<n>.xml.gz
+    dist/catalog/sitemaps/feed-products-<n>.xml.gz   RSS 2.0 merchant feed
+    dist/catalog/sitemaps/feed-index.json            feed shard manifest
+
+Only `is_indexable` rows are published. Each product uses its `url_slug`,
+`sitemap_priority`, hero image and prices. Entries are written straight into
+the gzip stream, so no shard's XML is ever held in memory. The rows
+themselves, and the per-product state below (a hash and a date per product),
+are held in memory, so memory use grows with the catalog, not with the shard
+size.
+
+Regeneration is incremental. `.products-state.json` keeps a hash and
+lastmod date per product, and lastmod only moves when the product's
+published fields change. Shards whose content is unchanged are left alone
+(see publish.PublishState), so changed.txt lists only the files to upload.
+"""
+
+import datetime
+import gzip
+import hashlib
+import json
+from typing import Dict, Iterable, List, Optional
+from xml.sax.saxutils import escape
+
+from .metrics import RunMetrics
+from .publish import PublishState
+
+
+DEFAULT_OUTPUT_DIR = "dist/catalog/sitemaps"
+DEFAULT_SITE_URL = "https://kctmenswear.com"
+PRODUCT_PATH = "/products/{url_slug}"
+BRAND = "KCT Menswear"
+
+MAX_URLS = 50000
+MAX_BYTES = 50 * 1024 * 1024
+MAX_ADDITIONAL_IMAGES = 10
+
+PRODUCT_STATE_NAME = ".products-state.json"
+FEED_INDEX_NAME = "feed-index.json"
+
+SITEMAP_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+                  '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+                  'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n')
+SITEMAP_FOOTER = '</urlset>\n'
+
+FEED_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n<channel>\n'
+               f'<title>{BRAND} Products</title>\n'
+               '<link>{site_url}</link>\n'
+               f'<description>{BRAND} product feed</description>\n')
+FEED_FOOTER = '</channel>\n</rss>\n'
+
+
+class ShardedXmlWriter:
+    """Writes entries into numbered .xml.gz shards, starting a new shard
+    before the entry or byte limit would be exceeded."""
+
+    def __init__(self, state: PublishState, name: str, header: str, footer: str,
+                 max_entries: int = MAX_URLS, max_bytes: int = MAX_BYTES):
+        self.state = state
+        self.name = name
+        self.header = header.encode('utf-8')
+        self.footer = footer.encode('utf-8')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.shards: List[str] = []
+        self.entries: List[Dict] = []
+        self._file = None
+
+    def _open(self) -> None:
+        self._relative = f"{self.name}-{len(self.shards) + 1}.xml.gz"
+        self._tmp_path = self.state.tmp_path(self._relative)
+        # mtime=0 keeps unchanged shards byte-identical between runs
+        self._file = gzip.GzipFile(self._tmp_path, 'wb', mtime=0)
+        self._digest = hashlib.sha256()
+        self._entries = 0
+        self._bytes = 0
+        self._lastmod = ''
+        self._emit(self.header)
+
+    def _emit(self, data: bytes) -> None:
+        self._file.write(data)
+        self._digest.update(data)
+        self._bytes += len(data)
+
+    def _close(self) -> None:
+        self._emit(self.footer)
+        self._file.close()
+        self._file = None
+        self.state.replace(self._relative, self._tmp_path, self._digest.hexdigest())
+        self.shards.append(self._relative)
+        self.entries.append({'file': self._relative, 'entries': self._entries, 'lastmod': self._lastmod,
+                             'sha256': self._digest.hexdigest()})
+
+    def add(self, entry: str, lastmod: str = '') -> None:
+        """Append one entry; lastmod (ISO date) feeds the shard's newest date."""
+        data = entry.encode('utf-8')
+        if self._file is not None and (self._entries >= self.max_entries or
+                                       self._bytes + len(data) + len(self.footer) > self.max_bytes):
+            self._close()
+        if self._file is None:
+            self._open()
+        self._emit(data)
+        self._entries += 1
+        self._lastmod = max(self._lastmod, lastmod)
+
+    def close(self) -> List[str]:
+        if self._file is not None:
+            self._close()
+        return self.shards
+
+
+def product_url(row: Dict, site_url: str = DEFAULT_SITE_URL) -> str:
+    return site_url.rstrip('/') + PRODUCT_PATH.format(url_slug=row['url_slug'])
+
+
+def product_fingerprint(row: Dict) -> str:
+    """Hash of every field published in the sitemap or feed."""
+    published = [row['url_slug'], row['sitemap_priority'], row['name'], row['description'],
+                 row['base_price'], row['compare_at_price'], row['category'], row['subcategory'],
+                 row['color_name'], row['sku'], row.get('hero_image', ''),
+                 row.get('gallery_images', [])[:MAX_ADDITIONAL_IMAGES], row['status']]
+    return hashlib.sha256(json.dumps(published, default=str).encode('utf-8')).hexdigest()
+
+
+def render_sitemap_entry(row: Dict, lastmod: str, site_url: str = DEFAULT_SITE_URL) -> str:
+    lines = [
+        '<url>',
+        f'<loc>{escape(product_url(row, site_url))}</loc>',
+        f'<lastmod>{lastmod}</lastmod>',
+        f'<priority>{float(row["sitemap_priority"]):.1f}</priority>',
+    ]
+    if row.get('hero_image'):
+        lines.append(f'<image:image><image:loc>{escape(row["hero_image"])}</image:loc></image:image>')
+    lines.append('</url>\n')
+    return ''.join(lines)
+
+
+def render_feed_item(row: Dict, site_url: str = DEFAULT_SITE_URL) -> str:
+    base_price = float(row['base_price'])
+    compare_price = float(row['compare_at_price'] or 0)
+    lines = [
+        '<item>',
+        f'<g:id>{escape(row["sku"])}</g:id>',
+        f'<title>{escape(row["name"])}</title>',
+        f'<description>{escape(row["description"])}</description>',
+        f'<link>{escape(product_url(row, site_url))}</link>',
+    ]
+    if row.get('hero_image'):
+        lines.append(f'<g:image_link>{escape(row["hero_image"])}</g:image_link>')
+    for url in row.get('gallery_images', [])[:MAX_ADDITIONAL_IMAGES]:
+        lines.append(f'<g:additional_image_link>{escape(url)}</g:additional_image_link>')
+    if compare_price > base_price:
+        lines.append(f'<g:price>{compare_price:.2f} USD</g:price>')
+        lines.append(f'<g:sale_price>{base_price:.2f} USD</g:sale_price>')
+    else:
+        lines.append(f'<g:price>{base_price:.2f} USD</g:price>')
+    lines.extend([
+        f'<g:availability>{"in_stock" if row["status"] == "active" else "out_of_stock"}</g:availability>',
+        '<g:condition>new</g:condition>',
+        f'<g:brand>{escape(BRAND)}</g:brand>',
+        f'<g:product_type>{escape(row["category"])} &gt; {escape(row["subcategory"])}</g:product_type>',
+        f'<g:color>{escape(row["color_name"])}</g:color>',
+        '</item>\n',
+    ])
+    return ''.join(lines)
+
+
+def render_sitemap_index(shards: List[Dict], base_url: str) -> bytes:
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for shard in shards:
+        lines.append(f'<sitemap><loc>{escape(base_url.rstrip("/") + "/" + shard["file"])}</loc>'
+                     f'<lastmod>{shard["lastmod"]}</lastmod></sitemap>')
+    lines.append('</sitemapindex>\n')
+    return '\n'.join(lines).encode('utf-8')
+
+
+def render_feed_index(shards: List[Dict], base_url: str) -> bytes:
+    """JSON manifest of the feed shards for the merchant center fetch
+    schedule. It has no generation timestamp, so it only changes when a
+    shard does."""
+    feeds = [{'url': base_url.rstrip('/') + '/' + shard['file'], **shard} for shard in shards]
+    return (json.dumps({'feeds': feeds, 'items': sum(shard['entries'] for shard in shards)},
+                       indent=2) + "\n").encode('utf-8')
+
+
+def write_sitemaps(rows: Iterable[Dict], output_dir: str = DEFAULT_OUTPUT_DIR,
+                   site_url: str = DEFAULT_SITE_URL, base_url: Optional[str] = None,
+                   max_urls: int = MAX_URLS, max_bytes: int = MAX_BYTES,
+                   today: Optional[str] = None, metrics: Optional[RunMetrics] = None) -> Dict:
+    """Stream rows into sitemap and feed shards; returns the publish result
+    plus per-product change counts."""
+    metrics = metrics or RunMetrics('sitemap', trace_memory=False)
+    today = today or datetime.date.today().isoformat()
+    base_url = base_url or f"{site_url.rstrip('/')}/sitemaps"
+    state = PublishState(output_dir)
+    product_state_file = state.output_dir / PRODUCT_STATE_NAME
+    previous_products = json.loads(product_state_file.read_text()) if product_state_file.exists() else {}
+    products: Dict[str, List[str]] = {}
+    changed = []
+
+    sitemap = ShardedXmlWriter(state, "sitemap-products", SITEMAP_HEADER, SITEMAP_FOOTER, max_urls, max_bytes)
+    feed = ShardedXmlWriter(state, "feed-products", FEED_HEADER.format(site_url=escape(site_url)),
+                            FEED_FOOTER, max_urls, max_bytes)
+
+    with metrics.stage('sitemap_writing'):
+        for row in rows:
+            if not row.get('is_indexable') or row['status'] != 'active':
+                metrics.incr('products_skipped')
+                continue
+            fingerprint = product_fingerprint(row)
+            previous = previous_products.get(row['handle'])
+            if previous and previous[0] == fingerprint:
+                lastmod = previous[1]
+            else:
+                lastmod = today
+                changed.append(row['handle'])
+            products[row['handle']] = [fingerprint, lastmod]
+
+            sitemap.add(render_sitemap_entry(row, lastmod, site_url), lastmod)
+            feed.add(render_feed_item(row, site_url), lastmod)
+            metrics.incr('sitemap_urls')
+
+        sitemap_shards = sitemap.close()
+        feed_shards = feed.close()
+        state.write("sitemap.xml", render_sitemap_index(sitemap.entries, base_url))
+        state.write(FEED_INDEX_NAME, render_feed_index(feed.entries, base_url))
+
+    removed = sorted(set(previous_products) - set(products))
+    result = state.finish()
+    product_state_file.write_text(json.dumps(products, indent=2, sort_keys=True) + "\n")
+    metrics.incr('products_changed', len(changed) + len(removed))
+    metrics.incr('files_written', len(result['written']))
+    result.update({'sitemap_shards': sitemap_shards, 'feed_shards': feed_shards,
+                   'products_changed': changed, 'products_removed': removed})
+    return result
@@ -0,0 +1,341 @@
+"""
+Local SQLite staging catalog.
+
+Ingests the CDN manifests, the Master-CSV-2 and kct_master_exports CSVs and
+the CDN URL text lists into one indexed SQLite file so reconciliation
+questions run as local queries instead of verify-*/check-*.sql round-trips
+against Supabase. Re-runs are incremental: a source is reloaded only when its
+size/mtime changed and its SHA-256 differs from the last ingest.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+from .scan import FALL_2025_MANIFEST, VEST_ACCESSORIES_MANIFEST
+
+
+DEFAULT_DB = "catalog_staging.sqlite"
+
+# (source path relative to the repo root, kind)
+SOURCES = [
+    (FALL_2025_MANIFEST, 'manifest'),
+    (VEST_ACCESSORIES_MANIFEST, 'manifest'),
+    ("Master-CSV-2/Website_Master__Enhanced__No_Duplicates__Images_Cleaned_.csv", 'master'),
+    ("Master-CSV-2/Website_Variants__Suspenders_collapsed_to_One_Size_.csv", 'variants'),
+    ("Master-CSV-2/Website_Images__Exploded__primary_first_.csv", 'images'),
+    ("kct_master_exports/master_product_final.csv", 'master'),
+    ("kct_master_exports/master_export_full.csv", 'master_variants'),
+    ("kct_master_exports/product_variants_import.csv", 'variants'),
+    ("kct_master_exports/product_images_import.csv", 'images'),
+    ("kct_master_exports/product_tags_import.csv", 'tags'),
+    ("ALL_PRODUCT_IMAGES_CDN_URLS.txt", 'urls'),
+    ("COMPLETE_MASTER_CDN_URLS.txt", 'urls'),
+    ("CORRECTED_MASTER_CDN_URLS.txt", 'urls'),
+    ("DEFINITIVE_CDN_URLS_FINAL_MANUAL_SCAN.txt", 'urls'),
+    ("fall_2025_all_cdn_urls.txt", 'urls'),
+    ("all_vest_accessories_cdn_urls.txt", 'urls'),
+    ("suspender_bowtie_set_cdn_urls.txt", 'urls'),
+    ("vest_tie_set_cdn_urls.txt", 'urls'),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    sha256 TEXT,
+    row_count INTEGER,
+    loaded_at REAL
+);
+CREATE TABLE IF NOT EXISTS manifest_images (
+    source TEXT NOT NULL,
+    category TEXT,
+    handle TEXT,
+    image_name TEXT,
+    image_type TEXT,
+    local_path TEXT,
+    image_url TEXT
+);
+CREATE TABLE IF NOT EXISTS master_products (
+    source TEXT NOT NULL,
+    product_id TEXT,
+    sku TEXT,
+    handle TEXT,
+    name TEXT,
+    category TEXT,
+    status TEXT,
+    base_price INTEGER,
+    price_usd TEXT,
+    primary_image TEXT,
+    gallery_urls TEXT,
+    gallery_count INTEGER,
+    search_keywords TEXT,
+    tags TEXT,
+    name_key_norm TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS variants (
+    source TEXT NOT NULL,
+    product_id TEXT,
+    sku TEXT,
+    variant_title TEXT,
+    price_cents INTEGER,
+    price_usd TEXT,
+    stripe_price_id TEXT,
+    stripe_active INTEGER,
+    variant_sku TEXT
+);
+CREATE TABLE IF NOT EXISTS product_images (
+    source TEXT NOT NULL,
+    product_id TEXT,
+    image_url TEXT,
+    image_type TEXT,
+    position INTEGER,
+    alt_text TEXT
+);
+CREATE TABLE IF NOT EXISTS product_tags (
+    source TEXT NOT NULL,
+    product_id TEXT,
+    tag TEXT
+);
+CREATE TABLE IF NOT EXISTS url_lists (
+    source TEXT NOT NULL,
+    image_url TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_manifest_images_handle ON manifest_images(handle);
+CREATE INDEX IF NOT EXISTS idx_manifest_images_url ON manifest_images(image_url);
+CREATE INDEX IF NOT EXISTS idx_manifest_images_source ON manifest_images(source);
+CREATE INDEX IF NOT EXISTS idx_master_products_handle ON master_products(handle);
+CREATE INDEX IF NOT EXISTS idx_master_products_sku ON master_products(sku);
+CREATE INDEX IF NOT EXISTS idx_master_products_product_id ON master_products(product_id);
+CREATE INDEX IF NOT EXISTS idx_master_products_image ON master_products(primary_image);
+CREATE INDEX IF NOT EXISTS idx_master_products_source ON master_products(source);
+CREATE INDEX IF NOT EXISTS idx_variants_product_id ON variants(product_id);
+CREATE INDEX IF NOT EXISTS idx_variants_sku ON variants(sku);
+CREATE INDEX IF NOT EXISTS idx_variants_price_id ON variants(stripe_price_id);
+CREATE INDEX IF NOT EXISTS idx_variants_source ON variants(source);
+CREATE INDEX IF NOT EXISTS idx_product_images_product_id ON product_images(product_id);
+CREATE INDEX IF NOT EXISTS idx_product_images_url ON product_images(image_url);
+CREATE INDEX IF NOT EXISTS idx_product_images_source ON product_images(source);
+CREATE INDEX IF NOT EXISTS idx_product_tags_product_id ON product_tags(product_id);
+CREATE INDEX IF NOT EXISTS idx_product_tags_tag ON product_tags(tag);
+CREATE INDEX IF NOT EXISTS idx_product_tags_source ON product_tags(source);
+CREATE INDEX IF NOT EXISTS idx_url_lists_url ON url_lists(image_url);
+CREATE INDEX IF NOT EXISTS idx_url_lists_source ON url_lists(source);
+
+DROP VIEW IF EXISTS all_image_urls;
+CREATE VIEW all_image_urls AS
+    SELECT source, handle, NULL AS product_id, image_url FROM manifest_images
+    UNION ALL SELECT source, handle, product_id, primary_image FROM master_products
+        WHERE primary_image IS NOT NULL AND primary_image != ''
+    UNION ALL SELECT source, NULL, product_id, image_url FROM product_images
+    UNION ALL SELECT source, NULL, NULL, image_url FROM url_lists;
+"""
+
+# Tables each kind writes to (cleared per source before a reload)
+KIND_TABLES = {
+    'manifest': ['manifest_images'],
+    'master': ['master_products'],
+    'master_variants': ['master_products', 'variants'],
+    'variants': ['variants'],
+    'images': ['product_images'],
+    'tags': ['product_tags'],
+    'urls': ['url_lists'],
+}
+
+URL_PATTERN = re.compile(r"https?://\S+")
+
+
+def connect(db_path: str = DEFAULT_DB) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _int(value) -> Optional[int]:
+    if value in (None, ''):
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+def _bool(value) -> Optional[int]:
+    if value in (None, ''):
+        return None
+    return 1 if str(value).strip().lower() in ('true', '1', 't', 'yes') else 0
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open('rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _master_row(source: str, row: Dict[str, str]):
+    return (
+        source, row.get('product_id'), row.get('sku'), row.get('handle'), row.get('name'),
+        row.get('category'), row.get('status'), _int(row.get('base_price')), row.get('price_usd'),
+        row.get('primary_image'), row.get('gallery_urls'), _int(row.get('gallery_count')),
+        row.get('search_keywords'), row.get('tags'), row.get('name_key_norm'),
+        json.dumps(row, ensure_ascii=False),
+    )
+
+
+def _variant_row(source: str, row: Dict[str, str], price_usd_key: str = 'price_usd'):
+    return (
+        source, row.get('product_id'), row.get('sku'), row.get('variant_title'),
+        _int(row.get('price_cents')), row.get(price_usd_key), row.get('stripe_price_id'),
+        _bool(row.get('stripe_active')), row.get('variant_sku') or None,
+    )
+
+
+def _ingest(connection: sqlite3.Connection, inputs: CatalogInputs, source: str, kind: str) -> int:
+    """Insert one source's rows; the caller owns the transaction."""
+    if kind == 'manifest':
+        records = [
+            (source, category, handle, image['image_name'], image.get('image_type'),
+             image.get('local_path'), image['cdn_url'])
+            for category, products in inputs.json(source)['categories'].items()
+            for handle, product in products.items()
+            for image in product['images']
+        ]
+        connection.executemany("INSERT INTO manifest_images VALUES (?, ?, ?, ?, ?, ?, ?)", records)
+        return len(records)
+
+    if kind == 'urls':
+        records = []
+        for line in inputs.path(source).read_text(encoding='utf-8').splitlines():
+            if line.lstrip().startswith('#'):
+                continue
+            records.extend((source, url) for url in URL_PATTERN.findall(line))
+        connection.executemany("INSERT INTO url_lists VALUES (?, ?)", records)
+        return len(records)
+
+    rows = inputs.csv(source)
+    if kind == 'master':
+        records = [_master_row(source, row) for row in rows]
+        connection.executemany(
+            "INSERT INTO master_products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+    elif kind == 'master_variants':
+        # One row per variant; products repeat, keep the first row per product_id
+        seen = set()
+        products = []
+        for row in rows:
+            if row.get('product_id') not in seen:
+                seen.add(row.get('product_id'))
+                products.append(_master_row(source, row))
+        connection.executemany(
+            "INSERT INTO master_products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", products)
+        records = [_variant_row(source, {**row, 'sku': row.get('variant_sku') or row.get('sku')},
+                                'variant_price_usd') for row in rows]
+        connection.executemany("INSERT INTO variants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+    elif kind == 'variants':
+        records = [_variant_row(source, row) for row in rows]
+        connection.executemany("INSERT INTO variants VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+    elif kind == 'images':
+        records = [(source, row.get('product_id'), row.get('image_url'), row.get('image_type'),
+                    _int(row.get('position')), row.get('alt_text')) for row in rows]
+        connection.executemany("INSERT INTO product_images VALUES (?, ?, ?, ?, ?, ?)", records)
+    elif kind == 'tags':
+        records = [(source, row.get('product_id'), row.get('tag')) for row in rows]
+        connection.executemany("INSERT INTO product_tags VALUES (?, ?, ?)", records)
+    else:
+        raise ValueError(f"Unknown source kind: {kind}")
+    return len(records)
+
+
+def refresh(connection: sqlite3.Connection, inputs: CatalogInputs, force: bool = False,
+            metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    """Reload changed sources. Returns one status entry per source."""
+    metrics = metrics or RunMetrics('stage', trace_memory=False)
+    known = {row['source']: row for row in connection.execute("SELECT * FROM sources")}
+    results = []
+
+    def drop(source: str, kind: str) -> None:
+        with connection:
+            for table in KIND_TABLES[kind]:
+                connection.execute(f"DELETE FROM {table} WHERE source = ?", (source,))
+            connection.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    for source, kind in SOURCES:
+        path = inputs.path(source)
+        if not path.exists():
+            # Rows from a deleted file would otherwise keep answering queries
+            if source in known:
+                drop(source, known[source]['kind'])
+            results.append({'source': source, 'status': 'removed' if source in known else 'missing', 'rows': 0})
+            continue
+
+        stat = path.stat()
+        previous = known.get(source)
+        if not force and previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+            results.append({'source': source, 'status': 'unchanged', 'rows': previous['row_count']})
+            continue
+
+        sha256 = _file_sha256(path)
+        if not force and previous and previous['sha256'] == sha256:
+            connection.execute("UPDATE sources SET mtime_ns = ?, size = ? WHERE source = ?",
+                               (stat.st_mtime_ns, stat.st_size, source))
+            connection.commit()
+            results.append({'source': source, 'status': 'unchanged', 'rows': previous['row_count']})
+            continue
+
+        with metrics.stage('staging'):
+            with connection:
+                for table in KIND_TABLES[kind]:
+                    connection.execute(f"DELETE FROM {table} WHERE source = ?", (source,))
+                row_count = _ingest(connection, inputs, source, kind)
+                connection.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (source, kind, stat.st_size, stat.st_mtime_ns, sha256, row_count, time.time()))
+        metrics.incr('rows_staged', row_count)
+        results.append({'source': source, 'status': 'loaded' if previous is None else 'reloaded',
+                        'rows': row_count})
+
+    for source in sorted(set(known) - {source for source, _ in SOURCES}):
+        drop(source, known[source]['kind'])
+        results.append({'source': source, 'status': 'removed', 'rows': 0})
+
+    with metrics.stage('analyze'):
+        connection.execute("ANALYZE")
+    return results
+
+
+def run_query(connection: sqlite3.Connection, sql: str, limit: int = 50) -> None:
+    started = time.perf_counter()
+    cursor = connection.execute(sql)
+    rows = cursor.fetchall()
+    elapsed = (time.perf_counter() - started) * 1000
+    columns = [description[0] for description in cursor.description or []]
+    if columns:
+        print(" | ".join(columns))
+        print("-" * min(120, sum(len(c) + 3 for c in columns)))
+    for row in rows[:limit]:
+        print(" | ".join("" if value is None else str(value) for value in row))
+    if len(rows) > limit:
+        print(f"... {len(rows) - limit} more rows")
+    print(f"\n{len(rows)} rows in {elapsed:.2f} ms")
+
+
+def print_refresh(results: List[Dict], db_path: str) -> None:
+    print(f"\n{'='*80}")
+    print(f"STAGING CATALOG: {db_path}")
+    print(f"{'='*80}")
+    for result in results:
+        print(f"  {result['status']:<10} {result['rows'] or 0:>6}  {result['source']}")
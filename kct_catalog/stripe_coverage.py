@@ -0,0 +1,200 @@
+"""
+Offline Stripe price coverage check.
+
+Replaces running verify-stripe-coverage.sql / verify-final-stripe-coverage.sql
+against production. Products from the master exports are indexed by
+product_id, handle and SKU. Every variant row from product_variants_import.csv
+and the Master-CSV-2 variants file is then checked in one linear pass, while
+the price ID and SKU indexes are filled. The generated catalog is joined by
+handle, falling back to SKU.
+
+Checks:
+
+* missing_price: variant without a stripe_price_id
+* inactive_price: stripe_active is not True
+* cents_mismatch: price_cents disagrees with the variant's price_usd or the
+  product's base_price (cents)
+* orphan_variant: variant product_id not in any master export
+* duplicate_price_id: one price ID carrying several amounts. Sharing a price
+  ID across products at the same amount is intended (SMART_STRIPE_MAPPING.md)
+* variant_conflict: the same product_id + variant_title listed with different
+  price IDs or amounts in different files
+* sku_conflict: one variant SKU (variant_sku, else sku) used by several products
+* uncovered_product: master product with no active priced variant
+* generated_unpriced: generated row with no active Stripe price behind it
+* generated_price_mismatch: generated base_price not among the product's
+  Stripe amounts
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from .inputs import (MASTER_CSV_2_PRODUCTS, MASTER_CSV_2_VARIANTS, MASTER_PRODUCTS_CSV,
+                     PRODUCT_VARIANTS_CSV, CatalogInputs)
+from .metrics import RunMetrics
+
+
+PRODUCT_SOURCES = (MASTER_PRODUCTS_CSV, MASTER_CSV_2_PRODUCTS)
+VARIANT_SOURCES = (PRODUCT_VARIANTS_CSV, MASTER_CSV_2_VARIANTS)
+
+CHECKS = ('missing_price', 'inactive_price', 'cents_mismatch', 'orphan_variant',
+          'duplicate_price_id', 'variant_conflict', 'sku_conflict', 'uncovered_product',
+          'generated_unpriced', 'generated_price_mismatch')
+
+
+def parse_cents(value: Optional[str]) -> Optional[int]:
+    """'28999.0' -> 28999; '' -> None"""
+    try:
+        return int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+
+
+def usd_to_cents(value) -> Optional[int]:
+    """'$289.99' or 289.99 -> 28999"""
+    try:
+        return int(round(float(str(value).replace('$', '').replace(',', '')) * 100))
+    except ValueError:
+        return None
+
+
+def index_products(inputs: CatalogInputs) -> Dict[str, Dict]:
+    """product_id -> product, plus handle/SKU lookups."""
+    by_id: Dict[str, Dict] = {}
+    by_handle: Dict[str, str] = {}
+    by_sku: Dict[str, str] = {}
+    for source in PRODUCT_SOURCES:
+        if not inputs.path(source).exists():
+            continue
+        for row in inputs.csv(source):
+            product_id = row.get('product_id')
+            if not product_id or product_id in by_id:
+                continue
+            by_id[product_id] = {
+                'product_id': product_id,
+                'handle': row.get('handle', ''),
+                'sku': row.get('sku', ''),
+                'base_cents': parse_cents(row.get('base_price')),
+                'source': source,
+            }
+            if row.get('handle'):
+                by_handle.setdefault(row['handle'], product_id)
+            if row.get('sku'):
+                by_sku.setdefault(row['sku'], product_id)
+    return {'by_id': by_id, 'by_handle': by_handle, 'by_sku': by_sku}
+
+
+def iter_variants(inputs: CatalogInputs) -> Iterable[Dict]:
+    for source in VARIANT_SOURCES:
+        if not inputs.path(source).exists():
+            continue
+        for line, row in enumerate(inputs.csv(source), start=2):
+            yield dict(row, _source=source, _line=line)
+
+
+def check_coverage(inputs: CatalogInputs, rows: Optional[List[Dict]] = None,
+                   metrics: Optional[RunMetrics] = None) -> Dict:
+    metrics = metrics or RunMetrics('stripe_coverage', trace_memory=False)
+    issues: Dict[str, List[Dict]] = {check: [] for check in CHECKS}
+
+    def report(check: str, **detail) -> None:
+        issues[check].append(detail)
+
+    with metrics.stage('stripe_indexing'):
+        products = index_products(inputs)
+    by_id = products['by_id']
+
+    price_products = defaultdict(set)
+    price_amounts = defaultdict(set)
+    sku_products = defaultdict(set)
+    variant_prices: Dict[tuple, tuple] = {}
+    active_cents = defaultdict(set)
+    variant_count = 0
+
+    with metrics.stage('stripe_checking'):
+        for variant in iter_variants(inputs):
+            variant_count += 1
+            where = {'source': variant['_source'], 'line': variant['_line'],
+                     'product_id': variant.get('product_id', ''), 'sku': variant.get('sku', '')}
+            price_id = (variant.get('stripe_price_id') or '').strip()
+            cents = parse_cents(variant.get('price_cents'))
+            product = by_id.get(variant.get('product_id'))
+
+            if product is None:
+                report('orphan_variant', **where)
+            if not price_id:
+                report('missing_price', **where)
+            elif (variant.get('stripe_active') or '').strip().lower() != 'true':
+                report('inactive_price', price_id=price_id, **where)
+            else:
+                active_cents[variant.get('product_id')].add(cents)
+
+            usd_cents = usd_to_cents(variant.get('price_usd')) if variant.get('price_usd') else None
+            if cents is None:
+                report('cents_mismatch', detail="price_cents is empty", **where)
+            elif usd_cents is not None and usd_cents != cents:
+                report('cents_mismatch', detail=f"price_cents {cents} != price_usd {variant['price_usd']}", **where)
+            elif product is not None and product['base_cents'] and product['base_cents'] != cents:
+                report('cents_mismatch', detail=f"price_cents {cents} != base_price {product['base_cents']}", **where)
+
+            if price_id:
+                price_products[price_id].add(variant.get('product_id'))
+                price_amounts[price_id].add(cents)
+            variant_key = (variant.get('product_id'), variant.get('variant_title'))
+            seen = variant_prices.setdefault(variant_key, (price_id, cents, variant['_source']))
+            if seen[:2] != (price_id, cents) and seen[2] != variant['_source']:
+                report('variant_conflict', variant_title=variant.get('variant_title', ''),
+                       detail=f"{price_id}/{cents} vs {seen[0]}/{seen[1]} in {seen[2]}", **where)
+            variant_sku = variant.get('variant_sku') or variant.get('sku') or ''
+            if variant_sku:
+                sku_products[variant_sku].add(variant.get('product_id'))
+
+        for price_id in sorted(price_id for price_id, amounts in price_amounts.items() if len(amounts) > 1):
+            report('duplicate_price_id', price_id=price_id,
+                   amounts=sorted(amount for amount in price_amounts[price_id] if amount is not None),
+                   products=len(price_products[price_id]))
+        for sku in sorted(sku for sku, product_ids in sku_products.items() if len(product_ids) > 1):
+            report('sku_conflict', sku=sku, product_ids=sorted(sku_products[sku]))
+
+        for product_id, product in by_id.items():
+            if not active_cents.get(product_id):
+                report('uncovered_product', product_id=product_id, handle=product['handle'],
+                       sku=product['sku'], source=product['source'])
+
+        for row in rows or []:
+            product_id = products['by_handle'].get(row['handle']) or products['by_sku'].get(row['sku'])
+            amounts = active_cents.get(product_id)
+            if not amounts:
+                report('generated_unpriced', handle=row['handle'], sku=row['sku'], product_id=product_id or '')
+            elif usd_to_cents(row['base_price']) not in amounts:
+                report('generated_price_mismatch', handle=row['handle'], product_id=product_id,
+                       base_price=row['base_price'], stripe_cents=sorted(a for a in amounts if a is not None))
+
+    metrics.incr('variants', variant_count)
+    metrics.incr('stripe_issues', sum(len(found) for found in issues.values()))
+    return {
+        'products': len(by_id),
+        'variants': variant_count,
+        'price_ids': len(price_products),
+        'generated': len(rows or []),
+        'issues': issues,
+    }
+
+
+def has_problems(report: Dict) -> bool:
+    return any(report['issues'].values())
+
+
+def print_coverage(report: Dict, examples: int = 5) -> None:
+    print(f"\n{'='*80}")
+    print("STRIPE PRICE COVERAGE")
+    print(f"{'='*80}")
+    print(f"Products: {report['products']}  Variants: {report['variants']}  "
+          f"Price IDs: {report['price_ids']}  Generated rows: {report['generated']}")
+    for check in CHECKS:
+        found = report['issues'][check]
+        print(f"{check}: {len(found)}")
+        for issue in found[:examples]:
+            print("  " + ', '.join(f"{key}={value}" for key, value in issue.items()))
+        if len(found) > examples:
+            print(f"  ... and {len(found) - examples} more")
@@ -0,0 +1,305 @@
+"""
+Upload the scanned image trees to the R2 bucket over the S3 API.
+
+The CDN manifests pair every local_path with its cdn_url. The object key is
+the cdn_url path, so an uploaded file is served at exactly the URL the
+generated rows already use. Each file's expected ETag is computed locally:
+the MD5 for single-part uploads, or the MD5 of the part MD5s for multipart
+ones, with the same part size the uploader uses. An object is skipped when
+that ETag matches the state file from the last run. Otherwise a HEAD
+request checks the bucket, so a first run against a populated bucket only
+sends what differs. Hashes are cached by size and mtime, so unchanged files
+are not re-read either.
+
+Uploads run on a bounded thread pool. Files above the multipart threshold
+go up in parts, and every object gets its Content-Type and Cache-Control.
+The endpoint is configurable, so the same command works against R2 or a
+local S3-compatible server.
+
+Requires boto3 (`pip install boto3`). Credentials come from the usual AWS
+environment variables or profile.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+from .scan import FALL_2025_MANIFEST, VEST_ACCESSORIES_MANIFEST
+
+
+DEFAULT_STATE = "metrics/upload-state.json"
+MANIFESTS = {
+    'fall-2025': FALL_2025_MANIFEST,
+    'vest-accessories': VEST_ACCESSORIES_MANIFEST,
+}
+
+CONTENT_TYPES = {
+    '.webp': 'image/webp',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+}
+# Keys such as .../main.webp are reused when a photo is replaced, so the
+# objects cannot be marked immutable
+DEFAULT_CACHE_CONTROL = "public, max-age=86400"
+
+# boto3's own defaults, kept explicit because the expected ETag depends on them
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024
+READ_SIZE = 1024 * 1024
+SAVE_EVERY = 25
+
+
+class UploadError(RuntimeError):
+    pass
+
+
+def _boto3():
+    try:
+        import boto3
+    except ImportError:
+        raise UploadError("The upload command needs boto3: pip install boto3")
+    return boto3
+
+
+def target_fingerprint(endpoint_url: str, bucket: str) -> str:
+    return hashlib.sha256(f"{endpoint_url}\0{bucket}".encode('utf-8')).hexdigest()[:16]
+
+
+def s3_etag(path: Path, size: int, threshold: int = MULTIPART_THRESHOLD, part_size: int = PART_SIZE) -> str:
+    """The ETag S3 assigns to this file when uploaded with the given part size."""
+    whole = hashlib.md5()
+    parts = []
+    part = hashlib.md5()
+    part_filled = 0
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(min(READ_SIZE, part_size - part_filled))
+            if not block:
+                break
+            whole.update(block)
+            part.update(block)
+            part_filled += len(block)
+            if part_filled == part_size:
+                parts.append(part.digest())
+                part, part_filled = hashlib.md5(), 0
+    if size < threshold:
+        return whole.hexdigest()
+    if part_filled:
+        parts.append(part.digest())
+    return f"{hashlib.md5(b''.join(parts)).hexdigest()}-{len(parts)}"
+
+
+class UploadState:
+    """Last uploaded ETag, size and mtime per object key, for one endpoint + bucket."""
+
+    def __init__(self, path: str, target: str):
+        self.path = Path(path)
+        self.target = target
+        self.objects: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            if state.get('target') == target:
+                self.objects = state.get('objects', {})
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.objects.get(key)
+
+    def mark(self, key: str, entry: Dict) -> None:
+        with self._lock:
+            self.objects[key] = entry
+
+    def save(self) -> None:
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            tmp_path.write_text(json.dumps({'target': self.target, 'objects': dict(sorted(self.objects.items()))},
+                                           indent=2) + "\n")
+            os.replace(tmp_path, self.path)
+
+
+def collect_objects(inputs: CatalogInputs, targets: Iterable[str]) -> List[Dict]:
+    """One entry per manifest image: object key, local path and cdn_url."""
+    objects = {}
+    for target in targets:
+        manifest = MANIFESTS[target]
+        if not inputs.path(manifest).exists() and inputs.get(manifest) is None:
+            print(f"Warning: {manifest} not found; run `python -m kct_catalog scan {target}` first")
+            continue
+        cdn_data = inputs.json(manifest)
+        for products in cdn_data.get('categories', {}).values():
+            for product_data in products.values():
+                for image in product_data['images']:
+                    key = urlparse(image['cdn_url']).path.lstrip('/')
+                    objects[key] = {'key': key, 'local_path': image['local_path'], 'cdn_url': image['cdn_url']}
+    return [objects[key] for key in sorted(objects)]
+
+
+def make_client(endpoint_url: str, region: str = 'auto', max_connections: int = 10):
+    boto3 = _boto3()
+    from botocore.config import Config
+    from botocore.exceptions import BotoCoreError
+
+    try:
+        return boto3.client('s3', endpoint_url=endpoint_url, region_name=region,
+                            config=Config(max_pool_connections=max_connections,
+                                          retries={'max_attempts': 5, 'mode': 'standard'}))
+    except (BotoCoreError, ValueError) as exc:
+        raise UploadError(f"could not create the S3 client for {endpoint_url}: {exc}")
+
+
+def remote_etag(client, bucket: str, key: str) -> Optional[str]:
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    try:
+        response = client.head_object(Bucket=bucket, Key=key)
+    except ClientError as exc:
+        if exc.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+            return None
+        raise UploadError(f"HEAD {key} failed: {exc}")
+    except BotoCoreError as exc:
+        # Connection and credential errors: every other request would fail too
+        raise UploadError(f"HEAD {key} failed: {exc}")
+    return response['ETag'].strip('"')
+
+
+def plan_uploads(inputs: CatalogInputs, objects: List[Dict], state: UploadState, client=None,
+                 bucket: str = '', jobs: int = 8, verify_remote: bool = False,
+                 metrics: Optional[RunMetrics] = None) -> Dict[str, List[Dict]]:
+    """Sort objects into upload / unchanged / missing. Without a client only
+    the state file is consulted."""
+    metrics = metrics or RunMetrics('upload', trace_memory=False)
+    plan: Dict[str, List[Dict]] = {'upload': [], 'unchanged': [], 'missing': []}
+
+    def inspect(obj: Dict) -> Dict:
+        local = inputs.path(obj['local_path'])
+        if not local.is_file():
+            return dict(obj, action='missing')
+        stat = local.stat()
+        cached = state.get(obj['key'])
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            etag = cached['etag']
+        else:
+            etag = s3_etag(local, stat.st_size)
+        entry = dict(obj, etag=etag, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        if cached and cached['etag'] == etag and not verify_remote:
+            return dict(entry, action='unchanged', reason='state')
+        if client is None:
+            return dict(entry, action='upload', reason='changed' if cached else 'new')
+        current = remote_etag(client, bucket, obj['key'])
+        if current == etag:
+            state.mark(obj['key'], {'etag': etag, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+            return dict(entry, action='unchanged', reason='remote')
+        return dict(entry, action='upload', reason='new' if current is None else 'changed')
+
+    with metrics.stage('upload_planning'):
+        with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+            for entry in executor.map(inspect, objects):
+                plan[entry.pop('action')].append(entry)
+    metrics.incr('objects_planned', len(objects))
+    return plan
+
+
+def upload_objects(inputs: CatalogInputs, entries: List[Dict], client, bucket: str, state: UploadState,
+                   jobs: int = 8, cache_control: str = DEFAULT_CACHE_CONTROL,
+                   metrics: Optional[RunMetrics] = None) -> Dict:
+    """Upload on a pool of `jobs` threads; the state file is saved as objects land.
+
+    An object the bucket rejects is reported in 'failed'. Connection and
+    credential errors raise UploadError, since no other object would get
+    through either; queued uploads are dropped and the state file keeps what
+    already landed."""
+    from boto3.exceptions import S3UploadFailedError
+    from boto3.s3.transfer import TransferConfig
+    from botocore.exceptions import BotoCoreError, ClientError
+
+    metrics = metrics or RunMetrics('upload', trace_memory=False)
+    # Parallelism comes from the pool, so each transfer runs its parts serially
+    transfer = TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, multipart_chunksize=PART_SIZE,
+                              use_threads=False)
+    failed = []
+    completed = [0]
+    lock = threading.Lock()
+
+    def upload(entry: Dict) -> Dict:
+        extra = {'CacheControl': cache_control,
+                 'ContentType': CONTENT_TYPES.get(Path(entry['key']).suffix.lower(), 'application/octet-stream')}
+        started = time.perf_counter()
+        try:
+            client.upload_file(str(inputs.path(entry['local_path'])), bucket, entry['key'],
+                               ExtraArgs=extra, Config=transfer)
+        except (ClientError, S3UploadFailedError, OSError) as exc:
+            return dict(entry, error=str(exc))
+        except BotoCoreError as exc:
+            raise UploadError(f"upload of {entry['key']} failed: {exc}")
+        state.mark(entry['key'], {'etag': entry['etag'], 'size': entry['size'], 'mtime_ns': entry['mtime_ns']})
+        with lock:
+            completed[0] += 1
+            if completed[0] % SAVE_EVERY == 0:
+                state.save()
+        return dict(entry, seconds=round(time.perf_counter() - started, 6))
+
+    uploaded_bytes = 0
+    started = time.perf_counter()
+    try:
+        with metrics.stage('uploading'):
+            with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+                futures = [executor.submit(upload, entry) for entry in entries]
+                try:
+                    for future in futures:
+                        result = future.result()
+                        if 'error' in result:
+                            failed.append(result)
+                            print(f"  FAILED {result['key']}: {result['error']}")
+                            continue
+                        uploaded_bytes += result['size']
+                        metrics.incr('objects_uploaded')
+                        metrics.incr('bytes_uploaded', result['size'])
+                except UploadError:
+                    for future in futures:
+                        future.cancel()
+                    raise
+    finally:
+        state.save()
+    elapsed = time.perf_counter() - started
+    return {
+        'uploaded': len(entries) - len(failed),
+        'bytes': uploaded_bytes,
+        'seconds': round(elapsed, 6),
+        'bytes_per_second': round(uploaded_bytes / elapsed, 1) if elapsed and uploaded_bytes else None,
+        'failed': failed,
+    }
+
+
+def print_plan(plan: Dict[str, List[Dict]], limit: int = 10) -> None:
+    print(f"\n{'='*80}")
+    print("UPLOAD PLAN")
+    print(f"{'='*80}")
+    size = sum(entry['size'] for entry in plan['upload'])
+    print(f"Upload: {len(plan['upload'])} ({size / 1024 / 1024:.1f} MiB)  "
+          f"Unchanged: {len(plan['unchanged'])}  Missing locally: {len(plan['missing'])}")
+    for entry in plan['upload'][:limit]:
+        print(f"  {entry['reason']:<8} {entry['key']}")
+    if len(plan['upload']) > limit:
+        print(f"  ... and {len(plan['upload']) - limit} more")
+    for entry in plan['missing'][:limit]:
+        print(f"  missing  {entry['local_path']}")
+
+
+def print_upload_report(report: Dict) -> None:
+    print(f"\n{'='*80}")
+    print("UPLOAD")
+    print(f"{'='*80}")
+    print(f"Uploaded: {report['uploaded']} objects, {report['bytes'] / 1024 / 1024:.1f} MiB "
+          f"in {report['seconds']:.3f}s ({report['bytes_per_second']} bytes/s)")
+    if report['failed']:
+        print(f"Failed: {len(report['failed'])}")
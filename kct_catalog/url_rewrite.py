@@ -0,0 +1,275 @@
+"""
+Bulk rewrite of legacy R2 image URLs to the CDN domain.
+
+Replaces the hand-written REPLACE() fixes in sql/fixes/ and
+UPDATE-WITH-GALLERY-IMAGES.sql. A prefix mapping (old R2 path -> CDN path)
+is read from a CSV with old_prefix,new_prefix columns, or from a JSON
+object, into a path-segment trie. Each URL is rewritten by its longest
+matching prefix. Because the trie matches whole segments, a `batch_1/`
+prefix never picks up `batch_10/...`.
+
+Every target file is streamed line by line and rewritten in a single pass.
+URLs end at whitespace, quotes, ',' and ';', so SQL literals, JSON strings
+and the comma-joined gallery_urls cells are all handled the same way, and
+everything else in the file is left byte-for-byte as it was. URLs on a
+legacy host (pub-*.r2.dev) with no matching prefix are reported as
+unmapped.
+
+The patch SQL loads every old -> new pair into a temp table with COPY. It
+then updates products.primary_image, product_images.image_url and the
+products_enhanced images JSON with one joined UPDATE per column.
+"""
+
+import csv
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .facets import DEFAULT_SQL_OUTPUT as FACETS_SQL_OUTPUT
+from .generate import PROFILES
+from .inputs import CatalogInputs
+from .metrics import RunMetrics
+from .scan import FALL_2025_MANIFEST, VEST_ACCESSORIES_MANIFEST
+from .search import DEFAULT_SQL_OUTPUT as SEARCH_SQL_OUTPUT
+
+
+DEFAULT_PATCH = "sql/cdn-url-rewrite.sql"
+# Every CSV export plus the SQL/JSON artifacts the catalog commands generate.
+# sql/shards/ is left out: its manifest.json holds a sha256 per shard, so the
+# shards are regenerated with `shard` instead of being rewritten in place.
+DEFAULT_TARGETS = (
+    "Master-CSV-2/*.csv",
+    "kct_master_exports/*.csv",
+    FALL_2025_MANIFEST,
+    VEST_ACCESSORIES_MANIFEST,
+    *sorted({settings['output'] for settings in PROFILES.values()}),
+    SEARCH_SQL_OUTPUT,
+    FACETS_SQL_OUTPUT,
+    "dist/catalog/**/*.json",
+)
+
+URL_IN_TEXT = re.compile(r'''https?://[^\s"'<>(),;\\`]+''')
+LEGACY_HOST = re.compile(r'^https?://pub-[0-9a-f]+\.r2\.dev/')
+UNMAPPED_REPORTED = 20
+
+
+class RewriteError(ValueError):
+    pass
+
+
+class PrefixTrie:
+    """Longest-prefix lookup over '/'-separated URL segments."""
+
+    def __init__(self):
+        self.root: Dict = {}
+        self.size = 0
+
+    @staticmethod
+    def _segments(prefix: str) -> List[str]:
+        return prefix.rstrip('/').split('/')
+
+    def insert(self, old_prefix: str, new_prefix: str) -> None:
+        node = self.root
+        for segment in self._segments(old_prefix):
+            node = node.setdefault(segment, {})
+        if None not in node:
+            self.size += 1
+        node[None] = new_prefix.rstrip('/')
+
+    def rewrite(self, url: str) -> Optional[str]:
+        """The URL under its longest mapped prefix, or None when nothing maps."""
+        segments = url.split('/')
+        node, match, depth = self.root, None, 0
+        for index, segment in enumerate(segments):
+            node = node.get(segment)
+            if node is None:
+                break
+            if None in node:
+                match, depth = node[None], index + 1
+        if match is None:
+            return None
+        rest = segments[depth:]
+        return '/'.join([match] + rest) if rest else match
+
+
+def load_mapping(path) -> PrefixTrie:
+    """CSV with old_prefix,new_prefix columns, or a JSON {old_prefix: new_prefix} object."""
+    path = Path(path)
+    if not path.exists():
+        raise RewriteError(f"mapping file not found: {path}")
+    if path.suffix == '.json':
+        with open(path, 'r') as f:
+            pairs = list(json.load(f).items())
+    else:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            if not {'old_prefix', 'new_prefix'} <= set(reader.fieldnames or ()):
+                raise RewriteError(f"{path}: expected old_prefix,new_prefix columns")
+            pairs = [(row['old_prefix'].strip(), row['new_prefix'].strip()) for row in reader
+                     if (row['old_prefix'] or '').strip()]
+
+    trie = PrefixTrie()
+    for old_prefix, new_prefix in pairs:
+        for prefix in (old_prefix, new_prefix):
+            # A replacement has to survive inside CSV cells and SQL literals unquoted
+            if not URL_IN_TEXT.fullmatch(prefix):
+                raise RewriteError(f"{path}: not a plain URL prefix: {prefix!r}")
+        trie.insert(old_prefix, new_prefix)
+    if not trie.size:
+        raise RewriteError(f"{path}: mapping is empty")
+    return trie
+
+
+def target_files(root: Path, patterns: Iterable[str], exclude: Iterable[Path] = ()) -> List[Path]:
+    excluded = {path.resolve() for path in exclude}
+    files = {}
+    for pattern in patterns:
+        matches = [root / pattern] if not any(c in pattern for c in '*?[') else sorted(root.glob(pattern))
+        for path in matches:
+            if path.is_file() and not path.name.startswith('.') and path.resolve() not in excluded:
+                files.setdefault(path.resolve(), path)
+    return list(files.values())
+
+
+def rewrite_file(path: Path, trie: PrefixTrie, rewrites: Dict[str, str], unmapped: Counter,
+                 write: bool = False) -> Dict:
+    """Stream one file through the trie. With write, changed files are
+    replaced atomically; unchanged files are never touched."""
+    counts = {'urls': 0, 'rewritten': 0, 'unmapped': 0}
+
+    def replace(match) -> str:
+        url = match.group(0)
+        counts['urls'] += 1
+        new_url = rewrites.get(url)
+        if new_url is None:
+            new_url = trie.rewrite(url)
+            if new_url is None:
+                if LEGACY_HOST.match(url):
+                    counts['unmapped'] += 1
+                    unmapped[url] += 1
+                return url
+            rewrites[url] = new_url
+        counts['rewritten'] += 1
+        return new_url
+
+    tmp_path = path.with_name(f".{path.name}.rewrite")
+    with open(path, 'r', newline='', encoding='utf-8') as source:
+        if write:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as target:
+                for line in source:
+                    target.write(URL_IN_TEXT.sub(replace, line))
+        else:
+            for line in source:
+                URL_IN_TEXT.sub(replace, line)
+    if write:
+        if counts['rewritten']:
+            os.replace(tmp_path, path)
+        else:
+            tmp_path.unlink()
+    return counts
+
+
+def rewrite_urls(inputs: CatalogInputs, trie: PrefixTrie, patterns: Iterable[str] = DEFAULT_TARGETS,
+                 write: bool = False, exclude: Iterable[Path] = (),
+                 metrics: Optional[RunMetrics] = None) -> Dict:
+    metrics = metrics or RunMetrics('url_rewrite', trace_memory=False)
+    rewrites: Dict[str, str] = {}
+    unmapped: Counter = Counter()
+    files = []
+    with metrics.stage('url_rewriting'):
+        for path in target_files(inputs.root, patterns, exclude):
+            counts = rewrite_file(path, trie, rewrites, unmapped, write)
+            files.append(dict(counts, path=str(path.relative_to(inputs.root))))
+
+    unmapped_prefixes = Counter()
+    for url, count in unmapped.items():
+        # host plus first directory: the prefix a new mapping line would need
+        unmapped_prefixes['/'.join(url.split('/')[:4]) + '/'] += count
+    metrics.incr('files_scanned', len(files))
+    metrics.incr('urls_rewritten', sum(entry['rewritten'] for entry in files))
+    metrics.incr('urls_unmapped', sum(unmapped.values()))
+    return {
+        'written': write,
+        'files': files,
+        'rewrites': dict(sorted(rewrites.items())),
+        'unmapped': dict(unmapped.most_common()),
+        'unmapped_prefixes': dict(unmapped_prefixes.most_common()),
+    }
+
+
+def render_patch_sql(rewrites: Dict[str, str]) -> str:
+    """Set-based patch for the live tables: COPY the pairs, then one UPDATE per column."""
+    lines = [
+        "-- ============================================",
+        "-- LEGACY R2 URL -> CDN REWRITE",
+        f"-- {len(rewrites)} URLs; generated by `python -m kct_catalog rewrite-urls`",
+        "-- Run with psql (COPY ... FROM STDIN)",
+        "-- ============================================",
+        "",
+        "BEGIN;",
+        "",
+        "CREATE TEMP TABLE url_rewrites (old_url TEXT PRIMARY KEY, new_url TEXT NOT NULL) ON COMMIT DROP;",
+        "",
+        "COPY url_rewrites (old_url, new_url) FROM STDIN;",
+    ]
+    lines.extend(f"{old_url}\t{new_url}" for old_url, new_url in rewrites.items())
+    lines.extend([
+        "\\.",
+        "",
+        "UPDATE products p",
+        "SET primary_image = r.new_url",
+        "FROM url_rewrites r",
+        "WHERE p.primary_image = r.old_url;",
+        "",
+        "UPDATE product_images pi",
+        "SET image_url = r.new_url",
+        "FROM url_rewrites r",
+        "WHERE pi.image_url = r.old_url;",
+        "",
+        "UPDATE products_enhanced pe",
+        "SET images = jsonb_set(pe.images, '{hero,url}', to_jsonb(r.new_url)), updated_at = NOW()",
+        "FROM url_rewrites r",
+        "WHERE pe.images->'hero'->>'url' = r.old_url;",
+        "",
+        "UPDATE products_enhanced pe",
+        "SET images = jsonb_set(pe.images, '{gallery}', (",
+        "        SELECT jsonb_agg(CASE WHEN r.new_url IS NULL THEN g.item",
+        "                              ELSE jsonb_set(g.item, '{url}', to_jsonb(r.new_url)) END",
+        "                         ORDER BY g.position)",
+        "        FROM jsonb_array_elements(pe.images->'gallery') WITH ORDINALITY AS g(item, position)",
+        "        LEFT JOIN url_rewrites r ON r.old_url = g.item->>'url')),",
+        "    updated_at = NOW()",
+        "WHERE jsonb_typeof(pe.images->'gallery') = 'array'",
+        "  AND EXISTS (SELECT 1 FROM jsonb_array_elements(pe.images->'gallery') AS g(item)",
+        "              JOIN url_rewrites r ON r.old_url = g.item->>'url');",
+        "",
+        "COMMIT;",
+        "",
+    ])
+    return "\n".join(lines)
+
+
+def write_patch(rewrites: Dict[str, str], output) -> Path:
+    output_file = Path(output)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    output_file.write_text(render_patch_sql(rewrites))
+    return output_file
+
+
+def print_rewrite(result: Dict, limit: int = UNMAPPED_REPORTED) -> None:
+    print(f"\n{'='*80}")
+    print("URL REWRITE" + ("" if result['written'] else " (dry run, pass --write to apply)"))
+    print(f"{'='*80}")
+    print(f"{'file':<70}{'urls':>8}{'rewritten':>11}{'unmapped':>10}")
+    for entry in result['files']:
+        if entry['urls']:
+            print(f"{entry['path']:<70.70}{entry['urls']:>8}{entry['rewritten']:>11}{entry['unmapped']:>10}")
+    print(f"\nFiles: {len(result['files'])}  Distinct URLs rewritten: {len(result['rewrites'])}  "
+          f"Distinct URLs unmapped: {len(result['unmapped'])}")
+    if result['unmapped_prefixes']:
+        print("\nUnmapped prefixes:")
+        for prefix, count in list(result['unmapped_prefixes'].items())[:limit]:
+            print(f"  {count:>6}  {prefix}")
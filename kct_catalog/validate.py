@@ -0,0 +1,191 @@
+"""
+Vectorized data-quality validation.
+
+Replaces the scattered check-*/verify-* SQL and JS that each needed a live
+database. Every dataset is loaded once into columnar NumPy arrays, and each
+rule is a handful of array operations returning a violation mask. Rules run
+on every dataset that has their columns:
+
+* generated: the rows the import generators produce (prices in dollars);
+* master_product_final, master_csv_2: the master exports (base_price in cents).
+
+Requires NumPy (`pip install numpy`).
+"""
+
+from typing import Dict, List, Optional
+
+from .inputs import MASTER_CSV_2_PRODUCTS, MASTER_PRODUCTS_CSV, CatalogInputs
+from .metrics import RunMetrics
+
+
+MASTER_DATASETS = {
+    'master_product_final': MASTER_PRODUCTS_CSV,
+    'master_csv_2': MASTER_CSV_2_PRODUCTS,
+}
+
+# Upper bounds of TIER_1..TIER_9 in attributes.get_price_tier; anything above is TIER_10
+TIER_BOUNDS = (75, 100, 125, 150, 200, 250, 300, 400, 500)
+TIER_NAMES = tuple(f'TIER_{n}' for n in range(1, len(TIER_BOUNDS) + 2))
+
+SAMPLE_SIZE = 10
+
+
+class ValidationError(RuntimeError):
+    pass
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ValidationError("The validate command needs NumPy: pip install numpy")
+    return numpy
+
+
+def to_columns(records: List[Dict], fields) -> Dict:
+    """Records -> {field: str array}; absent fields are skipped."""
+    np = _numpy()
+    present = [field for field in fields if records and field in records[0]]
+    return {field: np.array([str(record.get(field) if record.get(field) is not None else '')
+                             for record in records], dtype=str)
+            for field in present}
+
+
+def to_float(column):
+    """'$1,234.50' / '28999.0' / '' -> float array, NaN where unparseable."""
+    np = _numpy()
+    cleaned = np.char.strip(np.char.replace(np.char.replace(column, '$', ''), ',', ''))
+    cleaned = np.where(cleaned == '', 'nan', cleaned)
+    try:
+        return cleaned.astype(float)
+    except ValueError:
+        def parse(value):
+            try:
+                return float(value)
+            except ValueError:
+                return float('nan')
+        return np.array([parse(value) for value in cleaned], dtype=float)
+
+
+def _price_tier(columns: Dict):
+    np = _numpy()
+    price = to_float(columns['base_price'])
+    expected = np.array(TIER_NAMES)[np.searchsorted(np.array(TIER_BOUNDS, dtype=float), price, side='right')]
+    return np.isnan(price) | (expected != columns['price_tier'])
+
+
+def _cents_vs_usd(columns: Dict):
+    np = _numpy()
+    cents = to_float(columns['base_price'])
+    usd_cents = np.round(to_float(columns['price_usd']) * 100)
+    return np.isnan(cents) | np.isnan(usd_cents) | (np.round(cents) != usd_cents)
+
+
+def _gallery_count(columns: Dict):
+    np = _numpy()
+    # Exports join gallery URLs with ',' or ';'
+    urls = np.char.strip(columns['gallery_urls'], ',; ')
+    entries = np.where(urls == '', 0, np.char.count(urls, ',') + np.char.count(urls, ';') + 1)
+    counts = to_float(columns['gallery_count'])
+    return ~np.isnan(counts) & (counts != entries)
+
+
+def _empty_handle(columns: Dict):
+    np = _numpy()
+    return np.char.strip(columns['handle']) == ''
+
+
+def _duplicate_handle(columns: Dict):
+    np = _numpy()
+    handles = columns['handle']
+    _, inverse, counts = np.unique(handles, return_inverse=True, return_counts=True)
+    return (counts[inverse.ravel()] > 1) & (np.char.strip(handles) != '')
+
+
+def _compare_below_base(columns: Dict):
+    np = _numpy()
+    base = to_float(columns['base_price'])
+    compare = to_float(columns['compare_at_price'])
+    return ~np.isnan(compare) & (compare > 0) & (compare < base)
+
+
+RULES = [
+    {'name': 'price_tier', 'columns': ('base_price', 'price_tier'), 'check': _price_tier,
+     'description': 'price_tier disagrees with the tier of base_price'},
+    {'name': 'cents_vs_usd', 'columns': ('base_price', 'price_usd'), 'check': _cents_vs_usd,
+     'description': 'base_price (cents) does not match price_usd'},
+    {'name': 'gallery_count', 'columns': ('gallery_count', 'gallery_urls'), 'check': _gallery_count,
+     'description': 'gallery_count differs from the number of gallery_urls'},
+    {'name': 'empty_handle', 'columns': ('handle',), 'check': _empty_handle,
+     'description': 'handle is empty'},
+    {'name': 'duplicate_handle', 'columns': ('handle',), 'check': _duplicate_handle,
+     'description': 'handle appears more than once'},
+    {'name': 'compare_below_base', 'columns': ('base_price', 'compare_at_price'), 'check': _compare_below_base,
+     'description': 'compare_at_price is below base_price'},
+]
+
+FIELDS = sorted({column for rule in RULES for column in rule['columns']} | {'sku'})
+
+
+def load_datasets(inputs: CatalogInputs, rows: Optional[List[Dict]] = None) -> Dict[str, Dict]:
+    datasets = {}
+    if rows is not None:
+        datasets['generated'] = to_columns(rows, FIELDS)
+    for name, source in MASTER_DATASETS.items():
+        if inputs.path(source).exists():
+            datasets[name] = to_columns(inputs.csv(source), FIELDS)
+    return datasets
+
+
+def validate_columns(name: str, columns: Dict) -> List[Dict]:
+    np = _numpy()
+    results = []
+    if not columns:
+        return results
+    size = len(next(iter(columns.values())))
+    labels = columns.get('handle', columns.get('sku'))
+    for rule in RULES:
+        if not all(column in columns for column in rule['columns']):
+            continue
+        mask = rule['check'](columns)
+        violations = np.flatnonzero(mask)
+        results.append({
+            'dataset': name,
+            'rule': rule['name'],
+            'description': rule['description'],
+            'checked': size,
+            'violations': int(violations.size),
+            'sample': [str(labels[i]) if labels is not None and labels[i] else f'row {i}'
+                       for i in violations[:SAMPLE_SIZE].tolist()],
+        })
+    return results
+
+
+def validate(inputs: CatalogInputs, rows: Optional[List[Dict]] = None,
+             metrics: Optional[RunMetrics] = None) -> List[Dict]:
+    metrics = metrics or RunMetrics('validate', trace_memory=False)
+    with metrics.stage('columnar_loading'):
+        datasets = load_datasets(inputs, rows)
+    results = []
+    with metrics.stage('validation'):
+        for name, columns in datasets.items():
+            results.extend(validate_columns(name, columns))
+    metrics.incr('rows_validated', sum(len(next(iter(columns.values())))
+                                       for columns in datasets.values() if columns))
+    metrics.incr('violations', sum(result['violations'] for result in results))
+    return results
+
+
+def has_problems(results: List[Dict]) -> bool:
+    return any(result['violations'] for result in results)
+
+
+def print_validation(results: List[Dict]) -> None:
+    print(f"\n{'='*80}")
+    print("VALIDATION")
+    print(f"{'='*80}")
+    print(f"{'dataset':<24}{'rule':<22}{'checked':>9}{'violations':>12}")
+    for result in results:
+        print(f"{result['dataset']:<24}{result['rule']:<22}{result['checked']:>9}{result['violations']:>12}")
+        if result['sample']:
+            print(f"    {', '.join(result['sample'])}")
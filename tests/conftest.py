@@ -0,0 +1,15 @@
+from pathlib import Path
+
+import pytest
+
+from kct_catalog.generate import build_rows
+from kct_catalog.inputs import CatalogInputs
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(scope="session")
+def rows():
+    """Rows from the checked-in CDN manifests, with a fixed seed."""
+    return build_rows(CatalogInputs(ROOT), 'final', 2025)
@@ -0,0 +1,63 @@
+from kct_catalog.dedupe import (_HASH_PARAMS, find_clusters, minhash, normalize_handle, normalize_name, redirect_map,
+                                shingles, skip_duplicates)
+
+
+def row(handle):
+    return {'handle': handle, 'slug': handle, 'url_slug': handle}
+
+
+def test_duplicates_are_skipped_not_moved():
+    rows = [row('red-vest-tie-set'), row('red-vest-and-tie-set'), row('navy-suit')]
+    result = skip_duplicates(rows, {'red-vest-and-tie-set': 'red-vest-tie-set'})
+    assert [r['handle'] for r in result['rows']] == ['red-vest-tie-set', 'navy-suit']
+    assert result['skipped'] == [('red-vest-and-tie-set', 'red-vest-tie-set')]
+
+
+def test_duplicate_of_a_master_product_is_skipped():
+    result = skip_duplicates([row('blush-vest-and-tie-set')], {'blush-vest-and-tie-set': 'blush-vest-tie-set'})
+    assert result == {'rows': [], 'skipped': [('blush-vest-and-tie-set', 'blush-vest-tie-set')]}
+
+
+def test_repeated_handle_keeps_the_first_row():
+    rows = [dict(row('a'), name='first'), dict(row('a'), name='second')]
+    result = skip_duplicates(rows, {})
+    assert [r['name'] for r in result['rows']] == ['first']
+    assert result['skipped'] == [('a', 'a')]
+
+
+def test_skips_every_duplicate_of_a_real_cluster():
+    records = [{'source': 'generated', 'handle': handle, 'name': name, 'sku': '', 'category': 'Vests',
+                'name_key': '', 'name_norm': normalize_name(name), 'handle_norm': normalize_handle(handle),
+                'sku_norm': ''}
+               for handle, name in [('emerald-green-vest-tie-set', 'Emerald Green Vest & Tie Set'),
+                                    ('green-emerald-vest-and-tie-set', 'Green Emerald Vest and Tie Set')]]
+    redirects = redirect_map(find_clusters(records))
+    assert redirects == {'green-emerald-vest-and-tie-set': 'emerald-green-vest-tie-set'}
+    result = skip_duplicates([row(record['handle']) for record in records], redirects)
+    assert [r['handle'] for r in result['rows']] == ['emerald-green-vest-tie-set']
+
+
+def test_hash_parameters_are_independent():
+    assert len({a for a, _ in _HASH_PARAMS}) == len(_HASH_PARAMS)
+    assert all(abs(a - b) > 1000 for a, b in _HASH_PARAMS)
+
+
+def test_minhash_cache_does_not_change_signatures():
+    cache = {}
+    first = minhash(shingles('aqua vest and tie set'), cache)
+    second = minhash(shingles('aqua vest and bow tie set'), cache)
+    assert (first, second) == (minhash(shingles('aqua vest and tie set')),
+                               minhash(shingles('aqua vest and bow tie set')))
+    assert len(first) == 32
+
+
+def test_reordered_color_words_cluster():
+    records = [{'source': 'generated', 'handle': handle, 'name': name, 'sku': '', 'category': 'Vests',
+                'name_key': '', 'name_norm': normalize_name(name), 'handle_norm': normalize_handle(handle),
+                'sku_norm': ''}
+               for handle, name in [('emerald-green-vest-tie-set', 'Emerald Green Vest & Tie Set'),
+                                    ('green-emerald-vest-and-tie-set', 'Green Emerald Vest and Tie Set'),
+                                    ('rust-vest-tie-set', 'Rust Vest & Tie Set')]]
+    clusters = find_clusters(records)
+    assert [cluster['canonical'] for cluster in clusters] == ['emerald-green-vest-tie-set']
+    assert len(clusters[0]['members']) == 2
@@ -0,0 +1,57 @@
+from collections import Counter
+
+import pytest
+
+from kct_catalog.facets import (FACETS, apply_filters, build_bitmaps, build_facet_index, decode_bitmap,
+                                documents_in, facet_counts, facet_values, filter_with_counts, parse_filters)
+
+
+TAGS = {'black-strip-shawl-lapel': ['wedding', 'formal']}
+
+
+def brute_force_matches(rows, filters):
+    return [doc_id for doc_id, row in enumerate(rows)
+            if all(set(facet_values(row, TAGS.get(row['handle'], ()))[facet]) & set(values)
+                   for facet, values in filters.items())]
+
+
+def test_counts_match_a_brute_force_count(rows):
+    counts = facet_counts(build_bitmaps(rows, TAGS))
+    for facet in FACETS:
+        expected = Counter(value for row in rows for value in facet_values(row, TAGS.get(row['handle'], ()))[facet])
+        assert counts[facet] == dict(sorted(expected.items()))
+
+
+@pytest.mark.parametrize('expressions', [
+    ['category=Suits'],
+    ['category=Suits,Tuxedos', 'color_family=Black'],
+    ['price_tier=TIER_7', 'tag=wedding'],
+    ['category=Nothing'],
+])
+def test_filters_match_a_brute_force_scan(rows, expressions):
+    bitmaps = build_bitmaps(rows, TAGS)
+    filters = parse_filters(expressions)
+    assert documents_in(apply_filters(bitmaps, len(rows), filters)) == brute_force_matches(rows, filters)
+
+
+def test_disjunctive_counts_ignore_the_facets_own_filter(rows):
+    bitmaps = build_bitmaps(rows, TAGS)
+    filters = {'category': ['Suits'], 'color_family': ['Black']}
+    result = filter_with_counts(bitmaps, len(rows), filters)
+    color_counts = Counter(row['color_family'] for row in rows if row['category'] == 'Suits')
+    category_counts = Counter(row['category'] for row in rows if row['color_family'] == 'Black')
+    assert {value: n for value, n in result['counts']['color_family'].items() if n} == color_counts
+    assert {value: n for value, n in result['counts']['category'].items() if n} == category_counts
+
+
+def test_index_bitmaps_round_trip(rows):
+    bitmaps = build_bitmaps(rows)
+    index = build_facet_index(rows, bitmaps)
+    for facet, values in index['facets'].items():
+        for value, entry in values.items():
+            assert decode_bitmap(entry['bitmap']) == bitmaps[facet][value]
+
+
+def test_parse_filters_rejects_unknown_facets():
+    with pytest.raises(ValueError, match='Bad filter'):
+        parse_filters(['size=42R'])
@@ -0,0 +1,57 @@
+import json
+
+from kct_catalog.generate import GALLERY_LIMITS, attach_images, build_images_json
+from kct_catalog.image_match import build_handle_index, image_segments, match_images, rank_candidates
+from kct_catalog.inputs import CatalogInputs
+
+HANDLES = ['aqua-vest-and-tie-set', 'aqua-vest', 'navy-vest-and-tie-set',
+           'mens-prom-gold-blazer---prom--wedding-2025', 'black-suspender-bowtie-set']
+CDN = "https://cdn.kctmenswear.com"
+
+
+def test_image_segments_drop_batch_and_shot_words():
+    url = f"{CDN}/tie_clean_batch_01/vest-and-tie_aqua-vest-and-tie-set_1.0.jpg"
+    assert image_segments(url) == ['tie', 'vest and tie', 'aqua vest and tie set']
+
+
+def test_right_handle_ranks_first():
+    index = build_handle_index(HANDLES)
+    ranked = rank_candidates(index, f"{CDN}/tie_clean_batch_01/vest-and-tie_aqua-vest-and-tie-set_1.0.jpg")
+    assert ranked[0] == {'handle': 'aqua-vest-and-tie-set', 'score': 1.0}
+    assert ranked[1]['handle'] in ('aqua-vest', 'navy-vest-and-tie-set') and ranked[1]['score'] < 1.0
+    assert rank_candidates(index, f"{CDN}/blazers/prom/gold-blazer/main.webp")[0]['handle'] == (
+        'mens-prom-gold-blazer---prom--wedding-2025')
+
+
+def test_orphans_are_matched_or_reported_ambiguous(tmp_path):
+    (tmp_path / "ALL_PRODUCT_IMAGES_CDN_URLS.txt").write_text("\n".join([
+        f"{CDN}/vests/navy-vest-and-tie-set/front.webp",
+        f"{CDN}/vests/aqua-vest/main.webp",
+        f"{CDN}/vests/aqua/main.webp",
+        f"{CDN}/vests/linked.webp",
+        f"{CDN}/zzz/qqq.webp",
+    ]) + "\n")
+    rows = [{'handle': handle, 'name': handle, 'hero_image': '', 'gallery_images': []}
+            for handle in ('navy-vest-and-tie-set', 'aqua-vest', 'aqua-vest-and-tie-set')]
+    rows[0]['hero_image'] = f"{CDN}/vests/linked.webp"
+    result = match_images(CatalogInputs(tmp_path), rows)
+
+    assert result['orphans'] == 4
+    assert result['by_handle'] == {'aqua-vest': [f"{CDN}/vests/aqua-vest/main.webp"],
+                                   'navy-vest-and-tie-set': [f"{CDN}/vests/navy-vest-and-tie-set/front.webp"]}
+    assert [entry['image'] for entry in result['ambiguous']] == [f"{CDN}/vests/aqua/main.webp"]
+    assert result['unmatched'] == [f"{CDN}/zzz/qqq.webp"]
+
+
+def test_attach_images_counts_only_published_images():
+    source = 'fall_2025'
+    limit = GALLERY_LIMITS[source]
+    gallery = [f"{CDN}/g{i}.webp" for i in range(limit - 1)]
+    row = {'handle': 'navy-suit', 'source': source, 'hero_image': '', 'gallery_images': gallery,
+           'images': build_images_json('', gallery, limit)}
+    extra = [f"{CDN}/x{i}.webp" for i in range(4)]
+    # One becomes the hero, one fills the gallery, two are past the limit
+    assert attach_images([row], {'navy-suit': extra + gallery[:1]}) == 2
+    images = json.loads(row['images'])
+    assert images['hero']['url'] == extra[0] and len(images['gallery']) == limit
+    assert row['gallery_images'][-3:] == extra[1:]
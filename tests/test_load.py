@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from kct_catalog import load
+from kct_catalog.load import Checkpoint, LoadError, load_rows
+
+
+class FakePool:
+    """Stands in for ConnectionPool; the fake loader never touches the connection."""
+
+    def __init__(self, dsn, size):
+        self.closed = False
+
+    def acquire(self):
+        return object()
+
+    def release(self, connection):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    """Handles of every chunk the fake loader committed; a handle in `fail`
+    makes its chunk raise like a failed transaction."""
+    calls = {'chunks': [], 'fail': set()}
+
+    def load_chunk(connection, table, chunk):
+        if calls['fail'] & {row['handle'] for row in chunk}:
+            raise psycopg.OperationalError("connection lost")
+        calls['chunks'].append([row['handle'] for row in chunk])
+
+    monkeypatch.setattr(load, 'ConnectionPool', FakePool)
+    monkeypatch.setitem(load.LOADERS, 'copy', load_chunk)
+    return calls
+
+
+def make_rows(count):
+    return [{'handle': f"product-{i:02d}"} for i in range(count)]
+
+
+def test_loads_every_chunk_and_checkpoints(loaded, tmp_path):
+    rows = make_rows(10)
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.json'), {'completed': []})
+    report = load_rows(rows, 'postgresql://test', checkpoint, chunk_size=4, pool_size=1)
+
+    assert report['chunks'] == 3 and report['chunks_loaded'] == 3 and report['rows_loaded'] == 10
+    assert [len(chunk) for chunk in loaded['chunks']] == [4, 4, 2]
+    saved = json.loads((tmp_path / 'checkpoint.json').read_text())
+    assert saved['completed'] == [0, 1, 2]
+
+
+def test_failed_chunk_keeps_earlier_ones_and_resume_skips_them(loaded, tmp_path):
+    rows = make_rows(10)
+    path = str(tmp_path / 'checkpoint.json')
+    loaded['fail'] = {'product-05'}
+    with pytest.raises(LoadError, match='chunk 2/3'):
+        load_rows(rows, 'postgresql://test', Checkpoint(path, {'completed': []}), chunk_size=4, pool_size=1)
+    checkpoint = Checkpoint.load(path)
+    # Chunk 3 may already have been picked up by the worker when chunk 2 failed
+    assert 0 in checkpoint.completed and 1 not in checkpoint.completed
+    committed = len(checkpoint.completed)
+
+    loaded['fail'] = set()
+    loaded['chunks'] = []
+    report = load_rows(rows, 'postgresql://test', checkpoint, chunk_size=4, pool_size=1)
+    assert report['chunks_skipped'] == committed and report['chunks_loaded'] == 3 - committed
+    assert loaded['chunks'][0] == [f"product-{i:02d}" for i in range(4, 8)]
+    assert Checkpoint.load(path).completed == {0, 1, 2}
+
+
+def test_checkpoint_matches_its_target(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / 'checkpoint.json'), {'target': 'a', 'chunk_size': 500})
+    assert checkpoint.matches(target='a', chunk_size=500)
+    assert not checkpoint.matches(target='a', chunk_size=250)
+
+
+def test_corrupt_checkpoint_names_the_file(tmp_path):
+    path = tmp_path / 'checkpoint.json'
+    path.write_text('{"completed": [0,')
+    with pytest.raises(LoadError, match='checkpoint.json is not a valid checkpoint'):
+        Checkpoint.load(str(path))
@@ -0,0 +1,87 @@
+"""Loader tests against a real Postgres; set KCT_TEST_DSN to run them, e.g.
+KCT_TEST_DSN=postgresql://postgres@localhost/postgres python -m pytest tests/test_load_postgres.py"""
+
+import json
+import os
+import uuid
+
+import pytest
+
+psycopg = pytest.importorskip("psycopg")
+
+from kct_catalog.load import Checkpoint, LoadError, load_rows
+
+
+DSN = os.environ.get("KCT_TEST_DSN")
+pytestmark = pytest.mark.skipif(not DSN, reason="set KCT_TEST_DSN to a scratch Postgres database")
+
+# The products_enhanced columns the loader writes, with the live column types
+TABLE_DDL = """
+CREATE TABLE {table} (
+    id UUID PRIMARY KEY, name VARCHAR(255) NOT NULL, sku VARCHAR(100) UNIQUE NOT NULL,
+    handle VARCHAR(255) UNIQUE NOT NULL, slug TEXT, style_code VARCHAR(50), season VARCHAR(50),
+    collection VARCHAR(100), category VARCHAR(100) NOT NULL, subcategory VARCHAR(100),
+    price_tier VARCHAR(50) NOT NULL, base_price NUMERIC NOT NULL, compare_at_price NUMERIC,
+    color_name VARCHAR(100), color_family VARCHAR(50), materials JSONB, fit_type VARCHAR(50),
+    images JSONB NOT NULL, description TEXT, status VARCHAR(20), meta_title TEXT,
+    meta_description TEXT, meta_keywords TEXT[], og_title TEXT, og_description TEXT,
+    search_terms TEXT, url_slug TEXT, is_indexable BOOLEAN, sitemap_priority NUMERIC,
+    created_at TIMESTAMPTZ, updated_at TIMESTAMPTZ
+)
+"""
+
+
+@pytest.fixture
+def table():
+    name = f"kct_test_products_{uuid.uuid4().hex[:12]}"
+    with psycopg.connect(DSN, autocommit=True) as connection:
+        connection.execute(TABLE_DDL.format(table=name))
+    yield name
+    with psycopg.connect(DSN, autocommit=True) as connection:
+        connection.execute(f"DROP TABLE IF EXISTS {name}")
+
+
+def query(sql, *params):
+    with psycopg.connect(DSN) as connection:
+        return connection.execute(sql, params).fetchall()
+
+
+def new_checkpoint(tmp_path, name='checkpoint.json'):
+    return Checkpoint(str(tmp_path / name), {'completed': []})
+
+
+@pytest.mark.parametrize('method', ['copy', 'execute'])
+def test_loads_and_upserts_rows(rows, table, tmp_path, method):
+    report = load_rows(rows, DSN, new_checkpoint(tmp_path), chunk_size=40, pool_size=2,
+                       method=method, table=table)
+    assert report['rows_loaded'] == len(rows) and report['chunks'] == 3
+    first = rows[0]
+    assert query(f"SELECT name, base_price::float, images, meta_keywords, is_indexable "
+                 f"FROM {table} WHERE handle = %s", first['handle']) == [
+        (first['name'], first['base_price'], json.loads(first['images']), first['meta_keywords'],
+         first['is_indexable'])]
+
+    repriced = [dict(row, base_price=row['base_price'] + 10) for row in rows]
+    load_rows(repriced, DSN, new_checkpoint(tmp_path, 'second.json'), chunk_size=40, pool_size=2,
+              method=method, table=table)
+    assert query(f"SELECT count(*) FROM {table}") == [(len(rows),)]
+    assert query(f"SELECT base_price::float FROM {table} WHERE handle = %s", first['handle']) == [
+        (first['base_price'] + 10,)]
+
+
+@pytest.mark.parametrize('method', ['copy', 'execute'])
+def test_failed_chunk_is_rolled_back_and_resumed(rows, table, tmp_path, method):
+    broken = [dict(row, name=None) if index == 50 else row for index, row in enumerate(rows)]
+    path = tmp_path / 'checkpoint.json'
+    with pytest.raises(LoadError, match='chunk 2/3 failed'):
+        load_rows(broken, DSN, Checkpoint(str(path), {'completed': []}), chunk_size=40, pool_size=1,
+                  method=method, table=table)
+    checkpoint = Checkpoint.load(str(path))
+    assert 1 not in checkpoint.completed
+    committed = sum(min(40, len(rows) - index * 40) for index in checkpoint.completed)
+    assert query(f"SELECT count(*) FROM {table}") == [(committed,)]
+
+    skipped = len(checkpoint.completed)
+    report = load_rows(rows, DSN, checkpoint, chunk_size=40, pool_size=1, method=method, table=table)
+    assert report['chunks_skipped'] == skipped and report['chunks_loaded'] == 3 - skipped
+    assert query(f"SELECT count(*) FROM {table}") == [(len(rows),)]
@@ -0,0 +1,28 @@
+import json
+
+from kct_catalog.metrics import RunMetrics
+
+
+def _run(metrics_dir, status):
+    metrics = RunMetrics('build').start()
+    metrics.incr('products', 3)
+    metrics.finish(status).write(str(metrics_dir))
+    return json.loads((metrics_dir / "build.json").read_text())
+
+
+def test_failed_run_keeps_previous_success(tmp_path):
+    ok = _run(tmp_path, 0)
+    assert ok['status'] == 0 and ok['last_success_at'] == ok['finished_at']
+
+    failed = _run(tmp_path, 2)
+    assert failed['status'] == 2
+    assert failed['last_success_at'] == ok['last_success_at']
+    assert failed['finished_at'] != failed['last_success_at']
+    prom = (tmp_path / "build.prom").read_text()
+    assert 'kct_catalog_run_exit_status{run="build"} 2' in prom
+    assert 'kct_catalog_run_last_success_timestamp_seconds{run="build"}' in prom
+
+
+def test_failed_first_run_has_no_success(tmp_path):
+    report = _run(tmp_path, 1)
+    assert report['status'] == 1 and report['last_success_at'] is None
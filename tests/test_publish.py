@@ -0,0 +1,43 @@
+from kct_catalog.publish import PublishState
+
+
+def publish(output_dir, files):
+    state = PublishState(str(output_dir))
+    for relative, content in files.items():
+        state.write(relative, content)
+    return state.finish()
+
+
+def test_unchanged_files_are_not_rewritten(tmp_path):
+    files = {'a.json': b'{"a": 1}', 'sub/b.json': b'{"b": 2}'}
+    assert publish(tmp_path, files)['written'] == ['a.json', 'sub/b.json']
+    mtime = (tmp_path / 'a.json').stat().st_mtime_ns
+
+    result = publish(tmp_path, files)
+    assert result == {'written': [], 'unchanged': ['a.json', 'sub/b.json'], 'removed': []}
+    assert (tmp_path / 'a.json').stat().st_mtime_ns == mtime
+    assert (tmp_path / 'changed.txt').read_text() == ''
+
+
+def test_changed_and_dropped_files(tmp_path):
+    publish(tmp_path, {'a.json': b'1', 'b.json': b'2'})
+    result = publish(tmp_path, {'a.json': b'changed'})
+    assert result == {'written': ['a.json'], 'unchanged': [], 'removed': ['b.json']}
+    assert (tmp_path / 'a.json').read_bytes() == b'changed'
+    assert not (tmp_path / 'b.json').exists()
+    assert (tmp_path / 'changed.txt').read_text() == 'a.json\n'
+
+
+def test_deleted_file_is_written_again(tmp_path):
+    publish(tmp_path, {'a.json': b'1'})
+    (tmp_path / 'a.json').unlink()
+    assert publish(tmp_path, {'a.json': b'1'})['written'] == ['a.json']
+
+
+def test_streamed_tmp_file_with_same_digest_is_discarded(tmp_path):
+    publish(tmp_path, {'a.json': b'1'})
+    state = PublishState(str(tmp_path))
+    tmp_file = state.tmp_path('a.json')
+    tmp_file.write_bytes(b'1')
+    assert state.replace('a.json', tmp_file, state.previous['a.json']) is False
+    assert not tmp_file.exists()
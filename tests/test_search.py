@@ -0,0 +1,51 @@
+from kct_catalog.search import build_document, build_documents, build_inverted_index, prefix_range, search, tokenize
+
+
+def product(handle, name, category='Suits', color='Navy', **extra):
+    return dict({'handle': handle, 'name': name, 'category': category, 'subcategory': 'Classic',
+                 'color_name': color, 'color_family': color, 'collection': 'Fall 2025 Collection',
+                 'season': 'Fall 2025', 'fit_type': 'Slim Fit', 'base_price': 299.99, 'hero_image': ''},
+                **extra)
+
+
+def index_of(rows):
+    return build_inverted_index(rows, build_documents(rows))
+
+
+def test_tokenize_normalizes_and_drops_stopwords():
+    assert tokenize("Café Vest & Tie Set with the Bow-Tie") == ['cafe', 'vest', 'tie', 'set', 'bow']
+
+
+def test_token_keeps_only_its_highest_weight():
+    weights = build_document(product('navy-suit', 'Navy Suit'))['weights']
+    assert weights['A'] == ['navy', 'suit']
+    assert 'navy' not in weights['B'] and 'suits' in weights['B']
+
+
+def test_prefix_range_is_the_run_of_matching_terms():
+    terms = ['blazer', 'blue', 'blush', 'bow', 'navy']
+    assert [terms[i] for i in prefix_range(terms, 'bl')] == ['blazer', 'blue', 'blush']
+    assert list(prefix_range(terms, 'z')) == []
+
+
+def test_prefix_search_ranks_name_matches_first():
+    rows = [product('burgundy-blazer', 'Burgundy Blazer', category='Blazers', color='Burgundy'),
+            product('navy-suit', 'Navy Suit', color='Navy'),
+            product('blue-vest', 'Blue Vest', category='Vests', color='Navy')]
+    index = index_of(rows)
+    assert [hit['handle'] for hit in search(index, 'bl')] == ['burgundy-blazer', 'blue-vest']
+    assert [hit['handle'] for hit in search(index, 'nav')] == ['navy-suit', 'blue-vest']
+    assert search(index, 'navy vest')[0]['handle'] == 'blue-vest'
+    assert search(index, 'navy tuxedo') == []
+
+
+def test_search_matches_a_brute_force_scan(rows):
+    index = index_of(rows)
+    documents = build_documents(rows)
+    for query in ('su', 'black', 'blue ve', 'double'):
+        tokens = tokenize(query)
+        expected = {document['handle'] for document in documents
+                    if all(any(term.startswith(token) for tokens_ in document['weights'].values()
+                               for term in tokens_) for token in tokens)}
+        assert expected
+        assert {hit['handle'] for hit in search(index, query, limit=len(rows))} == expected
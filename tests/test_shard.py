@@ -0,0 +1,66 @@
+import pytest
+
+from kct_catalog.shard import ShardError, hash_shard, partition_rows, verify_shards, write_shards
+
+
+def test_category_partition_keeps_every_row_in_order(rows):
+    shards = partition_rows(rows, 'category')
+    assert [shard['index'] for shard in shards] == list(range(len(shards)))
+    assert len({shard['key'] for shard in shards}) == len(shards)
+    for shard in shards:
+        assert {row['category_slug'] for row in shard['rows']} == {shard['key']}
+    flattened = [row['handle'] for shard in shards for row in shard['rows']]
+    assert sorted(flattened) == sorted(row['handle'] for row in rows)
+
+
+def test_hash_partition_is_stable(rows):
+    shards = partition_rows(rows, 'hash', 8)
+    assert [shard['key'] for shard in shards] == [f"hash-{i}" for i in range(8)]
+    for shard in shards:
+        assert all(hash_shard(row['handle'], 8) == shard['index'] for row in shard['rows'])
+    assert sum(len(shard['rows']) for shard in shards) == len(rows)
+    assert partition_rows(rows, 'hash', 8) == shards
+
+
+def test_hash_shard_rejects_zero_shards():
+    with pytest.raises(ShardError):
+        hash_shard('black-suit', 0)
+
+
+def test_verify_passes_then_catches_edits(rows, tmp_path):
+    manifest = write_shards(rows, str(tmp_path), partition='hash', shard_count=4, jobs=1, seed=2025)
+    assert manifest['total_rows'] == len(rows)
+    assert sum(entry['rows'] for entry in manifest['shards']) == len(rows)
+    assert verify_shards(str(tmp_path)) == []
+
+    edited = tmp_path / manifest['shards'][1]['file']
+    edited.write_text(edited.read_text().replace('COMMIT;', '-- COMMIT;'))
+    (tmp_path / manifest['shards'][2]['file']).unlink()
+    problems = {entry['index']: entry['problem'] for entry in verify_shards(str(tmp_path))}
+    assert problems == {1: 'checksum mismatch', 2: 'missing'}
+
+
+def test_only_rewrites_a_shard_identically(rows, tmp_path):
+    manifest = write_shards(rows, str(tmp_path), partition='hash', shard_count=4, jobs=1, seed=2025)
+    target = tmp_path / manifest['shards'][3]['file']
+    target.write_text('-- damaged\n')
+    assert write_shards(rows, str(tmp_path), partition='hash', shard_count=4, only=[3], seed=2025) == manifest
+    assert verify_shards(str(tmp_path)) == []
+
+
+def test_only_rejects_a_different_layout(rows, tmp_path):
+    write_shards(rows, str(tmp_path), partition='hash', shard_count=4, jobs=1, seed=2025)
+    with pytest.raises(ShardError, match='shard_count'):
+        write_shards(rows, str(tmp_path), partition='hash', shard_count=8, only=[0], seed=2025)
+    with pytest.raises(ShardError, match='no shard 9'):
+        write_shards(rows, str(tmp_path), partition='hash', shard_count=4, only=[9], seed=2025)
+
+
+def test_only_needs_a_manifest(rows, tmp_path):
+    with pytest.raises(ShardError, match='existing manifest'):
+        write_shards(rows, str(tmp_path), only=[0], seed=2025)
+
+
+def test_verify_needs_a_manifest(tmp_path):
+    with pytest.raises(ShardError, match='no manifest.json'):
+        verify_shards(str(tmp_path))
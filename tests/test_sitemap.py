@@ -0,0 +1,37 @@
+import gzip
+import json
+
+from kct_catalog.sitemap import write_sitemaps
+
+
+def _indexable(rows):
+    return [row for row in rows if row.get('is_indexable') and row['status'] == 'active']
+
+
+def test_shards_split_at_max_urls_and_are_indexed(tmp_path, rows):
+    expected = len(_indexable(rows))
+    assert expected > 20
+    result = write_sitemaps(rows, str(tmp_path), max_urls=20, today='2025-09-01')
+
+    shard_count = -(-expected // 20)
+    assert result['sitemap_shards'] == [f"sitemap-products-{i}.xml.gz" for i in range(1, shard_count + 1)]
+    assert len(result['feed_shards']) == shard_count
+    counts = [gzip.decompress((tmp_path / shard).read_bytes()).count(b'<url>')
+              for shard in result['sitemap_shards']]
+    assert max(counts) == 20 and sum(counts) == expected
+
+    index = (tmp_path / "sitemap.xml").read_text()
+    assert index.count('<sitemap>') == shard_count
+    assert '<lastmod>2025-09-01</lastmod>' in index
+    feed_index = json.loads((tmp_path / "feed-index.json").read_text())
+    assert [feed['file'] for feed in feed_index['feeds']] == result['feed_shards']
+    assert feed_index['items'] == sum(feed['entries'] for feed in feed_index['feeds']) == expected
+
+
+def test_unchanged_rerun_writes_nothing(tmp_path, rows):
+    first = write_sitemaps(rows, str(tmp_path), max_urls=20, today='2025-09-01')
+    assert len(first['products_changed']) == len(_indexable(rows))
+
+    second = write_sitemaps(rows, str(tmp_path), max_urls=20, today='2025-09-02')
+    assert second['written'] == [] and second['products_changed'] == []
+    assert '<lastmod>2025-09-01</lastmod>' in (tmp_path / "sitemap.xml").read_text()
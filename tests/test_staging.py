@@ -0,0 +1,49 @@
+from kct_catalog.inputs import CatalogInputs
+from kct_catalog.staging import connect, refresh
+
+URLS = "fall_2025_all_cdn_urls.txt"
+TAGS = "kct_master_exports/product_tags_import.csv"
+
+
+def statuses(results):
+    return {result['source']: result['status'] for result in results if result['status'] != 'missing'}
+
+
+def count(connection, table, source):
+    return connection.execute(f"SELECT count(*) FROM {table} WHERE source = ?", (source,)).fetchone()[0]
+
+
+def test_refresh_loads_skips_reloads_and_drops(tmp_path):
+    (tmp_path / URLS).write_text("# header\nhttps://cdn.kctmenswear.com/a.webp\nhttps://cdn.kctmenswear.com/b.webp\n")
+    (tmp_path / "kct_master_exports").mkdir()
+    (tmp_path / TAGS).write_text("product_id,tag\np1,navy\np1,wool\np2,vest\n")
+    connection = connect(str(tmp_path / "staging.sqlite"))
+
+    assert statuses(refresh(connection, CatalogInputs(tmp_path))) == {URLS: 'loaded', TAGS: 'loaded'}
+    assert count(connection, 'url_lists', URLS) == 2
+    assert [row['tag'] for row in connection.execute(
+        "SELECT tag FROM product_tags WHERE product_id = 'p1' ORDER BY tag")] == ['navy', 'wool']
+
+    assert statuses(refresh(connection, CatalogInputs(tmp_path))) == {URLS: 'unchanged', TAGS: 'unchanged'}
+
+    (tmp_path / URLS).write_text("https://cdn.kctmenswear.com/c.webp\n")
+    assert statuses(refresh(connection, CatalogInputs(tmp_path)))[URLS] == 'reloaded'
+    assert [row["image_url"] for row in connection.execute("SELECT image_url FROM url_lists")] == [
+        "https://cdn.kctmenswear.com/c.webp"]
+
+    (tmp_path / TAGS).unlink()
+    results = refresh(connection, CatalogInputs(tmp_path))
+    assert statuses(results)[TAGS] == 'removed'
+    assert count(connection, 'product_tags', TAGS) == 0
+    assert connection.execute("SELECT count(*) FROM sources WHERE source = ?", (TAGS,)).fetchone()[0] == 0
+    assert statuses(refresh(connection, CatalogInputs(tmp_path))) == {URLS: 'unchanged'}
+
+
+def test_refresh_drops_sources_no_longer_configured(tmp_path):
+    connection = connect(str(tmp_path / "staging.sqlite"))
+    with connection:
+        connection.execute("INSERT INTO sources VALUES ('old_urls.txt', 'urls', 1, 1, 'x', 1, 0)")
+        connection.execute("INSERT INTO url_lists VALUES ('old_urls.txt', 'https://cdn.kctmenswear.com/old.webp')")
+    results = refresh(connection, CatalogInputs(tmp_path))
+    assert {'source': 'old_urls.txt', 'status': 'removed', 'rows': 0} in results
+    assert count(connection, 'url_lists', 'old_urls.txt') == 0
@@ -0,0 +1,67 @@
+import csv
+
+from kct_catalog.inputs import MASTER_PRODUCTS_CSV, PRODUCT_VARIANTS_CSV, CatalogInputs
+from kct_catalog.stripe_coverage import check_coverage, has_problems, usd_to_cents
+
+PRODUCTS = [
+    {'product_id': 'p1', 'handle': 'navy-suit', 'sku': 'SUIT-NAVY', 'base_price': '29999'},
+    {'product_id': 'p2', 'handle': 'red-vest', 'sku': 'VEST-RED', 'base_price': '4999'},
+]
+VARIANTS = [
+    {'product_id': 'p1', 'sku': 'SUIT-NAVY', 'variant_title': '40R', 'variant_sku': 'SUIT-NAVY-40R',
+     'price_cents': '29999', 'price_usd': '$299.99', 'stripe_price_id': 'price_suit', 'stripe_active': 'True'},
+    {'product_id': 'p2', 'sku': 'VEST-RED', 'variant_title': 'M', 'variant_sku': 'VEST-RED-M',
+     'price_cents': '4999', 'price_usd': '$49.99', 'stripe_price_id': '', 'stripe_active': ''},
+]
+
+
+def write_csv(path, records):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(records[0]))
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def coverage(tmp_path, variants=VARIANTS, rows=None):
+    write_csv(tmp_path / MASTER_PRODUCTS_CSV, PRODUCTS)
+    write_csv(tmp_path / PRODUCT_VARIANTS_CSV, variants)
+    return check_coverage(CatalogInputs(tmp_path), rows)
+
+
+def test_usd_to_cents():
+    assert usd_to_cents('$1,289.99') == 128999
+    assert usd_to_cents(49.99) == 4999
+    assert usd_to_cents('n/a') is None
+
+
+def test_missing_price_is_reported(tmp_path):
+    report = coverage(tmp_path)
+    assert has_problems(report)
+    assert [(issue['product_id'], issue['line']) for issue in report['issues']['missing_price']] == [('p2', 3)]
+    assert [issue['handle'] for issue in report['issues']['uncovered_product']] == ['red-vest']
+    assert report['issues']['cents_mismatch'] == []
+
+
+def test_fully_priced_catalog_is_clean(tmp_path):
+    variants = [VARIANTS[0], dict(VARIANTS[1], stripe_price_id='price_vest', stripe_active='True')]
+    rows = [{'handle': 'navy-suit', 'sku': 'X', 'base_price': 299.99}]
+    report = coverage(tmp_path, variants, rows)
+    assert not has_problems(report)
+    assert (report['products'], report['variants'], report['price_ids']) == (2, 2, 2)
+
+
+def test_generated_price_off_stripe_is_reported(tmp_path):
+    rows = [{'handle': 'navy-suit', 'sku': 'X', 'base_price': 279.99},
+            {'handle': 'unknown', 'sku': 'VEST-RED', 'base_price': 49.99}]
+    issues = coverage(tmp_path, rows=rows)['issues']
+    assert [(issue['handle'], issue['stripe_cents']) for issue in issues['generated_price_mismatch']] == [
+        ('navy-suit', [29999])]
+    assert [(issue['handle'], issue['product_id']) for issue in issues['generated_unpriced']] == [('unknown', 'p2')]
+
+
+def test_same_price_id_with_two_amounts_is_reported(tmp_path):
+    variants = [VARIANTS[0], dict(VARIANTS[1], stripe_price_id='price_suit', stripe_active='True')]
+    issues = coverage(tmp_path, variants)['issues']
+    assert [(issue['price_id'], issue['amounts']) for issue in issues['duplicate_price_id']] == [
+        ('price_suit', [4999, 29999])]
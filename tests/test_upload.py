@@ -0,0 +1,52 @@
+import hashlib
+
+import pytest
+
+from kct_catalog.upload import UploadError, remote_etag, s3_etag
+
+
+def write(tmp_path, size):
+    path = tmp_path / "image.webp"
+    path.write_bytes(bytes(i % 251 for i in range(size)))
+    return path
+
+
+def test_single_part_etag_is_the_md5(tmp_path):
+    path = write(tmp_path, 1000)
+    assert s3_etag(path, 1000, threshold=1024, part_size=256) == hashlib.md5(path.read_bytes()).hexdigest()
+
+
+def test_multipart_etag_is_the_md5_of_part_md5s(tmp_path):
+    path = write(tmp_path, 1000)
+    data = path.read_bytes()
+    parts = [hashlib.md5(data[start:start + 256]).digest() for start in range(0, 1000, 256)]
+    expected = f"{hashlib.md5(b''.join(parts)).hexdigest()}-4"
+    assert s3_etag(path, 1000, threshold=512, part_size=256) == expected
+
+
+def test_multipart_etag_with_exact_parts(tmp_path):
+    path = write(tmp_path, 512)
+    data = path.read_bytes()
+    parts = hashlib.md5(data[:256]).digest() + hashlib.md5(data[256:]).digest()
+    assert s3_etag(path, 512, threshold=512, part_size=256) == f"{hashlib.md5(parts).hexdigest()}-2"
+
+
+def test_remote_etag_turns_connection_errors_into_upload_error():
+    exceptions = pytest.importorskip("botocore.exceptions")
+
+    class UnreachableClient:
+        def head_object(self, Bucket, Key):
+            raise exceptions.EndpointConnectionError(endpoint_url=f"http://127.0.0.1:9/{Bucket}/{Key}")
+
+    with pytest.raises(UploadError, match='HEAD images/a.webp failed'):
+        remote_etag(UnreachableClient(), 'catalog', 'images/a.webp')
+
+
+def test_remote_etag_treats_404_as_missing():
+    exceptions = pytest.importorskip("botocore.exceptions")
+
+    class EmptyBucket:
+        def head_object(self, Bucket, Key):
+            raise exceptions.ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+
+    assert remote_etag(EmptyBucket(), 'catalog', 'images/a.webp') is None
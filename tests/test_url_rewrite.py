@@ -0,0 +1,56 @@
+from collections import Counter
+
+import pytest
+
+from kct_catalog.url_rewrite import PrefixTrie, RewriteError, load_mapping, rewrite_file
+
+
+LEGACY = "https://pub-8ea0502158a94b8ca8a7abb9e18a57e8.r2.dev"
+
+
+@pytest.fixture
+def trie():
+    trie = PrefixTrie()
+    trie.insert(f"{LEGACY}/batch_1/", "https://cdn.kctmenswear.com/batch-1/")
+    trie.insert(f"{LEGACY}/batch_1/vests/", "https://cdn.kctmenswear.com/vests/")
+    trie.insert(f"{LEGACY}/summer-blazer", "https://cdn.kctmenswear.com/blazers/summer")
+    return trie
+
+
+def test_longest_prefix_wins(trie):
+    assert trie.rewrite(f"{LEGACY}/batch_1/suit.webp") == "https://cdn.kctmenswear.com/batch-1/suit.webp"
+    assert trie.rewrite(f"{LEGACY}/batch_1/vests/red.webp") == "https://cdn.kctmenswear.com/vests/red.webp"
+
+
+def test_prefixes_match_whole_segments(trie):
+    assert trie.rewrite(f"{LEGACY}/batch_10/suit.webp") is None
+    assert trie.rewrite(f"{LEGACY}/summer-blazers/a.webp") is None
+    assert trie.rewrite(f"{LEGACY}/summer-blazer") == "https://cdn.kctmenswear.com/blazers/summer"
+
+
+def test_insert_counts_distinct_prefixes(trie):
+    trie.insert(f"{LEGACY}/batch_1", "https://cdn.kctmenswear.com/other/")
+    assert trie.size == 3
+    assert trie.rewrite(f"{LEGACY}/batch_1/a.webp") == "https://cdn.kctmenswear.com/other/a.webp"
+
+
+def test_rewrite_file_leaves_everything_else_alone(trie, tmp_path):
+    path = tmp_path / "gallery.csv"
+    path.write_bytes(f'handle,gallery_urls\r\nred,"{LEGACY}/batch_1/a.webp,{LEGACY}/batch_2/b.webp"\r\n'.encode())
+    unmapped = Counter()
+    counts = rewrite_file(path, trie, {}, unmapped, write=True)
+    assert counts == {'urls': 2, 'rewritten': 1, 'unmapped': 1}
+    assert path.read_bytes().decode() == (f'handle,gallery_urls\r\n'
+                                          f'red,"https://cdn.kctmenswear.com/batch-1/a.webp,'
+                                          f'{LEGACY}/batch_2/b.webp"\r\n')
+    assert unmapped == Counter({f"{LEGACY}/batch_2/b.webp": 1})
+
+
+def test_load_mapping_rejects_bad_files(tmp_path):
+    mapping = tmp_path / "mapping.csv"
+    mapping.write_text("old,new\n")
+    with pytest.raises(RewriteError, match='old_prefix,new_prefix'):
+        load_mapping(mapping)
+    mapping.write_text(f"old_prefix,new_prefix\n{LEGACY}/a b/,https://cdn.kctmenswear.com/a/\n")
+    with pytest.raises(RewriteError, match='not a plain URL prefix'):
+        load_mapping(mapping)
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from kct_catalog.attributes import get_price_tier
+from kct_catalog.validate import FIELDS, to_columns, to_float, validate_columns
+
+
+def violations(records):
+    results = validate_columns('test', to_columns(records, FIELDS))
+    return {result['rule']: result['sample'] for result in results if result['violations']}
+
+
+def product(handle, base_price, price_tier, **extra):
+    return dict({'handle': handle, 'sku': handle.upper(), 'base_price': base_price, 'price_tier': price_tier,
+                 'compare_at_price': '', 'gallery_urls': '', 'gallery_count': ''}, **extra)
+
+
+def test_to_float_parses_prices():
+    assert to_float(to_columns([{'p': '$1,234.50'}, {'p': '28999.0'}, {'p': 'n/a'}], ['p'])['p'])[:2].tolist() == [
+        1234.5, 28999.0]
+
+
+def test_each_rule_flags_only_the_bad_row():
+    records = [
+        product('navy-suit', 299.99, 'TIER_7', compare_at_price=399.99,
+                gallery_urls='https://cdn/a.webp;https://cdn/b.webp', gallery_count='2'),
+        product('red-vest', 49.99, 'TIER_3'),
+        product('grey-suit', 299.99, 'TIER_7', compare_at_price=199.99),
+        product('black-tux', 450, 'TIER_9', gallery_urls='https://cdn/a.webp', gallery_count='3'),
+        product('black-tux', 450, 'TIER_9'),
+        product('', 74.99, 'TIER_1'),
+    ]
+    assert violations(records) == {
+        'price_tier': ['red-vest'],
+        'compare_below_base': ['grey-suit'],
+        'gallery_count': ['black-tux'],
+        'duplicate_handle': ['black-tux', 'black-tux'],
+        'empty_handle': ['row 5'],
+    }
+
+
+def test_cents_rule_runs_only_where_the_columns_exist():
+    records = [{'handle': 'a', 'base_price': '28999.0', 'price_usd': '$289.99'},
+               {'handle': 'b', 'base_price': '28999.0', 'price_usd': '$279.99'}]
+    assert violations(records) == {'cents_vs_usd': ['b']}
+
+
+def test_price_tier_rule_agrees_with_get_price_tier_at_the_bounds():
+    prices = [price + delta for price in (75, 100, 125, 150, 200, 250, 300, 400, 500) for delta in (-0.01, 0)]
+    records = [product(f"p{i}", price, get_price_tier(price)) for i, price in enumerate(prices)]
+    assert violations(records) == {}
+
+
+def test_generated_rows_are_clean(rows):
+    assert violations(rows) == {}